@@ -9,6 +9,10 @@ from .base_agent import (
     QwenAgent,
     create_all_agents
 )
+from .mock_server import MockConfig, MockLLMServer, point_at_mock
+from .resilience import (
+    CircuitBreaker, CircuitOpenError, DeadlineExceeded, DecisionStats, decision_stats, provider_stats
+)
 
 __all__ = [
     'BaseLLMAgent',
@@ -17,5 +21,14 @@ __all__ = [
     'DeepSeekAgent',
     'GeminiAgent',
     'QwenAgent',
-    'create_all_agents'
+    'create_all_agents',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'DeadlineExceeded',
+    'DecisionStats',
+    'decision_stats',
+    'provider_stats',
+    'MockConfig',
+    'MockLLMServer',
+    'point_at_mock'
 ]
@@ -6,16 +6,69 @@ Generic implementation that works with various LLM APIs.
 
 import os
 import json
+import time
+import random
 import httpx
 import asyncio
-from typing import Dict, List, Tuple, Optional
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Set, Tuple, Optional
 from abc import abstractmethod
+from urllib.parse import urlparse
 
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.ai_player import AIPlayer, AIDecision
+from core.ai_player import NOTES_DIR, AIPlayer, AIDecision
+from core.decision_parser import DecisionParseError
 from core.game_engine import Action
+from core.simulation import LOOSE_POLICY, TIGHT_POLICY, state_decision
+from core.usage import Usage, estimate_tokens, token_cost
+from agents.resilience import (
+    DECISION_DEADLINE, REFLECTION_DEADLINE, DecisionStats, Provider,
+    get_provider, call_with_resilience, register_agent
+)
+from agents.streaming import DecisionStream, gemini_delta, gemini_usage, openai_delta, openai_usage
+
+try:
+    import h2  # noqa: F401 - enables http2=True in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Connection pool per agent (one agent rarely has more than a couple of calls in flight)
+MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "4"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE", "2"))
+KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "120"))  # Seconds an idle connection is kept
+HTTP2_ENABLED = HTTP2_AVAILABLE and os.getenv("LLM_HTTP2", "1") != "0"
+
+# Played when the model misses its deadline or can't be reached ("tight" or "loose")
+FALLBACK_POLICY = LOOSE_POLICY if os.getenv("LLM_FALLBACK_POLICY") == "loose" else TIGHT_POLICY
+
+# "mock" points every agent at a local stand-in server instead of the real APIs (see agents/mock_server.py)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "live")
+
+# Stream decisions and play them as soon as action/amount arrive (see agents/streaming.py)
+STREAMING = os.getenv("LLM_STREAMING", "1") != "0"
+STREAM_UPDATE_INTERVAL = 0.25  # Seconds between spectator text updates while a reply streams
+
+# (player, decision, final) - the decision's text fields as they stream in after it was played
+DecisionTextCallback = Callable[[str, AIDecision, bool], None]
+
+# (prompt, completion, cached prompt) tokens as a provider reports them
+TokenCounts = Tuple[int, int, int]
+
+
+@dataclass
+class LLMCall:
+    """The LLM call in progress, for usage accounting (a context variable, so overlapping calls don't mix)."""
+    kind: str               # "decision" / "reflection"
+    attempts: int = 0
+    reported: bool = False  # Provider sent token usage
+
+
+_current_call: ContextVar[Optional[LLMCall]] = ContextVar("llm_call", default=None)
 
 
 class BaseLLMAgent(AIPlayer):
@@ -25,19 +78,160 @@ class BaseLLMAgent(AIPlayer):
     """
 
     def __init__(self, name: str, model_name: str, personality: str = ""):
-        super().__init__(name, model_name)
-        self.personality = personality
-        self.timeout = 30.0  # API timeout
+        super().__init__(name, model_name, personality)
+        self.timeout = 30.0  # API timeout (per attempt)
+        self.decision_deadline = DECISION_DEADLINE  # Budget per decision, retries included
+        self.decision_stats = DecisionStats()
+        self.rng = random.Random()
+        register_agent(name, self.decision_stats)
+        self.limits = httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY
+        )
+        self.http2 = HTTP2_ENABLED
+        self._client: Optional[httpx.AsyncClient] = None
+        self.streaming = STREAMING
+        self.on_decision_text: Optional[DecisionTextCallback] = None
+        self._streams: Set[asyncio.Task] = set()  # Replies still streaming after their decision was played
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Long-lived client shared by every call, so connections (and their
+        TLS sessions) are reused. Created on first use inside the event loop.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2
+            )
+        return self._client
+
+    @property
+    def provider(self) -> Provider:
+        """Breaker and counters for this agent's API host (shared with other agents on it)."""
+        return get_provider(urlparse(self.api_url).netloc or self.name)
+
+    async def aclose(self):
+        """Close pooled connections (the next call opens a fresh client) and flush notes."""
+        for task in list(self._streams):
+            task.cancel()
+        if self._streams:
+            await asyncio.gather(*self._streams, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        await super().aclose()
 
     # Token limits for different call types
     DECISION_TOKENS = 150   # Short JSON response - 1-2 sentences each field
     REFLECTION_TOKENS = 100  # Brief note update
 
     @abstractmethod
-    async def _call_llm(self, prompt: str, max_tokens: int = 200) -> str:
-        """Make API call to LLM. Implemented by subclasses."""
+    async def _call_llm(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> str:
+        """Make API call to LLM. Implemented by subclasses. `system` is the cacheable prompt prefix."""
         pass
 
+    async def _stream_llm(self, prompt: str, max_tokens: int = 200,
+                          system: Optional[str] = None) -> AsyncIterator[str]:
+        """The reply as text deltas. Providers that can stream override this; the default yields it whole."""
+        yield await self._call_llm(prompt, max_tokens=max_tokens, system=system)
+
+    @staticmethod
+    def _messages(prompt: str, system: Optional[str]) -> List[Dict]:
+        """Chat messages: the stable prefix as a system message (prefix-cached by the provider), then the prompt."""
+        if not system:
+            return [{"role": "user", "content": prompt}]
+        return [{"role": "system", "content": system}, {"role": "user", "content": prompt}]
+
+    async def _stream_sse(self, url: str, headers: Dict, payload: Dict,
+                          delta: Callable[[Dict], Optional[str]],
+                          usage: Callable[[Dict], Optional[TokenCounts]]) -> AsyncIterator[str]:
+        """POST a streaming request and yield the text of each server-sent event (noting its token usage)."""
+        async with self.client.stream("POST", url, headers=headers, json=payload) as response:
+            if response.is_error:
+                await response.aread()
+                response.raise_for_status()
+            if "text/event-stream" not in response.headers.get("content-type", ""):
+                # Server ignored the stream flag - the reply comes whole
+                await response.aread()
+                data = response.json()
+                self._note_usage(usage(data))
+                text = delta(data)
+                if text:
+                    yield text
+                return
+            counts = None
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                event = json.loads(data)
+                counts = usage(event) or counts
+                text = delta(event)
+                if text:
+                    yield text
+            self._note_usage(counts)
+
+    async def _call_llm_resilient(self, prompt: str, max_tokens: int, deadline: float,
+                                  system: Optional[str] = None, kind: str = "decision") -> str:
+        """_call_llm with retries, the provider's circuit breaker and a time budget."""
+        async def attempt():
+            reply = await self._call_llm(prompt, max_tokens=max_tokens, system=system)
+            self._estimate_usage(prompt, system, reply)
+            return reply
+
+        return await self._tracked_call(kind, attempt, deadline)
+
+    async def _tracked_call(self, kind: str, attempt: Callable[[], Awaitable], deadline: float):
+        """call_with_resilience, with the call, its retries and its latency added to self.usage[kind]."""
+        call = LLMCall(kind)
+        token = _current_call.set(call)  # Seen by the attempts (and any reply still streaming after)
+
+        def counted():
+            call.attempts += 1
+            return attempt()
+
+        start = time.monotonic()
+        failed = False
+        try:
+            return await call_with_resilience(self.provider, counted, deadline=deadline)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            _current_call.reset(token)
+            usage = self.usage.setdefault(kind, Usage())
+            usage.calls += 1
+            usage.failed += failed
+            usage.retries += max(0, call.attempts - 1)
+            usage.latency += time.monotonic() - start
+
+    def _note_usage(self, counts: Optional[TokenCounts], estimated: bool = False):
+        """Add one reply's (prompt, completion, cached) tokens and their cost to the current call's kind."""
+        if counts is None:
+            return
+        call = _current_call.get()
+        if call is not None:
+            call.reported = True
+        prompt_tokens, completion_tokens, cached_tokens = counts
+        usage = self.usage.setdefault(call.kind if call is not None else "other", Usage())
+        usage.prompt_tokens += prompt_tokens
+        usage.completion_tokens += completion_tokens
+        usage.cached_tokens += cached_tokens
+        usage.estimated += estimated
+        usage.cost += token_cost(self.model_name, prompt_tokens, completion_tokens, cached_tokens)
+
+    def _estimate_usage(self, prompt: str, system: Optional[str], reply: str):
+        """Count tokens from the text if the provider didn't report them for this reply."""
+        call = _current_call.get()
+        if call is not None and not call.reported:
+            self._note_usage((estimate_tokens((system or "") + prompt), estimate_tokens(reply), 0), estimated=True)
+
     async def get_decision(
         self,
         game_state: Dict,
@@ -46,17 +240,104 @@ class BaseLLMAgent(AIPlayer):
         """Get poker decision from LLM."""
         prompt = self._build_decision_prompt(game_state, valid_actions)
 
-        # Add personality hint if set
-        if self.personality:
-            prompt = f"[Your personality: {self.personality}]\n\n" + prompt
-
+        # The local decision is ready before the model is asked, so a late or
+        # failed call costs nothing extra (the deadline cancels the request)
+        fallback = self._fallback_decision(game_state, valid_actions)
+        start = time.perf_counter()
+        self.last_parse_error = None
         try:
-            response = await self._call_llm(prompt, max_tokens=self.DECISION_TOKENS)
-            decision = self._parse_decision(response)
+            if self.streaming:
+                decision = await self._tracked_call(
+                    "decision",
+                    lambda: self._stream_decision(prompt.user, self.DECISION_TOKENS, prompt.system),
+                    self.decision_deadline
+                )
+            else:
+                response = await self._call_llm_resilient(
+                    prompt.user, self.DECISION_TOKENS, self.decision_deadline, prompt.system
+                )
+                decision = self._parse_decision(response)
+            if self.last_parse_error is not None:  # A guessed fold is worse than the local policy
+                raise DecisionParseError(self.last_parse_error)
+            self.decision_stats.record(time.perf_counter() - start)
             return decision
         except Exception as e:
-            print(f"[{self.name}] Error getting decision: {e}")
-            # Default to check/fold
+            print(f"[{self.name}] Error getting decision, playing {fallback.action.name.lower()} (local policy): {e}")
+            self.decision_stats.record(time.perf_counter() - start, e)
+            self.provider.stats.fallbacks += 1
+            return fallback
+
+    async def _stream_decision(self, prompt: str, max_tokens: int, system: Optional[str] = None) -> AIDecision:
+        """
+        One streamed attempt. Returns as soon as the action (and amount, for
+        bets and raises) has arrived; the rest of the reply keeps streaming in
+        the background, filling in the decision's text and reporting it
+        through on_decision_text. Cancelling before then cancels the request.
+        """
+        committed = asyncio.get_running_loop().create_future()
+        reader = asyncio.create_task(self._read_decision(prompt, max_tokens, system, committed))
+        try:
+            decision = await asyncio.shield(committed)
+        except BaseException:
+            reader.cancel()
+            raise
+        if not reader.done():
+            self._streams.add(reader)
+            reader.add_done_callback(self._streams.discard)
+        return decision
+
+    async def _read_decision(self, prompt: str, max_tokens: int, system: Optional[str], committed: asyncio.Future):
+        parser = DecisionStream()
+        decision = None
+        whole = False  # Reply was complete when the decision was played - no text left to report
+        last_update = 0.0
+        try:
+            async for text in self._stream_llm(prompt, max_tokens=max_tokens, system=system):
+                if parser.done:
+                    continue  # Read on to the end for the usage event
+                parser.feed(text)
+                if decision is None:
+                    if parser.ready:
+                        decision = parser.decision()
+                        committed.set_result(decision)
+                        whole = parser.done
+                        last_update = time.monotonic()
+                    elif parser.error is not None:  # Names no action we know - the rest can't change that
+                        self._record_parse_error(parser.error)
+                        decision = parser.decision()
+                        committed.set_result(decision)  # get_decision plays the local policy instead
+                        whole = True  # Never played, so no text to report
+                elif not whole and time.monotonic() - last_update >= STREAM_UPDATE_INTERVAL:
+                    parser.fill(decision)
+                    self._decision_text(decision, final=False)
+                    last_update = time.monotonic()
+        except Exception as e:
+            if decision is None:
+                committed.set_exception(e)
+                return
+            print(f"[{self.name}] Reply stream broke off after the decision: {e}")
+        self._estimate_usage(prompt, system, parser.text)
+
+        if decision is None:  # Never got a usable action - parse the reply as a whole
+            committed.set_result(self._parse_decision(parser.text))
+            return
+        if not whole:
+            parser.fill(decision)
+            self._decision_text(decision, final=True)
+
+    def _decision_text(self, decision: AIDecision, final: bool):
+        if self.on_decision_text is not None:
+            try:
+                self.on_decision_text(self.name, decision, final)
+            except Exception as e:
+                print(f"[{self.name}] Decision text callback failed: {e}")
+
+    def _fallback_decision(self, game_state: Dict, valid_actions: List[Tuple[Action, int, int]]) -> AIDecision:
+        """Hand-strength / pot-odds decision from the local heuristic policy (check/fold if it can't run)."""
+        try:
+            action, amount = state_decision(FALLBACK_POLICY, game_state, valid_actions, self.rng)
+            return AIDecision(action, amount, "Fallback (local policy)")
+        except (KeyError, ValueError, TypeError):
             for action, min_amt, max_amt in valid_actions:
                 if action == Action.CHECK:
                     return AIDecision(Action.CHECK, 0, "Error fallback")
@@ -70,12 +351,12 @@ class BaseLLMAgent(AIPlayer):
         """Reflect on hand and return notes to add."""
         prompt = self._build_reflection_prompt(hand_summary, my_result)
 
-        if self.personality:
-            prompt = f"[Your personality: {self.personality}]\n\n" + prompt
-
         try:
             # More tokens for deeper learning/analysis
-            response = await self._call_llm(prompt, max_tokens=self.REFLECTION_TOKENS)
+            response = await self._call_llm_resilient(
+                prompt, self.REFLECTION_TOKENS, max(REFLECTION_DEADLINE, self.decision_deadline),
+                self._personality_hint() or None, kind="reflection"
+            )
             return response.strip()
         except Exception as e:
             print(f"[{self.name}] Error reflecting: {e}")
@@ -97,27 +378,51 @@ Trash talk: Witty, cocky, but respects great plays. Dark humor."""
         self.api_key = os.getenv("XAI_API_KEY")
         self.api_url = os.getenv("XAI_API_URL", "https://api.x.ai/v1/chat/completions")
 
-    async def _call_llm(self, prompt: str, max_tokens: int = 200) -> str:
+    async def _call_llm(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> str:
         if not self.api_key:
             raise ValueError("XAI_API_KEY not set")
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                self.api_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "grok-4-1-fast",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": 0.7,
-                    "max_tokens": max_tokens
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
+        response = await self.client.post(
+            self.api_url,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": "grok-4-1-fast",
+                "messages": self._messages(prompt, system),
+                "temperature": 0.7,
+                "max_tokens": max_tokens
+            }
+        )
+        response.raise_for_status()
+        data = response.json()
+        self._note_usage(openai_usage(data))
+        return data["choices"][0]["message"]["content"]
+
+    async def _stream_llm(self, prompt: str, max_tokens: int = 200,
+                          system: Optional[str] = None) -> AsyncIterator[str]:
+        if not self.api_key:
+            raise ValueError("XAI_API_KEY not set")
+
+        async for text in self._stream_sse(
+            self.api_url,
+            {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            {
+                "model": "grok-4-1-fast",
+                "messages": self._messages(prompt, system),
+                "temperature": 0.7,
+                "max_tokens": max_tokens,
+                "stream": True,
+                "stream_options": {"include_usage": True}
+            },
+            openai_delta,
+            openai_usage
+        ):
+            yield text
 
 
 class GPT4Agent(BaseLLMAgent):
@@ -135,27 +440,51 @@ Trash talk: Minimal. Let your stack do the talking. Acknowledge good plays with
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.api_url = "https://api.openai.com/v1/chat/completions"
 
-    async def _call_llm(self, prompt: str, max_tokens: int = 200) -> str:
+    async def _call_llm(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> str:
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY not set")
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                self.api_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "gpt-4-turbo-preview",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": 0.7,
-                    "max_tokens": max_tokens
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
+        response = await self.client.post(
+            self.api_url,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": "gpt-4-turbo-preview",
+                "messages": self._messages(prompt, system),
+                "temperature": 0.7,
+                "max_tokens": max_tokens
+            }
+        )
+        response.raise_for_status()
+        data = response.json()
+        self._note_usage(openai_usage(data))
+        return data["choices"][0]["message"]["content"]
+
+    async def _stream_llm(self, prompt: str, max_tokens: int = 200,
+                          system: Optional[str] = None) -> AsyncIterator[str]:
+        if not self.api_key:
+            raise ValueError("OPENAI_API_KEY not set")
+
+        async for text in self._stream_sse(
+            self.api_url,
+            {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            {
+                "model": "gpt-4-turbo-preview",
+                "messages": self._messages(prompt, system),
+                "temperature": 0.7,
+                "max_tokens": max_tokens,
+                "stream": True,
+                "stream_options": {"include_usage": True}
+            },
+            openai_delta,
+            openai_usage
+        ):
+            yield text
 
 
 class DeepSeekAgent(BaseLLMAgent):
@@ -173,27 +502,51 @@ Trash talk: Rarely engages. Stays zen. When you do speak, it cuts deep."""
         self.api_key = os.getenv("DEEPSEEK_API_KEY")
         self.api_url = "https://api.deepseek.com/v1/chat/completions"
 
-    async def _call_llm(self, prompt: str, max_tokens: int = 200) -> str:
+    async def _call_llm(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> str:
         if not self.api_key:
             raise ValueError("DEEPSEEK_API_KEY not set")
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                self.api_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "deepseek-chat",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": 0.7,
-                    "max_tokens": max_tokens
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
+        response = await self.client.post(
+            self.api_url,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": "deepseek-chat",
+                "messages": self._messages(prompt, system),
+                "temperature": 0.7,
+                "max_tokens": max_tokens
+            }
+        )
+        response.raise_for_status()
+        data = response.json()
+        self._note_usage(openai_usage(data))
+        return data["choices"][0]["message"]["content"]
+
+    async def _stream_llm(self, prompt: str, max_tokens: int = 200,
+                          system: Optional[str] = None) -> AsyncIterator[str]:
+        if not self.api_key:
+            raise ValueError("DEEPSEEK_API_KEY not set")
+
+        async for text in self._stream_sse(
+            self.api_url,
+            {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            {
+                "model": "deepseek-chat",
+                "messages": self._messages(prompt, system),
+                "temperature": 0.7,
+                "max_tokens": max_tokens,
+                "stream": True,
+                "stream_options": {"include_usage": True}
+            },
+            openai_delta,
+            openai_usage
+        ):
+            yield text
 
 
 class GeminiAgent(BaseLLMAgent):
@@ -211,26 +564,49 @@ Trash talk: LOUD. Tilting opponents is a weapon. Channel Hellmuth's Poker Brat e
         self.api_key = os.getenv("GEMINI_API_KEY")
         self.model = "models/gemini-2.5-flash-lite"
         self.api_url = f"https://generativelanguage.googleapis.com/v1beta/{self.model}:generateContent"
+        self.stream_url = f"https://generativelanguage.googleapis.com/v1beta/{self.model}:streamGenerateContent"
+
+    @staticmethod
+    def _body(prompt: str, max_tokens: int, system: Optional[str]) -> Dict:
+        """generateContent request; the stable prefix goes in systemInstruction (implicitly cached)."""
+        body = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {
+                "temperature": 0.7,
+                "maxOutputTokens": max_tokens
+            }
+        }
+        if system:
+            body["systemInstruction"] = {"parts": [{"text": system}]}
+        return body
+
+    async def _call_llm(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> str:
+        if not self.api_key:
+            raise ValueError("GEMINI_API_KEY not set")
+
+        response = await self.client.post(
+            f"{self.api_url}?key={self.api_key}",
+            headers={"Content-Type": "application/json"},
+            json=self._body(prompt, max_tokens, system)
+        )
+        response.raise_for_status()
+        data = response.json()
+        self._note_usage(gemini_usage(data))
+        return data["candidates"][0]["content"]["parts"][0]["text"]
 
-    async def _call_llm(self, prompt: str, max_tokens: int = 200) -> str:
+    async def _stream_llm(self, prompt: str, max_tokens: int = 200,
+                          system: Optional[str] = None) -> AsyncIterator[str]:
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not set")
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.api_url}?key={self.api_key}",
-                headers={"Content-Type": "application/json"},
-                json={
-                    "contents": [{"parts": [{"text": prompt}]}],
-                    "generationConfig": {
-                        "temperature": 0.7,
-                        "maxOutputTokens": max_tokens
-                    }
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data["candidates"][0]["content"]["parts"][0]["text"]
+        async for text in self._stream_sse(
+            f"{self.stream_url}?alt=sse&key={self.api_key}",
+            {"Content-Type": "application/json"},
+            self._body(prompt, max_tokens, system),
+            gemini_delta,
+            gemini_usage
+        ):
+            yield text
 
 
 class QwenAgent(BaseLLMAgent):
@@ -247,31 +623,55 @@ Trash talk: Wise, old-timer wisdom. Respects the game. Quiet confidence that uns
         )
         self.api_url = os.getenv("QWEN_API_URL", "http://localhost:8000/v1")
         self.model = os.getenv("QWEN_MODEL", "qwen3-235b")
-        self.timeout = 120.0  # Longer timeout for big model
-
-    async def _call_llm(self, prompt: str, max_tokens: int = 200) -> str:
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.api_url}/chat/completions",
-                headers={"Content-Type": "application/json"},
-                json={
-                    "model": self.model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": 0.7,
-                    "max_tokens": max_tokens
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
+        self.timeout = 120.0  # Longer timeout for big model (still cut off at the decision deadline)
+
+    async def _call_llm(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> str:
+        response = await self.client.post(
+            f"{self.api_url}/chat/completions",
+            headers={"Content-Type": "application/json"},
+            json={
+                "model": self.model,
+                "messages": self._messages(prompt, system),
+                "temperature": 0.7,
+                "max_tokens": max_tokens
+            }
+        )
+        response.raise_for_status()
+        data = response.json()
+        self._note_usage(openai_usage(data))
+        return data["choices"][0]["message"]["content"]
+
+    async def _stream_llm(self, prompt: str, max_tokens: int = 200,
+                          system: Optional[str] = None) -> AsyncIterator[str]:
+        async for text in self._stream_sse(
+            f"{self.api_url}/chat/completions",
+            {"Content-Type": "application/json"},
+            {
+                "model": self.model,
+                "messages": self._messages(prompt, system),
+                "temperature": 0.7,
+                "max_tokens": max_tokens,
+                "stream": True,
+                "stream_options": {"include_usage": True}
+            },
+            openai_delta,
+            openai_usage
+        ):
+            yield text
 
 
 def create_all_agents() -> List[BaseLLMAgent]:
-    """Create all 5 poker agents."""
-    return [
+    """Create all 5 poker agents (talking to the local mock server if LLM_BACKEND=mock)."""
+    agents = [
         GrokAgent(),
         GPT4Agent(),
         DeepSeekAgent(),
         GeminiAgent(),
         QwenAgent()
     ]
+    if LLM_BACKEND == "mock":
+        from agents.mock_server import MOCK_LLM_URL, point_at_mock
+        point_at_mock(agents)
+        print(f"[AGENTS] Offline: using mock LLM server{' at ' + MOCK_LLM_URL if MOCK_LLM_URL else 's (in-process)'}, "
+              f"notes in {NOTES_DIR}")
+    return agents
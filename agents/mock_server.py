@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Mock LLM Server
+A local stand-in for the OpenAI-compatible and Gemini APIs, so tournaments
+run without API keys or a network: load tests, latency experiments and
+repeatable regression tournaments.
+
+It answers /chat/completions and :generateContent / :streamGenerateContent
+(alt=sse), streamed or whole, with reported token usage (prompt-cache hits
+for a system prompt it has seen before). Decision replies come from the
+local heuristic policy applied to the situation in the prompt - loose for
+Grok and Gemini, tight for the rest - or are canned (check/call/fold).
+Latency is lognormal around a median time to first token plus a per-token
+rate; 5xx, 429 (Retry-After: 1), hung requests and malformed replies can be
+injected at set rates.
+
+Replies are seeded from the request's prompt, so the same situation always
+gets the same decision; latency and injected faults are seeded from the
+prompt and how many times it has been sent, so a retry can succeed and a
+rerun sees the same faults.
+
+Agents reach it through LLM_BACKEND=mock (see create_all_agents): one
+in-process server per agent, or MOCK_LLM_URL to share a server started
+with `python -m agents.mock_server --port 8001`. Paths start with the
+agent's name (/Grok/v1/chat/completions), which picks its policy. Notes,
+hand history and stats go to a scratch directory in mock mode (see
+core/data_paths.py), so offline runs never touch the live models' notes.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.game_engine import Action, Card
+from core.simulation import LOOSE_POLICY, TIGHT_POLICY
+from core.usage import estimate_tokens
+
+
+MOCK_LLM_URL = os.getenv("MOCK_LLM_URL", "")  # Shared mock server (else one in-process server per agent)
+LOOSE_AGENTS = {"grok", "gemini"}  # Played by the loose policy in "policy" mode (LAG / maniac)
+CHARS_PER_CHUNK = 4  # Streamed reply pieces (~one token each)
+HANG_SECONDS = 300.0  # A hung request holds its connection this long
+MAX_TRACKED_PROMPTS = 100_000  # Attempt counts kept before starting over (long load tests)
+
+CANNED_REASONING = [
+    "Pot odds make this the simple play.",
+    "Nothing here worth building a pot with.",
+    "Position and stack depth point the same way.",
+    "Keeping my range wide and the pot sized right.",
+]
+CANNED_THOUGHTS = [
+    "They have been weak all orbit.",
+    "That sizing smells like a draw.",
+    "Patience - a better spot is coming.",
+    None,
+]
+CANNED_TRASH_TALK = ["Is that all you've got?", "I've seen this movie before.", None, None]
+CANNED_NOTE = "Opponents keep folding to pressure on the turn - keep firing there."
+
+
+@dataclass
+class MockConfig:
+    first_ms: float = 300.0      # Median time to first token
+    jitter: float = 0.5          # Lognormal sigma of that (0 = always the median)
+    token_ms: float = 10.0       # Per output token after the first
+    error_rate: float = 0.0      # 500/503 replies
+    rate_limit_rate: float = 0.0  # 429 with Retry-After: 1
+    hang_rate: float = 0.0       # Requests that never answer
+    malformed_rate: float = 0.0  # Decision replies that are cut off, fenced with a trailing comma, or prose
+    policy: str = "policy"       # "policy" (heuristic) or "canned"
+    seed: int = 0
+
+    @classmethod
+    def from_env(cls) -> "MockConfig":
+        """MOCK_LLM_FIRST_MS, MOCK_LLM_JITTER, MOCK_LLM_ERROR_RATE, ... override the defaults."""
+        config = cls()
+        for f in fields(cls):
+            value = os.getenv(f"MOCK_LLM_{f.name.upper()}")
+            if value is not None:
+                setattr(config, f.name, type(getattr(config, f.name))(value))
+        return config
+
+
+@dataclass
+class Request:
+    """One model request, normalized across the two APIs."""
+    agent: str
+    gemini: bool
+    stream: bool
+    system: str
+    prompt: str
+    max_tokens: int
+
+
+def parse_request(path: str, body: Dict) -> Request:
+    agent = unquote(path.lstrip("/").split("/", 1)[0])
+    gemini = ":generateContent" in path or ":streamGenerateContent" in path
+    if gemini:
+        parts = [part.get("text", "") for content in body.get("contents", []) for part in content.get("parts", [])]
+        system = "".join(part.get("text", "") for part in (body.get("systemInstruction") or {}).get("parts", []))
+        max_tokens = (body.get("generationConfig") or {}).get("maxOutputTokens") or 200
+        return Request(agent, True, ":streamGenerateContent" in path, system, "".join(parts), max_tokens)
+    messages = body.get("messages", [])
+    system = "".join(m.get("content", "") for m in messages if m.get("role") == "system")
+    prompt = "".join(m.get("content", "") for m in messages if m.get("role") != "system")
+    return Request(agent, False, bool(body.get("stream")), system, prompt, body.get("max_tokens") or 200)
+
+
+# Situation lines of a decision prompt (AIPlayer._build_decision_prompt)
+_FIELDS = {
+    "cards": re.compile(r"^- Your cards: (.*)$", re.M),
+    "board": re.compile(r"^- Community cards: (.*)$", re.M),
+    "pot": re.compile(r"^- Pot: (\d+)", re.M),
+    "my_bet": re.compile(r"^- Your current bet: (\d+)", re.M),
+    "current_bet": re.compile(r"^- Current bet to call: (\d+)", re.M),
+    "stage": re.compile(r"^- Stage: (\w+)", re.M),
+    "actions": re.compile(r"^VALID ACTIONS: (.*)$", re.M),
+}
+_ACTIONS = {action.value: action for action in Action}
+
+
+def parse_situation(prompt: str) -> Optional[Dict]:
+    """The decision prompt's situation, or None if this isn't a decision prompt."""
+    found = {name: pattern.search(prompt) for name, pattern in _FIELDS.items()}
+    if any(match is None for match in found.values()):
+        return None
+    values = {name: match.group(1).strip() for name, match in found.items()}
+
+    valid_actions = []
+    for item in values["actions"].split(","):
+        name, _, amounts = item.strip().partition(" ")
+        if name not in _ACTIONS:
+            continue
+        low, _, high = amounts.partition("-")
+        low = int(low) if low else 0
+        valid_actions.append((_ACTIONS[name], low, int(high) if high else low))
+
+    board = [] if values["board"].startswith("None") else [Card.from_str(c) for c in values["board"].split()]
+    current_bet = int(values["current_bet"])
+    # The prompt has no blinds line: the minimum raise is the last raise size (at least a big blind)
+    raise_min = next((low for action, low, _ in valid_actions if action in (Action.BET, Action.RAISE)), 0)
+    return {
+        "stage": values["stage"],
+        "hole_cards": [Card.from_str(c) for c in values["cards"].split()],
+        "board": board,
+        "to_call": max(0, current_bet - int(values["my_bet"])),
+        "pot": int(values["pot"]),
+        "big_blind": max(1, raise_min - current_bet),
+        "valid_actions": valid_actions,
+    }
+
+
+def decision_reply(agent: str, prompt: str, policy: str, rng: random.Random) -> Optional[str]:
+    """The JSON decision for a decision prompt (None if it isn't one)."""
+    situation = parse_situation(prompt)
+    if situation is None:
+        return None
+    valid_actions = situation.pop("valid_actions")
+    if policy == "canned":
+        names = [action for action, _, _ in valid_actions]
+        action = next((a for a in (Action.CHECK, Action.CALL) if a in names), Action.FOLD)
+        amount = next((low for a, low, _ in valid_actions if a == action), 0)
+    else:
+        heuristic = LOOSE_POLICY if agent.lower() in LOOSE_AGENTS else TIGHT_POLICY
+        action, amount = heuristic.decide(valid_actions=valid_actions, rng=rng, **situation)
+    return json.dumps({
+        "action": action.value,
+        "amount": amount,
+        "reasoning": rng.choice(CANNED_REASONING),
+        "inner_thoughts": rng.choice(CANNED_THOUGHTS),
+        "trash_talk": rng.choice(CANNED_TRASH_TALK)
+    }, indent=4)
+
+
+def malformed(reply: str, rng: random.Random) -> str:
+    """The ways models get the format wrong (see core/decision_parser.py)."""
+    kind = rng.randrange(3)
+    if kind == 0:
+        return reply[:rng.randint(1, len(reply) - 1)]  # Cut off by the token limit
+    if kind == 1:
+        return "```json\n" + reply[:-1].rstrip() + ",\n}\n```"  # Fenced, trailing comma
+    return "I think the best play here is to call and see what develops."  # No JSON at all
+
+
+class MockLLMServer:
+    """One mock server on 127.0.0.1 (port 0 = any free port), served from a background thread."""
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockConfig.from_env()
+        self.counts: Dict[str, int] = {
+            "requests": 0, "errors": 0, "rate_limited": 0, "hung": 0, "malformed": 0, "cached": 0
+        }
+        self._seen_prefixes = set()
+        self._attempts: Dict[bytes, int] = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+
+    def start(self) -> "MockLLMServer":
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counts[name] += 1
+
+    def _attempt(self, key: bytes) -> int:
+        """How many times this prompt was sent before."""
+        with self._lock:
+            if len(self._attempts) >= MAX_TRACKED_PROMPTS:
+                self._attempts.clear()
+            attempt = self._attempts.get(key, 0)
+            self._attempts[key] = attempt + 1
+        return attempt
+
+    def _cached(self, system: str) -> int:
+        """Prompt tokens served from "cache": a system prompt seen before."""
+        if not system:
+            return 0
+        key = hashlib.sha1(system.encode()).digest()
+        with self._lock:
+            seen = key in self._seen_prefixes
+            self._seen_prefixes.add(key)
+            if seen:
+                self.counts["cached"] += 1
+        return estimate_tokens(system) if seen else 0
+
+    def _handler(self):
+        server = self
+
+        class MockHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                request = parse_request(self.path, body)
+                config = server.config
+                key = hashlib.sha1(f"{request.agent}:{request.prompt}".encode()).digest()
+                rng = random.Random(f"{config.seed}:{key.hex()}")  # The reply
+                faults = random.Random(f"{config.seed}:{key.hex()}:{server._attempt(key)}")  # Latency, injected faults
+                server._count("requests")
+
+                roll = faults.random()
+                if roll < config.hang_rate:
+                    server._count("hung")
+                    time.sleep(HANG_SECONDS)
+                    return
+                roll -= config.hang_rate
+                if roll < config.error_rate:
+                    server._count("errors")
+                    return self._json(faults.choice([500, 503]), {"error": {"message": "mock server error"}})
+                roll -= config.error_rate
+                if roll < config.rate_limit_rate:
+                    server._count("rate_limited")
+                    return self._json(429, {"error": {"message": "mock rate limit"}}, {"Retry-After": "1"})
+
+                reply = decision_reply(request.agent, request.prompt, config.policy, rng)
+                if reply is None:
+                    reply = CANNED_NOTE  # Reflection
+                elif faults.random() < config.malformed_rate:
+                    server._count("malformed")
+                    reply = malformed(reply, faults)
+                chunks = [reply[i:i + CHARS_PER_CHUNK] for i in range(0, len(reply), CHARS_PER_CHUNK)]
+                chunks = chunks[:request.max_tokens]
+                usage = (estimate_tokens(request.system + request.prompt), len(chunks), server._cached(request.system))
+
+                time.sleep(config.first_ms * math.exp(faults.gauss(0, config.jitter) if config.jitter else 0) / 1000)
+                try:
+                    if request.stream:
+                        self._stream(request, chunks, usage, body)
+                    else:
+                        time.sleep(config.token_ms * len(chunks) / 1000)
+                        self._json(200, self._reply(request.gemini, "".join(chunks), usage))
+                except OSError:
+                    pass  # Client gave up (deadline)
+
+            def _reply(self, gemini: bool, text: str, usage: Tuple[int, int, int], delta: bool = False) -> Dict:
+                prompt_tokens, completion_tokens, cached = usage
+                if gemini:
+                    return {
+                        "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}}],
+                        "usageMetadata": {"promptTokenCount": prompt_tokens, "candidatesTokenCount": completion_tokens,
+                                          "cachedContentTokenCount": cached}
+                    }
+                if delta:
+                    return {"object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {"content": text}}]}
+                return {
+                    "object": "chat.completion",
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                              "prompt_tokens_details": {"cached_tokens": cached}}
+                }
+
+            def _stream(self, request: Request, chunks: List[str], usage: Tuple[int, int, int], body: Dict):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for n, chunk in enumerate(chunks, 1):
+                    # Gemini repeats cumulative usage on each event
+                    event = self._reply(request.gemini, chunk, (usage[0], n, usage[2]), delta=True)
+                    self._chunk(f"data: {json.dumps(event)}\n\n")
+                    if server.config.token_ms:
+                        time.sleep(server.config.token_ms / 1000)
+                if not request.gemini:
+                    if (body.get("stream_options") or {}).get("include_usage"):
+                        prompt_tokens, completion_tokens, cached = usage
+                        self._chunk("data: " + json.dumps({"object": "chat.completion.chunk", "choices": [], "usage": {
+                            "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                            "prompt_tokens_details": {"cached_tokens": cached}}}) + "\n\n")
+                    self._chunk("data: [DONE]\n\n")
+                self._chunk("")
+
+            def _json(self, status: int, data: Dict, headers: Optional[Dict] = None):
+                payload = json.dumps(data).encode()
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _chunk(self, text: str):
+                data = text.encode()
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def log_message(self, format, *args):
+                pass
+
+        return MockHandler
+
+
+# In-process servers started for agents (kept for the life of the process)
+_servers: List[MockLLMServer] = []
+
+
+def point_at_mock(agents, url: str = MOCK_LLM_URL, config: Optional[MockConfig] = None) -> List[MockLLMServer]:
+    """
+    Send each agent's calls to a mock server: the one at `url`, or a new
+    in-process one per agent (so each keeps its own circuit breaker).
+    Returns the servers started.
+    """
+    from agents.base_agent import GeminiAgent, QwenAgent
+
+    started = []
+    for agent in agents:
+        base = url.rstrip("/")
+        if not base:
+            server = MockLLMServer(config).start()
+            started.append(server)
+            base = server.url
+        prefix = f"{base}/{quote(agent.name)}"
+        agent.api_key = "mock"
+        if isinstance(agent, GeminiAgent):
+            agent.api_url = f"{prefix}/v1beta/{agent.model}:generateContent"
+            agent.stream_url = f"{prefix}/v1beta/{agent.model}:streamGenerateContent"
+        elif isinstance(agent, QwenAgent):
+            agent.api_url = f"{prefix}/v1"
+        else:
+            agent.api_url = f"{prefix}/v1/chat/completions"
+    _servers.extend(started)
+    return started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI/Gemini-compatible mock LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    defaults = MockConfig.from_env()
+    for f in fields(MockConfig):
+        parser.add_argument(f"--{f.name.replace('_', '-')}", type=type(getattr(defaults, f.name)),
+                            default=getattr(defaults, f.name))
+    args = parser.parse_args()
+
+    config = MockConfig(**{f.name: getattr(args, f.name) for f in fields(MockConfig)})
+    server = MockLLMServer(config, args.host, args.port)
+    print(f"Mock LLM server on {server.url} ({config})")
+    print(f"Run the arena against it: LLM_BACKEND=mock MOCK_LLM_URL={server.url} python run_tournament.py")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\n{server.counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Provider Resilience
+Keeps one slow or failing LLM provider from stalling the table.
+
+Every LLM call from a BaseLLMAgent goes through call_with_resilience():
+- Deadline budget: each decision gets LLM_DECISION_DEADLINE seconds in
+  total, across attempts and backoff, instead of a full client timeout
+  per attempt
+- Retries: up to LLM_MAX_RETRIES more attempts on 408/429/5xx and
+  connection errors, after a full-jitter exponential backoff (or the
+  provider's Retry-After, if it sent one and it fits the budget)
+- Circuit breaker, one per provider (API host): LLM_BREAKER_THRESHOLD
+  failed calls in a row open it and calls fail at once for
+  LLM_BREAKER_COOLDOWN seconds; then a single probe call decides
+  whether it closes again. A Retry-After longer than the budget holds
+  it open for that long too.
+
+When a call fails anyway, the agent plays a local heuristic decision
+instead (see BaseLLMAgent.get_decision); DecisionStats counts how often.
+Counters for every provider and agent are in provider_stats() and
+decision_stats() (GET /api/providers).
+"""
+
+import asyncio
+import os
+import random
+import time
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from core.decision_parser import DecisionParseError
+
+
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))              # Extra attempts per call
+BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))        # Seconds before the first retry (max)
+BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "8"))            # Cap on any one backoff
+DECISION_DEADLINE = float(os.getenv("LLM_DECISION_DEADLINE", "40"))  # Seconds per decision, all attempts
+REFLECTION_DEADLINE = float(os.getenv("LLM_REFLECTION_DEADLINE", "60"))
+BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))  # Consecutive failures that open it
+BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))  # Seconds open before a probe
+MIN_ATTEMPT_TIME = 1.0  # Don't start an attempt with less budget than this
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """The provider's breaker is open - the call was not attempted."""
+
+
+class DeadlineExceeded(Exception):
+    """The call's time budget ran out before any attempt succeeded."""
+
+
+@dataclass
+class ProviderStats:
+    """Monitoring counters for one provider."""
+    calls: int = 0               # call_with_resilience() invocations
+    successes: int = 0
+    failures: int = 0            # Calls that ended in an error (after any retries)
+    attempts: int = 0            # HTTP attempts, including retries
+    retries: int = 0
+    timeouts: int = 0            # Attempts cut off by the deadline or the client timeout
+    rate_limited: int = 0        # 429 responses
+    server_errors: int = 0       # 5xx / 408 responses
+    connection_errors: int = 0
+    deadline_exceeded: int = 0   # Calls that ran out of budget
+    breaker_rejections: int = 0  # Calls failed fast while the breaker was open
+    breaker_opens: int = 0
+    fallbacks: int = 0           # Decisions the agent had to make without the model
+    total_latency: float = 0.0   # Seconds spent in successful calls
+
+    @property
+    def mean_latency(self) -> Optional[float]:
+        return self.total_latency / self.successes if self.successes else None
+
+
+@dataclass
+class DecisionStats:
+    """One agent's decision clock: how often the local policy had to play for it."""
+    decisions: int = 0
+    fallbacks: int = 0
+    deadline: int = 0        # Model missed the decision deadline
+    circuit_open: int = 0    # Provider's breaker was open - not asked at all
+    parse_errors: int = 0    # Model replied, but not with a usable decision
+    errors: int = 0          # Anything else (HTTP error after retries, missing key)
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, seconds: float, error: Optional[Exception] = None):
+        self.decisions += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if error is None:
+            return
+        self.fallbacks += 1
+        if isinstance(error, DeadlineExceeded):
+            self.deadline += 1
+        elif isinstance(error, CircuitOpenError):
+            self.circuit_open += 1
+        elif isinstance(error, DecisionParseError):
+            self.parse_errors += 1
+        else:
+            self.errors += 1
+
+    def summary(self) -> Dict:
+        return {
+            **asdict(self),
+            "fallback_rate": round(self.fallbacks / self.decisions, 3) if self.decisions else None,
+            "mean_seconds": round(self.total_seconds / self.decisions, 3) if self.decisions else None
+        }
+
+
+class CircuitBreaker:
+    """Closed -> open after `threshold` consecutive failures -> half-open probe after `cooldown`."""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self._probing = False
+
+    def allow(self, now: float) -> bool:
+        """May a call go out now? In half-open state only one probe at a time."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if now < self.open_until:
+                return False
+            self.state = HALF_OPEN
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self):
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._probing = False
+
+    def record_failure(self, now: float) -> bool:
+        """Count a failed call. True if this opened the breaker."""
+        self.consecutive_failures += 1
+        was_open = self.state != CLOSED
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.threshold:
+            self._open(now + self.cooldown)
+            return not was_open
+        return False
+
+    def hold(self, until: float) -> bool:
+        """Stay open until `until` (the provider asked us to back off). True if this opened it."""
+        was_open = self.state != CLOSED
+        self._open(max(until, self.open_until))
+        return not was_open
+
+    def release(self):
+        """A half-open probe finished without deciding anything (cancelled / not the provider's fault)."""
+        self._probing = False
+
+    def _open(self, until: float):
+        self.state = OPEN
+        self.open_until = until
+        self._probing = False
+
+
+class Provider:
+    """Breaker and counters shared by every agent calling the same API host."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.breaker = CircuitBreaker()
+        self.stats = ProviderStats()
+
+    def snapshot(self) -> Dict:
+        now = time.monotonic()
+        return {
+            **asdict(self.stats),
+            "mean_latency": self.stats.mean_latency,
+            "breaker": self.breaker.state,
+            "breaker_open_for": max(0.0, self.breaker.open_until - now) if self.breaker.state == OPEN else 0.0,
+            "consecutive_failures": self.breaker.consecutive_failures
+        }
+
+
+_providers: Dict[str, Provider] = {}
+
+
+def get_provider(name: str) -> Provider:
+    provider = _providers.get(name)
+    if provider is None:
+        provider = _providers[name] = Provider(name)
+    return provider
+
+
+def provider_stats() -> Dict[str, Dict]:
+    """Counters and breaker state for every provider called so far."""
+    return {name: provider.snapshot() for name, provider in _providers.items()}
+
+
+_agents: Dict[str, DecisionStats] = {}
+
+
+def register_agent(name: str, stats: DecisionStats):
+    """Report this agent's decision counters (replaces a previous tournament's agent of the same name)."""
+    _agents[name] = stats
+
+
+def decision_stats() -> Dict[str, Dict]:
+    """Decisions, fallbacks by cause and decision times for the latest agent under each name."""
+    return {name: stats.summary() for name, stats in _agents.items()}
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), None if absent / unparseable."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff(attempt: int) -> float:
+    """Full jitter: uniform in [0, min(BACKOFF_MAX, BACKOFF_BASE * 2^attempt)]."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+async def call_with_resilience(
+    provider: Provider,
+    attempt: Callable[[], Awaitable[str]],
+    deadline: float = DECISION_DEADLINE,
+    max_retries: int = MAX_RETRIES
+) -> str:
+    """
+    Run `attempt` (one LLM request) under the provider's breaker, retrying
+    transient failures within `deadline` seconds. Raises CircuitOpenError,
+    DeadlineExceeded, or the last attempt's error.
+    """
+    stats, breaker = provider.stats, provider.breaker
+    stats.calls += 1
+    start = time.monotonic()
+    end = start + deadline
+
+    if not breaker.allow(start):
+        stats.breaker_rejections += 1
+        raise CircuitOpenError(f"{provider.name} circuit open")
+
+    tries = 0
+    try:
+        while True:
+            remaining = end - time.monotonic()
+            stats.attempts += 1
+            try:
+                result = await asyncio.wait_for(attempt(), remaining)
+            except Exception as e:
+                wait = _classify(stats, e, tries)
+                if wait is None:  # Not the provider's fault (missing key, malformed reply) - don't retry
+                    stats.failures += 1
+                    raise
+                now = time.monotonic()
+                if isinstance(e, httpx.HTTPStatusError) and (hint := retry_after(e.response)) is not None:
+                    if now + hint > end - MIN_ATTEMPT_TIME:
+                        # Provider wants more time than this call has - stop asking until then
+                        stats.failures += 1
+                        if breaker.hold(now + hint):
+                            stats.breaker_opens += 1
+                        raise
+                    wait = hint
+                if tries >= max_retries or now + wait > end - MIN_ATTEMPT_TIME:
+                    stats.failures += 1
+                    if breaker.record_failure(now):
+                        stats.breaker_opens += 1
+                    if isinstance(e, asyncio.TimeoutError) or now + wait > end - MIN_ATTEMPT_TIME:
+                        stats.deadline_exceeded += 1
+                    if isinstance(e, asyncio.TimeoutError):
+                        raise DeadlineExceeded(f"{provider.name}: no reply within {deadline:.0f}s") from e
+                    raise
+                tries += 1
+                stats.retries += 1
+                await asyncio.sleep(wait)
+                continue
+            breaker.record_success()
+            stats.successes += 1
+            stats.total_latency += time.monotonic() - start
+            return result
+    finally:
+        breaker.release()  # Let the next probe through if this one didn't settle the state
+
+
+def _classify(stats: ProviderStats, error: Exception, tries: int) -> Optional[float]:
+    """Count a failed attempt. Backoff before retrying, or None if it isn't worth retrying."""
+    if isinstance(error, asyncio.TimeoutError):
+        stats.timeouts += 1
+        return 0.0  # The budget is spent; the deadline check ends the call
+    if isinstance(error, httpx.TimeoutException):
+        stats.timeouts += 1
+    elif isinstance(error, httpx.TransportError):
+        stats.connection_errors += 1
+    elif isinstance(error, httpx.HTTPStatusError) and error.response.status_code in RETRYABLE_STATUS:
+        if error.response.status_code == 429:
+            stats.rate_limited += 1
+        else:
+            stats.server_errors += 1
+    else:
+        return None
+    return backoff(tries)
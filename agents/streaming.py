@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Streaming Decisions
+Reads a decision reply as the model writes it, so the table can move on
+once "action" (and "amount", for bets and raises) have arrived instead of
+waiting for the whole completion - the text fields that follow are most of
+the tokens.
+
+DecisionStream is an incremental parser for the decision object: feed() it
+text deltas in any chunking and it keeps every finished top-level field,
+plus the string it is in the middle of. Text before the object (code
+fences, preambles) is skipped; nested values are skipped over whole.
+Anything it can't follow is left to core/decision_parser.py on the full
+text once the stream ends.
+
+The delta extractors pull the text out of one server-sent event from an
+OpenAI-compatible chat completion stream or Gemini's streamGenerateContent;
+the usage extractors pull out token counts, from a whole reply or the
+stream's usage event.
+"""
+
+import json
+from typing import Dict, Optional, Tuple
+
+from core.ai_player import AIDecision
+from core.decision_parser import ACTION_NAMES, ParseError, parse_amount
+from core.game_engine import Action
+
+
+TEXT_FIELDS = ("reasoning", "inner_thoughts", "trash_talk")
+SIZED_ACTIONS = {Action.BET, Action.RAISE}  # Need "amount" before they can be played
+
+# Parser states
+SEEK, KEY, IN_KEY, COLON, VALUE, IN_STRING, IN_SCALAR, NESTED, DONE = range(9)
+WHITESPACE = " \t\r\n"
+
+
+class DecisionStream:
+    """Incremental parser for one streamed decision object."""
+
+    def __init__(self):
+        self.text = ""  # Everything fed so far
+        self.fields: Dict[str, object] = {}
+        self.key: Optional[str] = None  # Field whose value is being read
+        self._state = SEEK
+        self._buf = []  # Current key / string / scalar
+        self._escape = False
+        self._depth = 0  # NESTED: brackets still open
+        self._nested_string = False
+
+    @property
+    def done(self) -> bool:
+        """The object's closing brace has arrived."""
+        return self._state == DONE
+
+    @property
+    def ready(self) -> bool:
+        """Enough has arrived to play the decision."""
+        action = self.action
+        if action is None:
+            return False
+        return action not in SIZED_ACTIONS or "amount" in self.fields or self.done
+
+    @property
+    def action(self) -> Optional[Action]:
+        """The action, once it has arrived and names one we know."""
+        if "action" not in self.fields:
+            return None
+        return ACTION_NAMES.get(str(self.fields["action"]).strip().lower())
+
+    @property
+    def error(self) -> Optional[ParseError]:
+        """Why the decision can't be played: "action" arrived naming no action (as parse_decision reports it)."""
+        if "action" not in self.fields or self.action is not None:
+            return None
+        raw_action = self.fields["action"]
+        if raw_action is None:
+            return ParseError("no_action", "Reply has no \"action\" field")
+        return ParseError("unknown_action", f"Unknown action {raw_action!r}")
+
+    def decision(self) -> AIDecision:
+        """The decision as far as it has arrived (text fields may still be partial)."""
+        decision = AIDecision(self.action or Action.FOLD, self._amount(), "")
+        self.fill(decision)
+        return decision
+
+    def fill(self, decision: AIDecision):
+        """Copy the text fields received so far (including the one in progress) onto a decision."""
+        for name in TEXT_FIELDS:
+            value = self.partial(name)
+            if value is not None:
+                setattr(decision, name, value)
+
+    def partial(self, name: str) -> Optional[str]:
+        """A string field's value: finished, in progress, or None if it hasn't started."""
+        if name in self.fields:
+            value = self.fields[name]
+            return value if isinstance(value, str) else None
+        if self._state == IN_STRING and self.key == name:
+            return _decode_partial("".join(self._buf))
+        return None
+
+    def _amount(self) -> int:
+        return parse_amount(self.fields.get("amount"))[0]
+
+    def feed(self, chunk: str):
+        """Advance over a text delta."""
+        self.text += chunk
+        state, buf = self._state, self._buf
+        for ch in chunk:
+            if state == IN_STRING or state == IN_KEY:
+                if self._escape:
+                    self._escape = False
+                    buf.append(ch)
+                elif ch == "\\":
+                    self._escape = True
+                    buf.append(ch)
+                elif ch == '"':
+                    value = _decode("".join(buf))
+                    buf.clear()
+                    if state == IN_KEY:
+                        self.key = value
+                        state = COLON
+                    else:
+                        self.fields[self.key] = value
+                        state = KEY
+                else:
+                    buf.append(ch)
+            elif state == SEEK:
+                if ch == "{":
+                    state = KEY
+            elif state == KEY:
+                if ch == '"':
+                    state = IN_KEY
+                elif ch == "}":
+                    state = DONE
+                    break
+                # Whitespace and commas between fields
+            elif state == COLON:
+                if ch == ":":
+                    state = VALUE
+            elif state == VALUE:
+                if ch == '"':
+                    state = IN_STRING
+                elif ch in "{[":
+                    state = NESTED
+                    self._depth = 1
+                elif ch not in WHITESPACE:
+                    buf.append(ch)
+                    state = IN_SCALAR
+            elif state == IN_SCALAR:
+                if ch in ",}" or ch in WHITESPACE:
+                    self.fields[self.key] = _scalar("".join(buf))
+                    buf.clear()
+                    state = KEY
+                    if ch == "}":
+                        state = DONE
+                        break
+                else:
+                    buf.append(ch)
+            elif state == NESTED:
+                if self._nested_string:
+                    if self._escape:
+                        self._escape = False
+                    elif ch == "\\":
+                        self._escape = True
+                    elif ch == '"':
+                        self._nested_string = False
+                elif ch == '"':
+                    self._nested_string = True
+                elif ch in "{[":
+                    self._depth += 1
+                elif ch in "}]":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        state = KEY
+            else:  # DONE
+                break
+        self._state = state
+
+
+def _decode(raw: str) -> str:
+    try:
+        return json.loads(f'"{raw}"')
+    except ValueError:
+        return raw
+
+
+def _decode_partial(raw: str) -> str:
+    """Decode a string cut off mid-stream (possibly mid-escape: drop up to 5 trailing chars)."""
+    for cut in range(6):
+        try:
+            return json.loads(f'"{raw[:len(raw) - cut]}"')
+        except ValueError:
+            continue
+    return raw
+
+
+def _scalar(raw: str):
+    """A bare JSON value: number, true/false/null, or the raw text."""
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+def openai_delta(event: Dict) -> Optional[str]:
+    """Text in one chat.completion.chunk event (or a whole chat.completion)."""
+    choices = event.get("choices") or ()
+    if not choices:
+        return None
+    return (choices[0].get("delta") or choices[0].get("message") or {}).get("content")
+
+
+def gemini_delta(event: Dict) -> Optional[str]:
+    """Text in one streamGenerateContent (alt=sse) event (or a whole generateContent reply)."""
+    candidates = event.get("candidates") or ()
+    if not candidates:
+        return None
+    parts = candidates[0].get("content", {}).get("parts") or ()
+    return "".join(part.get("text", "") for part in parts) or None
+
+
+def openai_usage(event: Dict) -> Optional[Tuple[int, int, int]]:
+    """(prompt, completion, cached prompt) tokens from a chat completion or the stream's usage chunk."""
+    usage = event.get("usage")
+    if not usage:
+        return None
+    details = usage.get("prompt_tokens_details") or {}
+    cached = details.get("cached_tokens") or usage.get("prompt_cache_hit_tokens") or 0  # OpenAI/xAI, DeepSeek
+    return usage.get("prompt_tokens") or 0, usage.get("completion_tokens") or 0, cached
+
+
+def gemini_usage(event: Dict) -> Optional[Tuple[int, int, int]]:
+    """(prompt, completion, cached prompt) tokens from usageMetadata (cumulative in stream events)."""
+    usage = event.get("usageMetadata")
+    if not usage:
+        return None
+    completion = (usage.get("candidatesTokenCount") or 0) + (usage.get("thoughtsTokenCount") or 0)
+    return usage.get("promptTokenCount") or 0, completion, usage.get("cachedContentTokenCount") or 0
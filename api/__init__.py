@@ -7,13 +7,15 @@ from .server import (
     broadcast_hand_start,
     broadcast_hole_cards,
     broadcast_action,
+    broadcast_action_text,
     broadcast_community_cards,
     broadcast_hand_result,
     broadcast_elimination,
     broadcast_blinds_up,
     broadcast_tournament_start,
     broadcast_tournament_end,
-    update_player_chips
+    update_player_chips,
+    close_broker
 )
 
 __all__ = [
@@ -23,11 +25,13 @@ __all__ = [
     "broadcast_hand_start",
     "broadcast_hole_cards",
     "broadcast_action",
+    "broadcast_action_text",
     "broadcast_community_cards",
     "broadcast_hand_result",
     "broadcast_elimination",
     "broadcast_blinds_up",
     "broadcast_tournament_start",
     "broadcast_tournament_end",
-    "update_player_chips"
+    "update_player_chips",
+    "close_broker"
 ]
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Per-viewer outbound queues
+Each WebSocket gets a bounded queue and its own writer task, so a slow
+spectator only ever delays itself.
+
+Overflow policies when a viewer's queue is full:
+- drop_oldest: discard the oldest non-critical event (actions, chip updates,
+               streamed decision text in progress)
+- coalesce:    first replace a queued chip update or in-progress decision
+               text for the same player, then fall back to drop_oldest
+- disconnect:  close the laggard; it can reconnect and get a fresh snapshot
+
+Critical events (hand/tournament structure, a decision's final text) are
+never dropped - if the queue is full of them the viewer is disconnected
+under every policy.
+
+Events are serialized once into a Frame shared by every queue, so fan-out
+cost per viewer is a deque append plus the socket write. Frames can also
+carry the compact binary encoding (api/wire.py) for viewers that asked for it.
+"""
+
+import asyncio
+import json
+import os
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from fastapi import WebSocket
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_COALESCE = "coalesce"
+OVERFLOW_DISCONNECT = "disconnect"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE, OVERFLOW_DISCONNECT)
+
+QUEUE_SIZE = int(os.getenv("WS_QUEUE_SIZE", "256"))         # Events buffered per viewer
+OVERFLOW_POLICY = os.getenv("WS_OVERFLOW_POLICY", OVERFLOW_COALESCE)
+SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "10"))     # Seconds before a stuck send drops the viewer
+
+# Safe to lose: later events carry the same pot / chip totals (or the same decision text so far)
+DROPPABLE_EVENTS = {"action", "chip_update", "pot_update", "pong", "action_text"}
+# Superseded by a newer event with the same key
+COALESCE_KEYS = {"chip_update": "player", "action_text": "player"}
+# Data flag marking the last event of a series - critical, never dropped or replaced
+FINAL_FLAGS = {"action_text": "final"}
+
+
+def dumps(message: Dict) -> str:
+    """JSON text for a WebSocket frame (orjson when installed, same output shape either way)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(message, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class Frame:
+    """An event serialized once, plus the metadata the overflow policies need."""
+    __slots__ = ("type", "key", "text", "binary", "seq", "droppable")
+
+    def __init__(self, type: str, key: Optional[Tuple[str, str]], text: str, binary: Optional[bytes] = None,
+                 seq: Optional[int] = None, droppable: Optional[bool] = None):
+        self.type = type
+        self.key = key        # Coalescing key, None if the event never coalesces
+        self.text = text      # Encoded JSON sent as-is to every viewer
+        self.binary = binary  # Compact encoding, None for frames that only exist as JSON
+        self.seq = seq        # Stream position (SSE event id), None for unsequenced frames
+        self.droppable = type in DROPPABLE_EVENTS if droppable is None else droppable  # Safe to lose on overflow
+
+
+def loads(text: str) -> Dict:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def encode_event(message: Dict, text: Optional[str] = None) -> Frame:
+    """Serialize an event for fan-out (`text`: already encoded, e.g. relayed by the broker)."""
+    event_type = message.get("type")
+    data = message.get("data") or {}
+    text = dumps(message) if text is None else text
+    flag = FINAL_FLAGS.get(event_type)
+    if flag and data.get(flag):
+        return Frame(event_type, None, text, seq=message.get("seq"), droppable=False)
+    field = COALESCE_KEYS.get(event_type)
+    key = (event_type, data.get(field)) if field else None
+    return Frame(event_type, key, text, seq=message.get("seq"))
+
+
+class ClientConnection:
+    """One viewer: a bounded outbound queue drained by a dedicated writer task."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        on_close: Callable[["ClientConnection"], None],
+        max_queue: int = QUEUE_SIZE,
+        policy: str = OVERFLOW_POLICY,
+        send_timeout: float = SEND_TIMEOUT,
+        binary: bool = False
+    ):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.binary = binary  # Send Frame.binary when a frame has one
+        self.closed = False
+        self.send_started: Optional[float] = None  # Loop time the in-flight write began
+        self.dropped = 0     # Events discarded on overflow
+        self.coalesced = 0   # Events replaced by a newer one
+        self._on_close = on_close
+        self._queue: Deque[Frame] = deque()
+        self._wakeup = asyncio.Event()
+        self._writer = asyncio.create_task(self._write_loop())
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, frame: Frame) -> bool:
+        """Queue a frame without touching the network. False if the viewer was dropped."""
+        if self.closed:
+            return False
+        if len(self._queue) >= self.max_queue and not self._make_room(frame):
+            if self.policy != OVERFLOW_DISCONNECT and frame.droppable:
+                self.dropped += 1  # Backlog is all critical - lose the new event instead
+                return True
+            self.close()
+            return False
+        self._queue.append(frame)
+        self._wakeup.set()
+        return True
+
+    def _make_room(self, frame: Frame) -> bool:
+        """Free one slot according to the overflow policy."""
+        if self.policy == OVERFLOW_DISCONNECT:
+            return False
+
+        if self.policy == OVERFLOW_COALESCE:
+            if frame.key is not None:
+                for i, queued in enumerate(self._queue):
+                    if queued.key == frame.key:
+                        del self._queue[i]
+                        self.coalesced += 1
+                        return True
+
+        for i, queued in enumerate(self._queue):
+            if queued.droppable:
+                del self._queue[i]
+                self.dropped += 1
+                return True
+        return False
+
+    def stalled(self, now: float) -> bool:
+        """True if the current write has been blocked longer than send_timeout."""
+        return self.send_started is not None and now - self.send_started > self.send_timeout
+
+    async def _write_loop(self):
+        # No per-send wait_for (it costs a task per frame) - ConnectionManager's
+        # watchdog closes connections whose send_started gets too old
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                while not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                frame = self._queue.popleft()
+                self.send_started = loop.time()
+                await self._send(frame)
+                self.send_started = None
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            self.close()
+
+    async def _send(self, frame: Frame):
+        if self.binary and frame.binary is not None:
+            await self.websocket.send_bytes(frame.binary)
+        else:
+            await self.websocket.send_text(frame.text)
+
+    def close(self):
+        """Stop writing, close the socket and detach from the manager (idempotent)."""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.clear()
+        if self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        asyncio.create_task(self._close_socket())
+        self._on_close(self)
+
+    async def _close_socket(self):
+        try:
+            await self.websocket.close(code=1008)  # Policy violation: too slow
+        except Exception:
+            pass  # Already gone
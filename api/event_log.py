@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Event Ring Buffer
+Recent broadcast frames with sequence numbers, so reconnecting viewers can
+replay what they missed instead of pulling a full snapshot.
+
+Sequence numbers start at 1 and increase by one per broadcast. A viewer
+that saw up to `seq` reconnects with /ws?since=<seq>&epoch=<epoch>; if
+every later frame is still buffered it gets exactly those, otherwise a
+fresh snapshot. The epoch changes on every server start, so sequence
+numbers from a previous run are never replayed against a new one.
+
+With a pub/sub broker (api/pubsub.py) the broker owns the numbering and
+each worker's log follows it, so any worker can resume any viewer.
+"""
+
+import os
+import secrets
+from typing import List, Optional, Union
+
+from api.connections import Frame
+
+
+EVENT_BUFFER_SIZE = int(os.getenv("WS_EVENT_BUFFER", "512"))  # Frames kept for resume
+
+# Workers keep encoded Frames; the broker keeps the raw lines it relays
+Entry = Union[Frame, bytes]
+
+
+class EventLog:
+    """Fixed-size ring of the most recent frames, indexed by sequence number."""
+
+    def __init__(self, size: int = EVENT_BUFFER_SIZE):
+        self.size = size
+        self.epoch = secrets.token_hex(4)  # Identifies this run's sequence numbers
+        self.last_seq = 0  # Sequence number of the newest frame (0 = nothing yet)
+        self._start = 1    # Oldest sequence number this log has ever held
+        self._ring: List[Optional[Entry]] = [None] * size
+
+    @property
+    def first_seq(self) -> int:
+        """Oldest sequence number still buffered."""
+        return max(self._start, self.last_seq - self.size + 1)
+
+    def next_seq(self) -> int:
+        return self.last_seq + 1
+
+    def append(self, seq: int, frame: Entry):
+        """Store the frame for `seq` (must be next_seq())."""
+        if seq != self.last_seq + 1:
+            raise ValueError(f"Out of order event: {seq} after {self.last_seq}")
+        self._ring[seq % self.size] = frame
+        self.last_seq = seq
+
+    def reset(self, epoch: str, last_seq: int):
+        """Start following another log (the broker's) after `last_seq`."""
+        self.epoch = epoch
+        self.last_seq = last_seq
+        self._start = last_seq + 1
+        self._ring = [None] * self.size
+
+    def since(self, seq: int) -> Optional[List[Entry]]:
+        """
+        Frames after `seq`, oldest first. None if some of them have already
+        been overwritten (or `seq` is from the future, e.g. a server restart).
+        """
+        if seq > self.last_seq or seq < self.first_seq - 1:
+            return None
+        return [self._ring[s % self.size] for s in range(seq + 1, self.last_seq + 1)]
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Event Pub/Sub
+Decouples the tournament from spectator fan-out.
+
+- LocalBroker:      default; events go straight to this process's viewers
+- SocketPublisher:  the tournament process streams events to a broker
+- EventBroker:      stand-in broker on a local TCP or unix socket; numbers
+                    events, keeps the shared ring buffer and relays to workers
+- BrokerSubscriber: each uvicorn worker mirrors the broker's ring and game
+                    state and fans out to its own viewers
+
+With BROKER_URL set (tcp://127.0.0.1:7070 or unix:///tmp/poker.sock):
+
+    python -m api.pubsub --listen tcp://127.0.0.1:7070
+    BROKER_URL=tcp://127.0.0.1:7070 uvicorn api.server:app --workers 4
+    BROKER_URL=tcp://127.0.0.1:7070 python run_tournament.py
+
+Wire format is one line per message:
+    PUB <event json>     publisher -> broker
+    SNAP <state json>    publisher -> broker, game state after its last PUB
+    SUB <epoch> <seq>    worker -> broker, resume after seq if epoch matches
+    HELLO <json>         broker -> worker, then SNAP (if any) and the replay
+    <event json>         broker -> worker, with "seq" added
+The broker never decodes events - it splices the sequence number into the
+publisher's JSON and relays the same bytes to every worker, which send them
+to viewers unchanged.
+"""
+
+import argparse
+import asyncio
+import os
+from collections import deque
+from typing import Deque, Optional, Set, Tuple
+
+from api.connections import dumps, loads
+from api.event_log import EVENT_BUFFER_SIZE, EventLog
+
+
+BROKER_URL = os.getenv("BROKER_URL", "")  # Empty = single process, no broker
+SUBSCRIBER_BUFFER = int(os.getenv("BROKER_SUBSCRIBER_BUFFER", str(4 * 1024 * 1024)))  # Bytes before a worker is cut off
+RECONNECT_DELAY = 1.0  # Seconds between broker connection attempts
+LINE_LIMIT = 16 * 1024 * 1024  # Longest line (snapshots include hand history)
+
+# Events after which the publisher sends a state snapshot; late workers
+# restore it and replay the ring from there
+SNAPSHOT_EVENTS = {"tournament_start", "hand_start", "tournament_end"}
+
+
+def parse_url(url: str) -> Tuple[str, str, int]:
+    """('unix', path, 0) or ('tcp', host, port)."""
+    if url.startswith("unix://"):
+        return "unix", url[len("unix://"):], 0
+    host, _, port = url[len("tcp://"):].rpartition(":") if url.startswith("tcp://") else url.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Bad broker URL: {url} (want tcp://host:port or unix:///path)")
+    return "tcp", host, int(port)
+
+
+async def open_connection(url: str):
+    kind, address, port = parse_url(url)
+    if kind == "unix":
+        return await asyncio.open_unix_connection(address, limit=LINE_LIMIT)
+    return await asyncio.open_connection(address, port, limit=LINE_LIMIT)
+
+
+class LocalBroker:
+    """Single process: the tournament and the viewers share one ConnectionManager."""
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    async def publish(self, event: dict, state=None):
+        await self.manager.broadcast(event)
+
+    async def aclose(self):
+        pass
+
+
+class SocketPublisher:
+    """
+    Tournament side. publish() only queues; a sender task streams events to
+    the broker in order, reconnecting as needed. If the broker is down the
+    oldest queued events are dropped - the next snapshot covers them.
+    """
+
+    def __init__(self, url: str, max_pending: int = EVENT_BUFFER_SIZE):
+        self.url = url
+        self.dropped = 0  # Events lost while the broker was unreachable
+        self._pending: Deque[bytes] = deque()
+        self._max_pending = max_pending
+        self._wakeup = asyncio.Event()
+        self._sender: Optional[asyncio.Task] = None
+
+    async def publish(self, event: dict, state=None):
+        """Queue an event (plus a state snapshot after structural events)."""
+        data = b"PUB " + dumps(event).encode() + b"\n"
+        if state is not None and event.get("type") in SNAPSHOT_EVENTS:
+            data += b"SNAP " + dumps(state.snapshot()).encode() + b"\n"
+        if len(self._pending) >= self._max_pending:
+            self._pending.popleft()
+            self.dropped += 1
+        self._pending.append(data)
+        self._wakeup.set()
+        if self._sender is None or self._sender.done():
+            self._sender = asyncio.create_task(self._send_loop())
+
+    async def _send_loop(self):
+        writer = None
+        try:
+            while True:
+                try:
+                    if writer is None:
+                        _, writer = await open_connection(self.url)
+                    while not self._pending:
+                        self._wakeup.clear()
+                        await self._wakeup.wait()
+                    data = b"".join(self._pending)  # Everything queued goes in one write
+                    self._pending.clear()
+                    writer.write(data)
+                    await writer.drain()
+                except (OSError, ConnectionError) as e:
+                    print(f"[PUBSUB] Broker unavailable ({e}), retrying in {RECONNECT_DELAY:.0f}s")
+                    writer = None
+                    await asyncio.sleep(RECONNECT_DELAY)
+        finally:
+            if writer is not None:
+                writer.close()  # Flushes whatever is still buffered
+
+    async def aclose(self, timeout: float = 5.0):
+        """Wait (up to `timeout`) for queued events to reach the broker, then disconnect."""
+        await asyncio.sleep(0)  # Let fire-and-forget broadcast tasks queue their events
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self._pending and self._sender and not self._sender.done() and loop.time() < deadline:
+            await asyncio.sleep(0.01)
+        if self._sender:
+            self._sender.cancel()
+            try:
+                await self._sender
+            except asyncio.CancelledError:
+                pass
+
+
+class EventBroker:
+    """
+    The stand-in broker. Assigns sequence numbers, keeps the last
+    EVENT_BUFFER_SIZE events and the latest snapshot for late joiners, and
+    relays every event to subscribed workers. A worker that falls more than
+    SUBSCRIBER_BUFFER bytes behind is disconnected and resyncs on reconnect.
+    """
+
+    def __init__(self, size: int = EVENT_BUFFER_SIZE, max_buffer: int = SUBSCRIBER_BUFFER):
+        self.log = EventLog(size)
+        self.max_buffer = max_buffer
+        self.snapshot: Optional[bytes] = None
+        self.snapshot_seq = 0  # Sequence number the snapshot is current as of
+        self.subscribers: Set[asyncio.StreamWriter] = set()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        last_published = 0  # Sequence number of this connection's latest PUB
+        try:
+            while line := await reader.readline():
+                command, _, payload = line.rstrip(b"\n").partition(b" ")
+                if command == b"PUB":
+                    last_published = self.publish(payload)
+                elif command == b"SNAP":
+                    self.snapshot, self.snapshot_seq = payload, last_published
+                elif command == b"SUB":
+                    self.subscribe(writer, payload)
+                else:
+                    print(f"[BROKER] Unknown command: {command[:20]!r}")
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+    def publish(self, event: bytes) -> int:
+        """Number an event, keep it and relay it. Returns its sequence number."""
+        seq = self.log.next_seq()
+        line = b'{"seq":%d,' % seq + event[1:] + b"\n"
+        self.log.append(seq, line)
+        for writer in list(self.subscribers):
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                print("[BROKER] Dropping lagging worker")
+                self.subscribers.discard(writer)
+                writer.close()
+            else:
+                writer.write(line)
+        return seq
+
+    def subscribe(self, writer: asyncio.StreamWriter, payload: bytes):
+        """Send HELLO, the snapshot and the missed (or all buffered) events, then follow live."""
+        epoch, _, since = payload.decode().partition(" ")
+        missed = None
+        if epoch == self.log.epoch and since.isdigit():
+            missed = self.log.since(int(since))
+        if missed is None:
+            missed = self.log.since(self.log.first_seq - 1)
+        hello = {
+            "epoch": self.log.epoch,
+            "first_seq": self.log.last_seq - len(missed) + 1,
+            "last_seq": self.log.last_seq,
+            "snapshot_seq": self.snapshot_seq if self.snapshot is not None else None
+        }
+        writer.write(b"HELLO " + dumps(hello).encode() + b"\n")
+        if self.snapshot is not None:
+            writer.write(b"SNAP " + self.snapshot + b"\n")
+        writer.writelines(missed)
+        self.subscribers.add(writer)
+        print(f"[BROKER] Worker subscribed ({len(missed)} events replayed). Workers: {len(self.subscribers)}")
+
+    async def serve(self, url: str):
+        kind, address, port = parse_url(url)
+        if kind == "unix":
+            server = await asyncio.start_unix_server(self.handle, address, limit=LINE_LIMIT)
+        else:
+            server = await asyncio.start_server(self.handle, address, port, limit=LINE_LIMIT)
+        print(f"[BROKER] Listening on {url} (epoch {self.log.epoch}, {self.log.size} events buffered)")
+        async with server:
+            await server.serve_forever()
+
+
+class BrokerSubscriber:
+    """
+    Worker side. Mirrors the broker's event ring into the ConnectionManager
+    (so ?since= resume works against any worker) and replays events into
+    the worker's GameState. When it can't continue where it left off -
+    first start, broker restart, or a gap - it restores the broker's
+    snapshot and re-sends init to its viewers.
+    """
+
+    def __init__(self, url: str, manager, state):
+        self.url = url
+        self.manager = manager
+        self.state = state
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def aclose(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        while True:
+            writer = None
+            try:
+                reader, writer = await open_connection(self.url)
+                log = self.manager.events
+                writer.write(f"SUB {log.epoch} {log.last_seq}\n".encode())
+                await writer.drain()
+                await self._follow(reader)
+                print("[PUBSUB] Broker closed the connection")
+            except (OSError, ConnectionError, ValueError, asyncio.IncompleteReadError) as e:
+                print(f"[PUBSUB] Broker unavailable ({e}), retrying in {RECONNECT_DELAY:.0f}s")
+            finally:
+                if writer is not None:
+                    writer.close()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _follow(self, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line.startswith(b"HELLO "):
+            raise ValueError(f"Expected HELLO, got {line[:20]!r}")
+        hello = loads(line[len("HELLO "):])
+        snapshot = None
+        if hello["snapshot_seq"] is not None:
+            snapshot = loads((await reader.readline())[len("SNAP "):])
+
+        log = self.manager.events
+        resync = hello["epoch"] != log.epoch or hello["first_seq"] > log.last_seq + 1
+        applied_through = 0  # Events up to here are already reflected in state
+        if resync:
+            self.manager.reset_stream(hello["epoch"], hello["first_seq"] - 1)
+            self.state.restore(snapshot)
+            applied_through = hello["snapshot_seq"] or 0
+            if hello["last_seq"] < hello["first_seq"]:
+                self.manager.resync()  # Nothing to replay
+        print(f"[PUBSUB] Subscribed to {self.url} (epoch {hello['epoch']}, "
+              f"{'resync' if resync else 'resume'} from seq {hello['first_seq']})")
+
+        while line := await reader.readline():
+            text = line.rstrip(b"\n").decode()
+            event = loads(text)
+            seq = event["seq"]
+            if seq <= log.last_seq:
+                continue  # Already have it (overlap after a reconnect)
+            if seq > applied_through:
+                self.state.apply(event)
+            if resync and seq <= hello["last_seq"]:
+                # Catching up: keep it for resume, viewers get one init at the end
+                self.manager.deliver(seq, event, text, fanout=False)
+                if seq == hello["last_seq"]:
+                    self.manager.resync()
+            else:
+                self.manager.deliver(seq, event, text)
+
+
+async def run_broker(url: str, size: int):
+    await EventBroker(size).serve(url)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local event broker")
+    parser.add_argument("--listen", default=BROKER_URL or "tcp://127.0.0.1:7070",
+                        help="tcp://host:port or unix:///path")
+    parser.add_argument("--buffer", type=int, default=EVENT_BUFFER_SIZE, help="Events kept for late joiners")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run_broker(args.listen, args.buffer))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -8,17 +8,29 @@ import os
 import sys
 import json
 import asyncio
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Set, Optional
+from typing import Deque, Dict, List, Set, Optional, Tuple
 from dataclasses import dataclass, asdict
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from contextlib import asynccontextmanager
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from core.ai_player import current_usage, prompt_stats
+from core.history import HistoryQueryError, open_history_store
+from core.stats import STATS_PATH, StatsTracker
+from agents.resilience import decision_stats, provider_stats
+from api.connections import OVERFLOW_DISCONNECT, SEND_TIMEOUT, ClientConnection, Frame, encode_event
+from api.event_log import EventLog
+from api.pubsub import BROKER_URL, BrokerSubscriber, LocalBroker, SocketPublisher
+from api.streams import (POLL_TIMEOUT, SSE_MEDIA_TYPE, STREAM_HEADERS, SSEConnection, SSEStream,
+                         cached_json, parse_event_id, poll_body)
+from api.wire import FORMAT_COMPACT, FORMAT_JSON, CompactEncoder
+
 
 # Global state
 class GameState:
@@ -27,10 +39,51 @@ class GameState:
         self.current_hand: Optional[Dict] = None
         self.tournament_info: Optional[Dict] = None
         self.players: Dict[str, Dict] = {}
-        self.hand_history: List[Dict] = []
+        self.hand_history: Deque[Dict] = deque(maxlen=50)  # Last 50 hand results
         self.is_running = False
         self.connections: Set[WebSocket] = set()
 
+    def apply(self, event: Dict):
+        """
+        Update from a broadcast event. The publisher and every broker worker
+        apply the same events, so they all end up with the same state.
+        """
+        event_type = event.get("type")
+        data = event.get("data") or {}
+        if event_type == "tournament_start":
+            self.is_running = True
+            self.tournament_info = data
+            starting_chips = data.get("config", {}).get("starting_chips", 10000)
+            self.players = {p: {"chips": starting_chips, "active": True} for p in data.get("players", [])}
+        elif event_type == "tournament_end":
+            self.is_running = False
+        elif event_type == "hand_start":
+            self.current_hand = data
+        elif event_type == "hand_result":
+            self.hand_history.append(data)
+        elif event_type == "chip_update":
+            if data.get("player") in self.players:
+                self.players[data["player"]]["chips"] = data.get("chips")
+
+    def snapshot(self) -> Dict:
+        """Everything a late-joining worker needs to serve viewers."""
+        return {
+            "current_hand": self.current_hand,
+            "tournament_info": self.tournament_info,
+            "players": self.players,
+            "hand_history": list(self.hand_history),
+            "is_running": self.is_running
+        }
+
+    def restore(self, snapshot: Optional[Dict]):
+        """Replace state with a snapshot (None = nothing has happened yet)."""
+        snapshot = snapshot or {}
+        self.current_hand = snapshot.get("current_hand")
+        self.tournament_info = snapshot.get("tournament_info")
+        self.players = snapshot.get("players") or {}
+        self.hand_history = deque(snapshot.get("hand_history") or [], maxlen=50)
+        self.is_running = snapshot.get("is_running", False)
+
 game_state = GameState()
 
 
@@ -38,7 +91,14 @@ game_state = GameState()
 async def lifespan(app: FastAPI):
     """Startup/shutdown lifecycle."""
     print("[API] WebSocket server starting...")
+    subscriber = None
+    if BROKER_URL:
+        # Stateless worker: everything comes from the broker
+        subscriber = BrokerSubscriber(BROKER_URL, manager, game_state)
+        subscriber.start()
     yield
+    if subscriber:
+        await subscriber.aclose()
     print("[API] WebSocket server shutting down...")
 
 
@@ -51,56 +111,203 @@ app = FastAPI(
 
 # WebSocket connection manager
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Set[WebSocket] = set()
+    """
+    Fans events out to viewers. broadcast() only enqueues - each viewer's
+    ClientConnection writer task does the network I/O at its own pace.
+    """
 
-    async def connect(self, websocket: WebSocket):
+    def __init__(self):
+        self.clients: Dict[WebSocket, ClientConnection] = {}
+        self.laggards_dropped = 0  # Viewers disconnected for falling behind
+        self.events = EventLog()   # Recent frames for ?since= resume
+        self.wire = CompactEncoder()  # Delta state for ?format=compact viewers
+        self._snapshots: Dict[str, Tuple[tuple, Frame]] = {}  # Cached init frame per format
+        self._watchdog: Optional[asyncio.Task] = None
+        self._next_event: Optional[asyncio.Event] = None  # Set (and replaced) on each event, for long-polls
+
+    @property
+    def active_connections(self) -> Set[WebSocket]:
+        return set(self.clients)
+
+    async def connect(self, websocket: WebSocket, since: Optional[int] = None, epoch: Optional[str] = None,
+                      format: str = FORMAT_JSON, wire: Optional[str] = None):
+        """
+        Register a viewer. With `since`/`epoch` from a previous connection,
+        replay the frames it missed; otherwise (or if they've aged out of
+        the buffer) send a snapshot.
+
+        format="compact" switches the viewer to binary delta frames. Those
+        can't survive a dropped frame, so compact viewers are disconnected
+        rather than dropped when they fall behind, and only resume against
+        the encoder (`wire` id) their delta state came from.
+        """
         await websocket.accept()
-        self.active_connections.add(websocket)
-        print(f"[WS] Client connected. Total: {len(self.active_connections)}")
-
-        # Send current state to new connection
-        await self.send_personal(websocket, {
-            "type": "init",
-            "data": {
-                "tournament": game_state.tournament_info,
-                "current_hand": game_state.current_hand,
-                "players": game_state.players,
-                "is_running": game_state.is_running
+        if format == FORMAT_COMPACT:
+            client = ClientConnection(websocket, self._on_client_closed, policy=OVERFLOW_DISCONNECT, binary=True)
+        else:
+            client = ClientConnection(websocket, self._on_client_closed)
+        self.attach(client, since, epoch, wire)
+
+    def attach(self, client: ClientConnection, since: Optional[int] = None, epoch: Optional[str] = None,
+               wire: Optional[str] = None):
+        """Start fanning out to a connected client (WebSocket or SSE), from a snapshot or `since`."""
+        self.clients[client.websocket] = client
+        if self._watchdog is None or self._watchdog.done():
+            self._watchdog = asyncio.create_task(self._watch_stalled_sends())
+
+        # Synchronous: nothing can be broadcast between reading the buffer
+        # and queueing, so the client sees every event exactly once
+        missed = self.missed_since(since, epoch, client.binary, wire)
+        if missed is None or len(missed) >= client.max_queue:
+            client.enqueue(self._snapshot_frame(client.binary))
+        else:
+            client.enqueue(encode_event({
+                "type": "resume",
+                "data": {"since": since, "replayed": len(missed)}
+            }))
+            for frame in missed:
+                client.enqueue(frame)
+        print(f"[WS] Client connected. Total: {len(self.clients)}")
+
+    def missed_since(self, since: Optional[int], epoch: Optional[str], compact: bool = False,
+                     wire: Optional[str] = None) -> Optional[List[Frame]]:
+        """Buffered frames after `since`, or None if the client has to start from a snapshot."""
+        if since is None or epoch != self.events.epoch or (compact and wire != self.wire.id):
+            return None
+        return self.events.since(since)
+
+    async def wait_for_event(self, timeout: float):
+        """Return when the next event is delivered, or after `timeout` seconds."""
+        if self._next_event is None:
+            self._next_event = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._next_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _wake_pollers(self):
+        if self._next_event is not None:
+            self._next_event.set()
+            self._next_event = None
+
+    def _snapshot_frame(self, compact: bool = False) -> Frame:
+        """
+        Current state as an init frame. Encoded once per event sequence, so a
+        wave of reconnecting viewers shares a single snapshot. Compact viewers
+        also get the delta base to decode the frames that follow.
+        """
+        format = FORMAT_COMPACT if compact else FORMAT_JSON
+        key = (self.events.epoch, self.events.last_seq, game_state.is_running)
+        cached = self._snapshots.get(format)
+        if cached is None or cached[0] != key:
+            message = {
+                "type": "init",
+                "seq": self.events.last_seq,
+                "epoch": self.events.epoch,
+                "data": {
+                    "tournament": game_state.tournament_info,
+                    "current_hand": game_state.current_hand,
+                    "players": game_state.players,
+                    "is_running": game_state.is_running
+                }
             }
-        })
+            if compact:
+                message["wire"] = self.wire.base()
+            cached = self._snapshots[format] = (key, encode_event(message))
+        return cached[1]
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.discard(websocket)
-        print(f"[WS] Client disconnected. Total: {len(self.active_connections)}")
+        client = self.clients.pop(websocket, None)
+        if client:
+            client.close()
+            print(f"[WS] Client disconnected. Total: {len(self.clients)}")
+
+    async def _watch_stalled_sends(self):
+        """Drop viewers whose socket write has been stuck longer than SEND_TIMEOUT."""
+        loop = asyncio.get_running_loop()
+        while self.clients:
+            await asyncio.sleep(SEND_TIMEOUT / 2)
+            now = loop.time()
+            for client in list(self.clients.values()):
+                if client.stalled(now):
+                    client.close()
+
+    def _on_client_closed(self, client: ClientConnection):
+        if self.clients.pop(client.websocket, None) is not None:
+            self.laggards_dropped += 1
+            print(f"[WS] Dropped slow client. Total: {len(self.clients)}")
 
     async def send_personal(self, websocket: WebSocket, message: dict):
-        try:
-            await websocket.send_json(message)
-        except Exception as e:
-            print(f"[WS] Send error: {e}")
+        client = self.clients.get(websocket)
+        if client:
+            client.enqueue(encode_event(message))
 
     async def broadcast(self, message: dict):
-        """Broadcast to all connected clients."""
-        disconnected = set()
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                disconnected.add(connection)
-
-        # Clean up disconnected
-        for conn in disconnected:
-            self.active_connections.discard(conn)
+        """
+        Number the event, serialize it once, keep it for resume and queue the
+        frame for every connected client (never waits on the network).
+        """
+        seq = self.events.next_seq()
+        self.deliver(seq, {**message, "seq": seq})
+
+    def deliver(self, seq: int, message: dict, text: Optional[str] = None, fanout: bool = True):
+        """
+        Encode an already numbered event (JSON, unless `text` has it, plus
+        compact), keep it for resume and queue it for every client.
+        """
+        frame = encode_event(message, text)
+        frame.binary = self.wire.encode(seq, message)
+        self.events.append(seq, frame)
+        if fanout:
+            for client in list(self.clients.values()):
+                client.enqueue(frame)
+            self._wake_pollers()
+
+    def reset_stream(self, epoch: str, last_seq: int):
+        """Follow a different event stream (the broker's) from after `last_seq`."""
+        self.events.reset(epoch, last_seq)
+        self.wire.reset()
+
+    def resync(self):
+        """Send every client a fresh snapshot (the event stream was reset under them)."""
+        for client in list(self.clients.values()):
+            client.enqueue(self._snapshot_frame(client.binary))
+        self._wake_pollers()
+
+    def queue_stats(self) -> Dict:
+        """Backlog and overflow counters across viewers."""
+        clients = list(self.clients.values())
+        return {
+            "max_pending": max((c.pending for c in clients), default=0),
+            "dropped_events": sum(c.dropped for c in clients),
+            "coalesced_events": sum(c.coalesced for c in clients),
+            "laggards_dropped": self.laggards_dropped
+        }
 
 
 manager = ConnectionManager()
 
+# Where broadcast_* send events: straight to this process's viewers, or with
+# BROKER_URL set, to the broker that relays them to every uvicorn worker
+broker = SocketPublisher(BROKER_URL) if BROKER_URL else LocalBroker(manager)
+
+
+async def publish(event: Dict):
+    """Apply an event to game_state and send it to viewers."""
+    game_state.apply(event)
+    await broker.publish(event, game_state)
+
+
+async def close_broker():
+    """Flush events still queued for the broker (no-op without one)."""
+    await broker.aclose()
+
 
 # WebSocket endpoint
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, since: Optional[int] = None, epoch: Optional[str] = None,
+                             format: str = FORMAT_JSON, wire: Optional[str] = None):
+    await manager.connect(websocket, since, epoch, format, wire)
     try:
         while True:
             # Keep connection alive, handle client messages
@@ -118,6 +325,41 @@ async def websocket_endpoint(websocket: WebSocket):
         manager.disconnect(websocket)
 
 
+# HTTP event streams: same frames and sequence numbers as /ws
+@app.get("/api/events")
+async def sse_events(request: Request, since: Optional[int] = None, epoch: Optional[str] = None):
+    """Server-Sent Events. Resumes from Last-Event-ID (or ?since=&epoch=) like /ws."""
+    if since is None:
+        epoch, since = parse_event_id(request.headers.get("last-event-id"))
+    stream = SSEStream()
+    manager.attach(SSEConnection(stream, manager._on_client_closed, lambda: manager.events.epoch), since, epoch)
+
+    async def body():
+        try:
+            async for chunk in stream.chunks():
+                yield chunk
+        finally:
+            manager.disconnect(stream)
+
+    return StreamingResponse(body(), media_type=SSE_MEDIA_TYPE, headers=STREAM_HEADERS)
+
+
+@app.get("/api/poll")
+async def long_poll(since: Optional[int] = None, epoch: Optional[str] = None, timeout: float = POLL_TIMEOUT):
+    """
+    Events after `since`, waiting up to `timeout` seconds if there are none
+    yet. Without a usable since/epoch the only event is an init snapshot.
+    Poll again with since=last_seq.
+    """
+    missed = manager.missed_since(since, epoch)
+    if missed == [] and timeout > 0:
+        await manager.wait_for_event(min(timeout, POLL_TIMEOUT))
+        missed = manager.missed_since(since, epoch)
+    if missed is None:
+        missed = [manager._snapshot_frame()]
+    return poll_body(manager.events.epoch, manager.events.last_seq, missed)
+
+
 # Tournament runner (runs in same process for WebSocket integration)
 tournament_task = None
 
@@ -126,6 +368,7 @@ async def run_tournament_in_server():
     global tournament_task
     from run_tournament import PokerArena
 
+    arena = None
     try:
         arena = PokerArena()
         results = await arena.run_tournament()
@@ -135,6 +378,9 @@ async def run_tournament_in_server():
         import traceback
         traceback.print_exc()
         return None
+    finally:
+        if arena:
+            await arena.aclose()
 
 
 @app.post("/api/start")
@@ -142,6 +388,9 @@ async def start_tournament():
     """Start a new tournament."""
     global tournament_task
 
+    if BROKER_URL:
+        return {"status": "error", "message": "This worker only relays events - run run_tournament.py with the same BROKER_URL"}
+
     if game_state.is_running:
         return {"status": "error", "message": "Tournament already running"}
 
@@ -151,34 +400,133 @@ async def start_tournament():
     return {"status": "started", "message": "Tournament starting..."}
 
 
-# REST endpoints
+# REST endpoints (snapshots - cacheable for SNAPSHOT_MAX_AGE, see api/streams.py)
 @app.get("/api/status")
-async def get_status():
+async def get_status(request: Request):
     """Get current game status."""
-    return {
+    return cached_json(request, {
         "is_running": game_state.is_running,
         "tournament": game_state.tournament_info,
         "players": game_state.players,
-        "viewers": len(manager.active_connections)
-    }
+        "viewers": len(manager.clients),
+        "broker": BROKER_URL or "in-process",
+        "last_seq": manager.events.last_seq,
+        "viewer_queues": manager.queue_stats()
+    })
 
 
 @app.get("/api/players")
-async def get_players():
+async def get_players(request: Request):
     """Get all player info."""
-    return game_state.players
+    return cached_json(request, game_state.players)
 
 
 @app.get("/api/hand")
-async def get_current_hand():
+async def get_current_hand(request: Request):
     """Get current hand state."""
-    return game_state.current_hand or {"status": "no_hand"}
+    return cached_json(request, game_state.current_hand or {"status": "no_hand"})
+
+
+# Written by the tournament runner, read here (any worker on the same host)
+history_store = open_history_store()
 
 
 @app.get("/api/history")
-async def get_history(limit: int = 10):
-    """Get recent hand history."""
-    return game_state.hand_history[-limit:]
+async def get_history(request: Request, limit: int = 10, cursor: Optional[str] = None,
+                      player: Optional[str] = None, tournament: Optional[str] = None,
+                      min_pot: Optional[int] = None, max_pot: Optional[int] = None,
+                      since: Optional[str] = None, until: Optional[str] = None,
+                      won: Optional[bool] = None, sort: str = "recent"):
+    """
+    Hand history, newest first (sort=pot: biggest first). Pass next_cursor
+    back as `cursor` for the next page; since/until take ISO dates or unix time.
+    Without a history database, the last 50 hands seen by this server
+    (unfiltered - filters, cursors and sort=pot need the database).
+    """
+    if history_store is None or not history_store.exists():
+        filters = {"player": player, "tournament": tournament, "min_pot": min_pot, "max_pot": max_pot,
+                   "since": since, "until": until, "won": won, "cursor": cursor}
+        used = [name for name, value in filters.items() if value is not None] + (["sort"] if sort != "recent" else [])
+        if used:
+            message = f"No hand history database: can't apply {', '.join(used)}"
+            return JSONResponse({"status": "error", "message": message}, status_code=503)
+        hands = list(game_state.hand_history)[::-1][:limit]
+        return cached_json(request, {"hands": hands, "next_cursor": None})
+    try:
+        page = await asyncio.to_thread(
+            history_store.query, player=player, tournament=tournament, min_pot=min_pot, max_pot=max_pot,
+            since=since, until=until, won=won, sort=sort, cursor=cursor, limit=limit
+        )
+    except HistoryQueryError as e:
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=400)
+    return cached_json(request, page)
+
+
+@app.get("/api/history/{hand_id}")
+async def get_hand_detail(request: Request, hand_id: int):
+    """One stored hand: hole cards, board, every action and the pots."""
+    hand = None
+    if history_store is not None and history_store.exists():
+        hand = await asyncio.to_thread(history_store.get_hand, hand_id)
+    if hand is None:
+        return JSONResponse({"status": "error", "message": f"No hand {hand_id}"}, status_code=404)
+    return cached_json(request, hand)
+
+
+# Saved by the tournament runner every few hands; reloaded here when the file changes
+_stats_cache: Tuple[Optional[float], Optional[StatsTracker]] = (None, None)
+
+
+def current_stats() -> Optional[StatsTracker]:
+    global _stats_cache
+    try:
+        mtime = os.stat(STATS_PATH).st_mtime if STATS_PATH else None
+    except OSError:
+        mtime = None
+    if mtime is None:
+        return None
+    if _stats_cache[0] != mtime:
+        _stats_cache = (mtime, StatsTracker.load(STATS_PATH))
+    return _stats_cache[1]
+
+
+@app.get("/api/stats")
+async def get_stats(request: Request):
+    """Long-run VPIP / PFR / 3-bet / AF / WTSD for every player."""
+    stats = current_stats()
+    return cached_json(request, stats.overview() if stats else {"hands": 0, "players": {}})
+
+
+@app.get("/api/stats/{player}")
+async def get_player_stats(request: Request, player: str):
+    """One player's stats overall, by position and against each opponent."""
+    stats = current_stats()
+    summary = stats.summary(player) if stats else None
+    if summary is None:
+        return JSONResponse({"status": "error", "message": f"No stats for {player}"}, status_code=404)
+    return cached_json(request, summary)
+
+
+@app.get("/api/providers")
+async def get_providers():
+    """
+    Retry / rate-limit / circuit-breaker counters per LLM provider, how
+    often each agent's local fallback policy played, and estimated decision
+    prompt tokens per section (tournaments run by this server).
+    """
+    return {"providers": provider_stats(), "agents": decision_stats(), "prompts": prompt_stats()}
+
+
+@app.get("/api/usage")
+async def get_usage(hands: int = 20):
+    """
+    Tokens, cache hits, retries, latency and cost of the current tournament's
+    LLM calls, per player and call kind, with its last `hands` hands (max 1000).
+    """
+    usage = current_usage(max(0, min(hands, 1000)))
+    if usage is None:
+        return JSONResponse({"status": "error", "message": "No tournament running in this process"}, status_code=404)
+    return usage
 
 
 # Event broadcasting functions (called by tournament runner)
@@ -195,29 +543,31 @@ async def broadcast_hand_start(hand_number: int, players: List[Dict], blinds: Di
             "deal_order": deal_order or []
         }
     }
-    game_state.current_hand = event["data"]
-    print(f"[WS BROADCAST] hand_start #{hand_number} - players: {[p['name'] for p in players]} - SB: {blinds.get('sb_player')} BB: {blinds.get('bb_player')} - clients: {len(manager.active_connections)}")
-    await manager.broadcast(event)
+    print(f"[WS BROADCAST] hand_start #{hand_number} - players: {[p['name'] for p in players]} - SB: {blinds.get('sb_player')} BB: {blinds.get('bb_player')} - clients: {len(manager.clients)}")
+    await publish(event)
 
 
-async def broadcast_hole_cards(player_cards: Dict[str, List[str]], deal_order: List[str] = None):
+async def broadcast_hole_cards(player_cards: Dict[str, List[str]], deal_order: List[str] = None,
+                               preflop_equity: Dict[str, float] = None):
     """Broadcast all players' hole cards to spectators."""
     event = {
         "type": "hole_cards",
         "timestamp": datetime.now().isoformat(),
         "data": {
             "cards": player_cards,  # {player_name: [card1, card2]}
-            "deal_order": deal_order or list(player_cards.keys())
+            "deal_order": deal_order or list(player_cards.keys()),
+            "preflop_equity": preflop_equity  # Each hand vs random hands at this table size
         }
     }
-    print(f"[WS BROADCAST] hole_cards - {len(player_cards)} players - deal_order: {deal_order} - clients: {len(manager.active_connections)}")
-    await manager.broadcast(event)
+    print(f"[WS BROADCAST] hole_cards - {len(player_cards)} players - deal_order: {deal_order} - clients: {len(manager.clients)}")
+    await publish(event)
 
 
 async def broadcast_action(player: str, action: str, amount: int,
                            reasoning: str, inner_thoughts: str = None,
                            trash_talk: str = None, trash_talk_target: str = None,
-                           pot: int = None, player_chips: Dict[str, int] = None):
+                           pot: int = None, player_chips: Dict[str, int] = None,
+                           equities: Dict[str, float] = None):
     """Broadcast a player action."""
     event = {
         "type": "action",
@@ -231,30 +581,51 @@ async def broadcast_action(player: str, action: str, amount: int,
             "trash_talk": trash_talk,
             "trash_talk_target": trash_talk_target,
             "pot": pot,  # Current pot after action
-            "player_chips": player_chips  # All players' chip counts
+            "player_chips": player_chips,  # All players' chip counts
+            "equities": equities  # Win odds of players still in the hand
+        }
+    }
+    print(f"[WS BROADCAST] action: {player} {action} - pot: {pot} - clients: {len(manager.clients)}")
+    await publish(event)
+
+
+async def broadcast_action_text(player: str, reasoning: str = None, inner_thoughts: str = None,
+                                trash_talk: str = None, final: bool = False):
+    """Broadcast the text of a streamed decision that was played before it finished arriving."""
+    event = {
+        "type": "action_text",
+        "timestamp": datetime.now().isoformat(),
+        "data": {
+            "player": player,
+            "reasoning": reasoning,  # Everything so far (not a delta), so a dropped update loses nothing
+            "inner_thoughts": inner_thoughts,
+            "trash_talk": trash_talk,
+            "final": final
         }
     }
-    print(f"[WS BROADCAST] action: {player} {action} - pot: {pot} - clients: {len(manager.active_connections)}")
-    await manager.broadcast(event)
+    await publish(event)
 
 
-async def broadcast_community_cards(cards: List[str], stage: str):
+async def broadcast_community_cards(cards: List[str], stage: str,
+                                    equities: Dict[str, float] = None):
     """Broadcast community cards dealt."""
     event = {
         "type": "community_cards",
         "timestamp": datetime.now().isoformat(),
         "data": {
             "cards": cards,
-            "stage": stage
+            "stage": stage,
+            "equities": equities  # Win odds after this street
         }
     }
-    print(f"[WS BROADCAST] community_cards: {stage} - {cards} - clients: {len(manager.active_connections)}")
-    await manager.broadcast(event)
+    print(f"[WS BROADCAST] community_cards: {stage} - {cards} - clients: {len(manager.clients)}")
+    await publish(event)
 
 
 async def broadcast_hand_result(winner: str, pot: int,
                                  winning_hand: str, summary: str,
-                                 showdown_cards: Dict[str, List[str]] = None):
+                                 showdown_cards: Dict[str, List[str]] = None,
+                                 pots: List[Dict] = None):
     """Broadcast hand result."""
     event = {
         "type": "hand_result",
@@ -264,12 +635,11 @@ async def broadcast_hand_result(winner: str, pot: int,
             "pot": pot,
             "winning_hand": winning_hand,
             "summary": summary,
-            "showdown_cards": showdown_cards
+            "showdown_cards": showdown_cards,
+            "pots": pots  # Main pot first: {"amount", "eligible", "winners"}
         }
     }
-    game_state.hand_history.append(event["data"])
-    game_state.hand_history = game_state.hand_history[-50:]  # Keep last 50
-    await manager.broadcast(event)
+    await publish(event)
 
 
 async def broadcast_elimination(player: str, place: int):
@@ -282,7 +652,7 @@ async def broadcast_elimination(player: str, place: int):
             "place": place
         }
     }
-    await manager.broadcast(event)
+    await publish(event)
 
 
 async def broadcast_blinds_up(level: int, small_blind: int, big_blind: int, ante: int):
@@ -297,32 +667,26 @@ async def broadcast_blinds_up(level: int, small_blind: int, big_blind: int, ante
             "ante": ante
         }
     }
-    await manager.broadcast(event)
+    await publish(event)
 
 
 async def broadcast_tournament_start(players: List[str], config: Dict):
     """Broadcast tournament starting."""
-    game_state.is_running = True
-    game_state.tournament_info = {
-        "players": players,
-        "config": config,
-        "start_time": datetime.now().isoformat()
-    }
-    game_state.players = {p: {"chips": config.get("starting_chips", 10000), "active": True} for p in players}
-
     event = {
         "type": "tournament_start",
         "timestamp": datetime.now().isoformat(),
-        "data": game_state.tournament_info
+        "data": {
+            "players": players,
+            "config": config,
+            "start_time": datetime.now().isoformat()
+        }
     }
-    print(f"[WS BROADCAST] tournament_start - players: {players} - clients: {len(manager.active_connections)}")
-    await manager.broadcast(event)
+    print(f"[WS BROADCAST] tournament_start - players: {players} - clients: {len(manager.clients)}")
+    await publish(event)
 
 
 async def broadcast_tournament_end(winner: str, standings: List[Dict], stats: Dict):
     """Broadcast tournament ending."""
-    game_state.is_running = False
-
     event = {
         "type": "tournament_end",
         "timestamp": datetime.now().isoformat(),
@@ -332,14 +696,11 @@ async def broadcast_tournament_end(winner: str, standings: List[Dict], stats: Di
             "stats": stats
         }
     }
-    await manager.broadcast(event)
+    await publish(event)
 
 
 async def update_player_chips(player: str, chips: int):
     """Update player chip count."""
-    if player in game_state.players:
-        game_state.players[player]["chips"] = chips
-
     event = {
         "type": "chip_update",
         "timestamp": datetime.now().isoformat(),
@@ -348,7 +709,7 @@ async def update_player_chips(player: str, chips: int):
             "chips": chips
         }
     }
-    await manager.broadcast(event)
+    await publish(event)
 
 
 # Serve static files (viewer)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+HTTP event streams
+Server-Sent Events and long-polling for clients that can't hold a
+WebSocket open (corporate proxies, embedded widgets, curl), plus the
+cache headers that let a CDN serve the snapshot endpoints.
+
+Both transports carry the same JSON frames and sequence numbers as /ws:
+- GET /api/events: one SSE event per frame, `id: <epoch>:<seq>`. A
+  browser's EventSource sends that back as Last-Event-ID when it
+  reconnects, so resume works without any client code.
+- GET /api/poll?since=&epoch=: the frames after `since`, waiting up to
+  POLL_TIMEOUT seconds for the next one if there are none yet.
+
+An SSE client is a ClientConnection like any viewer - same bounded queue,
+overflow policy and stalled-send watchdog - writing into the response body
+instead of a socket.
+"""
+
+import asyncio
+import hashlib
+import os
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from api.connections import ClientConnection, Frame, dumps
+
+
+SSE_KEEPALIVE = float(os.getenv("SSE_KEEPALIVE", "15"))         # Seconds between comment lines on an idle stream
+SSE_RETRY_MS = int(os.getenv("SSE_RETRY_MS", "2000"))           # Reconnect delay suggested to EventSource
+POLL_TIMEOUT = float(os.getenv("POLL_TIMEOUT", "25"))           # Longest a poll waits (under typical proxy timeouts)
+SNAPSHOT_MAX_AGE = int(os.getenv("SNAPSHOT_MAX_AGE", "1"))      # Seconds a CDN may serve a cached snapshot
+
+# Streams must reach the client as they're written, never from a cache
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+class SSEStream:
+    """
+    The "socket" of an SSE client: chunks handed from its writer task to
+    the streaming response. Holds one chunk, so a slow reader blocks the
+    writer and the stalled-send watchdog sees it like a stuck WebSocket.
+    """
+
+    def __init__(self):
+        self._chunks: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self.closed = False
+
+    async def put(self, chunk: str):
+        await self._chunks.put(chunk)
+
+    async def close(self, code: int = 1000):
+        if not self.closed:
+            self.closed = True
+            # Unblock the reader even if a chunk is still waiting
+            while not self._chunks.empty():
+                self._chunks.get_nowait()
+            self._chunks.put_nowait(None)
+
+    async def chunks(self) -> AsyncIterator[str]:
+        """Response body: the retry hint, then frames, with keep-alive comments while idle."""
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        while True:
+            try:
+                chunk = await asyncio.wait_for(self._chunks.get(), SSE_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if chunk is None:
+                return
+            yield chunk
+
+
+class SSEConnection(ClientConnection):
+    """A viewer reading /api/events. Always JSON; ids let EventSource resume."""
+
+    def __init__(self, stream: SSEStream, on_close: Callable[[ClientConnection], None],
+                 epoch: Callable[[], str], **kwargs):
+        self._epoch = epoch
+        super().__init__(stream, on_close, **kwargs)
+
+    async def _send(self, frame: Frame):
+        await self.websocket.put(sse_event(frame, self._epoch()))
+
+
+def sse_event(frame: Frame, epoch: str) -> str:
+    """One SSE event. Frame text is compact JSON, so it always fits one data line."""
+    if frame.seq is None:
+        return f"data: {frame.text}\n\n"
+    return f"id: {epoch}:{frame.seq}\ndata: {frame.text}\n\n"
+
+
+def parse_event_id(last_event_id: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+    """(epoch, seq) from a Last-Event-ID header, (None, None) if absent or malformed."""
+    epoch, _, seq = (last_event_id or "").partition(":")
+    if not epoch or not seq.isdigit():
+        return None, None
+    return epoch, int(seq)
+
+
+def poll_body(epoch: str, last_seq: int, frames: List[Frame]) -> Response:
+    """Long-poll response. Frames are spliced in as already-encoded JSON."""
+    body = '{"epoch":%s,"last_seq":%d,"events":[%s]}' % (
+        dumps(epoch), last_seq, ",".join(frame.text for frame in frames))
+    return Response(body, media_type="application/json", headers=STREAM_HEADERS)
+
+
+def cached_json(request: Request, payload) -> Response:
+    """
+    JSON with an ETag and a short shared max-age. Within max-age a CDN
+    answers every reader from one origin fetch; after it, revalidation
+    costs a 304 unless the state actually changed.
+    """
+    body = dumps(payload).encode()
+    etag = '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+    headers = {
+        "Cache-Control": f"public, max-age={SNAPSHOT_MAX_AGE}, stale-while-revalidate={SNAPSHOT_MAX_AGE * 5}",
+        "ETag": etag
+    }
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Compact Wire Format
+Binary, delta-encoded alternative to the JSON event stream, negotiated per
+viewer with /ws?format=compact. JSON stays the default.
+
+Each event becomes one binary WebSocket message:
+
+    u8 event type | uvarint seq | fields...
+    field = u8 field id | value
+
+Field ids and value kinds come from SCHEMA (static/index.html mirrors it):
+- players are roster indexes; a name's first appearance is sent inline
+- cards are their 0-51 index (rank * 4 + suit, as in core.game_engine)
+- timestamps are millisecond deltas from the previous event's
+- chip maps only carry the players whose stack changed since the last
+  event that reported it, plus a roster bitmask of who is in the map
+- pot is omitted when unchanged
+- equities are basis points (0-10000)
+Anything a kind can't represent (None pots, unexpected types, extra keys)
+goes in field 0 as JSON and is merged back, and event types not in SCHEMA
+are sent whole as JSON (type 0), so the format never loses an event.
+
+The delta base (roster, chips, pot, last timestamp) is shared by the whole
+stream: a compact viewer starts from the base in its init message and must
+apply every frame after it. Compact viewers are therefore disconnected
+instead of having frames dropped when they fall behind, and resume with
+?since= only against the same encoder (`wire` id).
+"""
+
+import secrets
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from api.connections import dumps, loads
+from core.game_engine import CARD_STRINGS
+
+
+FORMAT_JSON = "json"
+FORMAT_COMPACT = "compact"
+WIRE_FORMATS = (FORMAT_JSON, FORMAT_COMPACT)
+
+ACTIONS = ("fold", "check", "call", "bet", "raise", "all_in")
+STAGES = ("preflop", "flop", "turn", "river", "showdown")
+
+FIELD_EXTRA = 0      # JSON object of data keys the schema couldn't encode
+FIELD_TIMESTAMP = 1  # Top-level "timestamp"
+
+# Event type id -> (type, [(data key, kind)]); field id = position + 2
+SCHEMA: List[Tuple[str, List[Tuple[str, str]]]] = [
+    ("", []),  # 0: anything else, sent as JSON
+    ("hand_start", [("hand_number", "uint"), ("players", "seats"), ("blinds", "blinds"),
+                    ("button_player", "player"), ("deal_order", "players")]),
+    ("hole_cards", [("cards", "card_map"), ("deal_order", "players"), ("preflop_equity", "odds")]),
+    ("action", [("player", "player"), ("action", "action"), ("amount", "uint"), ("reasoning", "str"),
+                ("inner_thoughts", "str"), ("trash_talk", "str"), ("trash_talk_target", "str"),
+                ("pot", "pot"), ("player_chips", "chips"), ("equities", "odds")]),
+    ("community_cards", [("cards", "cards"), ("stage", "stage"), ("equities", "odds")]),
+    ("hand_result", [("winner", "player"), ("pot", "uint"), ("winning_hand", "str"), ("summary", "str"),
+                     ("showdown_cards", "card_map")]),
+    ("elimination", [("player", "player"), ("place", "uint")]),
+    ("blinds_up", [("level", "uint"), ("small_blind", "uint"), ("big_blind", "uint"), ("ante", "uint")]),
+    ("tournament_start", [("players", "players")]),
+    ("tournament_end", [("winner", "player")]),
+    ("chip_update", [("player", "player"), ("chips", "uint")]),
+    ("action_text", [("player", "player"), ("reasoning", "str"), ("inner_thoughts", "str"),
+                     ("trash_talk", "str"), ("final", "uint")]),
+]
+EVENT_IDS = {name: i for i, (name, _) in enumerate(SCHEMA) if name}
+
+CARD_INDEX = {card: i for i, card in enumerate(CARD_STRINGS)}
+EPOCH = datetime(1970, 1, 1)  # Timestamps are naive local time; only differences matter
+MILLISECOND = timedelta(milliseconds=1)
+
+
+class WireError(ValueError):
+    """A value that doesn't fit its field kind (it goes in the JSON extra instead)."""
+
+
+def _write_uint(out: bytearray, n: int):
+    if type(n) is not int or n < 0:
+        raise WireError(f"Not a uint: {n!r}")
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _write_sint(out: bytearray, n: int):
+    _write_uint(out, (n << 1) if n >= 0 else (-n << 1) - 1)  # Zigzag
+
+
+def _write_str(out: bytearray, s: str):
+    if not isinstance(s, str):
+        raise WireError(f"Not a string: {s!r}")
+    data = s.encode()
+    _write_uint(out, len(data))
+    out += data
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def more(self) -> bool:
+        return self.pos < len(self.data)
+
+    def byte(self) -> int:
+        self.pos += 1
+        return self.data[self.pos - 1]
+
+    def uint(self) -> int:
+        n = shift = 0
+        while True:
+            b = self.byte()
+            n |= (b & 0x7F) << shift
+            if b < 0x80:
+                return n
+            shift += 7
+
+    def sint(self) -> int:
+        n = self.uint()
+        return (n >> 1) if not n & 1 else -((n + 1) >> 1)
+
+    def str(self) -> str:
+        length = self.uint()
+        self.pos += length
+        return self.data[self.pos - length:self.pos].decode()
+
+
+def _millis(timestamp: str) -> int:
+    try:
+        moment = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        raise WireError(f"Not an ISO timestamp: {timestamp!r}")
+    return (moment.replace(tzinfo=None) - EPOCH) // MILLISECOND
+
+
+def _iso(millis: int) -> str:
+    return (EPOCH + millis * MILLISECOND).isoformat(timespec="milliseconds")
+
+
+class _Base:
+    """Delta base shared by the encoder and every decoder following it."""
+
+    def __init__(self):
+        self.roster: List[str] = []
+        self.chips: Dict[str, int] = {}
+        self.pot: Optional[int] = None
+        self.ts = 0
+
+    def to_dict(self) -> Dict:
+        return {"roster": list(self.roster), "chips": dict(self.chips), "pot": self.pot, "ts": self.ts}
+
+    def load(self, base: Dict):
+        self.roster = list(base["roster"])
+        self.chips = dict(base["chips"])
+        self.pot = base["pot"]
+        self.ts = base["ts"]
+
+
+class CompactEncoder(_Base):
+    """
+    Encodes the event stream in order. One per ConnectionManager; every
+    event must go through encode() exactly once, in sequence order.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.id = secrets.token_hex(4)  # Compact viewers may only resume against this encoder
+        self._index: Dict[str, int] = {}
+
+    def reset(self):
+        """Start a new delta base (after the stream under it was replaced)."""
+        self.__init__()
+
+    def base(self) -> Dict:
+        """What a compact viewer needs (in its init message) to decode the next frame."""
+        return {"id": self.id, **self.to_dict()}
+
+    def encode(self, seq: int, message: Dict) -> bytes:
+        event_id = EVENT_IDS.get(message.get("type"))
+        data = message.get("data")
+        if event_id is None or not isinstance(data, dict) or set(message) - {"type", "seq", "timestamp", "data"}:
+            out = bytearray([0])
+            _write_uint(out, seq)
+            _write_str(out, dumps({k: v for k, v in message.items() if k != "seq"}))
+            return bytes(out)
+
+        out = bytearray([event_id])
+        _write_uint(out, seq)
+        extra = {}
+        updates: Dict[str, Any] = {}  # Base changes, applied once the frame is complete
+        if "timestamp" in message:
+            try:
+                millis = _millis(message["timestamp"])
+                out.append(FIELD_TIMESTAMP)
+                _write_sint(out, millis - self.ts)
+                updates["ts"] = millis
+            except WireError:
+                extra["timestamp"] = message["timestamp"]
+
+        fields = SCHEMA[event_id][1]
+        for field_id, (key, kind) in enumerate(fields, 2):
+            if data.get(key) is None:
+                if kind == "pot" and key in data:
+                    extra[key] = None  # Omitting it would mean "unchanged"
+                continue
+            checkpoint = len(out), len(self.roster)
+            try:
+                out.append(field_id)
+                if not getattr(self, "_kind_" + kind)(out, data[key], updates):
+                    del out[checkpoint[0]:]  # Unchanged - the decoder fills it from the base
+            except WireError:
+                del out[checkpoint[0]:]
+                for name in self.roster[checkpoint[1]:]:
+                    del self._index[name]
+                del self.roster[checkpoint[1]:]
+                extra[key] = data[key]
+        known = {key for key, _ in fields}
+        extra.update((k, v) for k, v in data.items() if k not in known)
+        if extra:
+            out.append(FIELD_EXTRA)
+            _write_str(out, dumps(extra))
+
+        self.ts = updates.get("ts", self.ts)
+        self.pot = updates.get("pot", self.pot)
+        self.chips.update(updates.get("chips", {}))
+        return bytes(out)
+
+    # Field kinds. Each writes its value (False = nothing to send).
+
+    def _player(self, out: bytearray, name: str):
+        if not isinstance(name, str):
+            raise WireError(f"Not a player name: {name!r}")
+        index = self._index.get(name)
+        if index is None:
+            index = self._index[name] = len(self.roster)
+            self.roster.append(name)
+            _write_uint(out, index)
+            _write_str(out, name)
+        else:
+            _write_uint(out, index)
+
+    def _kind_uint(self, out, value, updates):
+        _write_uint(out, value)
+        return True
+
+    def _kind_str(self, out, value, updates):
+        _write_str(out, value)
+        return True
+
+    def _kind_player(self, out, value, updates):
+        self._player(out, value)
+        return True
+
+    def _kind_players(self, out, value, updates):
+        if not isinstance(value, list):
+            raise WireError(f"Not a player list: {value!r}")
+        _write_uint(out, len(value))
+        for name in value:
+            self._player(out, name)
+        return True
+
+    def _kind_cards(self, out, value, updates):
+        if not isinstance(value, list):
+            raise WireError(f"Not a card list: {value!r}")
+        _write_uint(out, len(value))
+        for card in value:
+            if card not in CARD_INDEX:
+                raise WireError(f"Not a card: {card!r}")
+            out.append(CARD_INDEX[card])
+        return True
+
+    def _kind_card_map(self, out, value, updates):
+        if not isinstance(value, dict):
+            raise WireError(f"Not a card map: {value!r}")
+        _write_uint(out, len(value))
+        for name, cards in value.items():
+            self._player(out, name)
+            self._kind_cards(out, cards, updates)
+        return True
+
+    def _kind_odds(self, out, value, updates):
+        if not isinstance(value, dict):
+            raise WireError(f"Not an equity map: {value!r}")
+        _write_uint(out, len(value))
+        for name, equity in value.items():
+            if not isinstance(equity, (int, float)) or not 0 <= equity <= 1:
+                raise WireError(f"Not an equity: {equity!r}")
+            self._player(out, name)
+            _write_uint(out, round(equity * 10000))
+        return True
+
+    def _kind_action(self, out, value, updates):
+        return self._enum(out, value, ACTIONS)
+
+    def _kind_stage(self, out, value, updates):
+        return self._enum(out, value, STAGES)
+
+    def _enum(self, out, value, options):
+        if value not in options:
+            raise WireError(f"Not one of {options}: {value!r}")
+        out.append(options.index(value))
+        return True
+
+    def _kind_pot(self, out, value, updates):
+        _write_uint(out, value)
+        updates["pot"] = value
+        return value != self.pot
+
+    def _kind_chips(self, out, value, updates):
+        """Roster bitmask of who's in the map + (index, chips) for changed stacks."""
+        if not isinstance(value, dict):
+            raise WireError(f"Not a chip map: {value!r}")
+        new = [name for name in value if name not in self._index]
+        _write_uint(out, len(new))
+        for name in new:
+            self._index[name] = len(self.roster)
+            self.roster.append(name)
+            _write_str(out, name)
+        mask = 0
+        changed = []
+        for name, chips in value.items():
+            index = self._index[name]
+            mask |= 1 << index
+            if self.chips.get(name) != chips:
+                changed.append((index, chips))
+        _write_uint(out, mask)
+        _write_uint(out, len(changed))
+        for index, chips in sorted(changed):
+            _write_uint(out, index)
+            _write_uint(out, chips)
+        updates.setdefault("chips", {}).update(value)
+        return True
+
+    def _kind_seats(self, out, value, updates):
+        """hand_start's [{name, chips}]: names in seat order + only the stacks that changed."""
+        if not isinstance(value, list) or not all(isinstance(s, dict) and set(s) == {"name", "chips"} for s in value):
+            raise WireError(f"Not a seat list: {value!r}")
+        self._kind_players(out, [seat["name"] for seat in value], updates)
+        changed = [(i, seat["chips"]) for i, seat in enumerate(value) if self.chips.get(seat["name"]) != seat["chips"]]
+        _write_uint(out, len(changed))
+        for position, chips in changed:
+            _write_uint(out, position)
+            _write_uint(out, chips)
+        updates.setdefault("chips", {}).update((seat["name"], seat["chips"]) for seat in value)
+        return True
+
+    def _kind_blinds(self, out, value, updates):
+        if not isinstance(value, dict) or set(value) != {"small_blind", "big_blind", "sb_player", "bb_player"}:
+            raise WireError(f"Not a blinds dict: {value!r}")
+        _write_uint(out, value["small_blind"])
+        _write_uint(out, value["big_blind"])
+        self._player(out, value["sb_player"])
+        self._player(out, value["bb_player"])
+        return True
+
+
+class CompactDecoder(_Base):
+    """Reference decoder (static/index.html has the same logic in JS)."""
+
+    def __init__(self, base: Optional[Dict] = None):
+        super().__init__()
+        if base:
+            self.load(base)
+
+    def decode(self, frame: bytes) -> Dict:
+        r = _Reader(frame)
+        event_id = r.byte()
+        seq = r.uint()
+        if event_id == 0:
+            return {**loads(r.str()), "seq": seq}
+
+        name, fields = SCHEMA[event_id]
+        message = {"type": name, "seq": seq}
+        data = {key: None for key, _ in fields}
+        extra = {}
+        updates: Dict[str, Any] = {}
+        while r.more():
+            field_id = r.byte()
+            if field_id == FIELD_EXTRA:
+                extra = loads(r.str())
+            elif field_id == FIELD_TIMESTAMP:
+                updates["ts"] = self.ts + r.sint()
+                message["timestamp"] = _iso(updates["ts"])
+            else:
+                key, kind = fields[field_id - 2]
+                data[key] = getattr(self, "_read_" + kind)(r, updates)
+        for key, kind in fields:
+            if kind == "pot" and data[key] is None and key not in extra:
+                data[key] = self.pot  # Omitted = unchanged
+        if "timestamp" in extra:
+            message["timestamp"] = extra.pop("timestamp")
+        data.update(extra)
+        message["data"] = data
+
+        self.ts = updates.get("ts", self.ts)
+        self.pot = updates.get("pot", self.pot)
+        self.chips.update(updates.get("chips", {}))
+        return message
+
+    def _player(self, r: _Reader) -> str:
+        index = r.uint()
+        if index == len(self.roster):
+            self.roster.append(r.str())
+        return self.roster[index]
+
+    def _read_uint(self, r, updates):
+        return r.uint()
+
+    def _read_str(self, r, updates):
+        return r.str()
+
+    def _read_player(self, r, updates):
+        return self._player(r)
+
+    def _read_players(self, r, updates):
+        return [self._player(r) for _ in range(r.uint())]
+
+    def _read_cards(self, r, updates):
+        return [CARD_STRINGS[r.byte()] for _ in range(r.uint())]
+
+    def _read_card_map(self, r, updates):
+        return {self._player(r): self._read_cards(r, updates) for _ in range(r.uint())}
+
+    def _read_odds(self, r, updates):
+        return {self._player(r): r.uint() / 10000 for _ in range(r.uint())}
+
+    def _read_action(self, r, updates):
+        return ACTIONS[r.byte()]
+
+    def _read_stage(self, r, updates):
+        return STAGES[r.byte()]
+
+    def _read_pot(self, r, updates):
+        updates["pot"] = r.uint()
+        return updates["pot"]
+
+    def _read_chips(self, r, updates):
+        for _ in range(r.uint()):
+            self.roster.append(r.str())
+        mask = r.uint()
+        changed = dict((r.uint(), r.uint()) for _ in range(r.uint()))
+        chips = {}
+        for index, name in enumerate(self.roster):
+            if mask >> index & 1:
+                chips[name] = changed.get(index, self.chips.get(name))
+        updates.setdefault("chips", {}).update(chips)
+        return chips
+
+    def _read_seats(self, r, updates):
+        names = self._read_players(r, updates)
+        changed = dict((r.uint(), r.uint()) for _ in range(r.uint()))
+        seats = [{"name": name, "chips": changed.get(i, self.chips.get(name))} for i, name in enumerate(names)]
+        updates.setdefault("chips", {}).update((s["name"], s["chips"]) for s in seats)
+        return seats
+
+    def _read_blinds(self, r, updates):
+        return {"small_blind": r.uint(), "big_blind": r.uint(),
+                "sb_player": self._player(r), "bb_player": self._player(r)}
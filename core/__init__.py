@@ -2,20 +2,36 @@
 
 from .game_engine import (
     Card, Deck, Player, PokerGame, HandEvaluator,
-    Action, HandRank, Suit, Rank, HandState
+    Action, HandRank, Suit, Rank, HandState,
+    cards_to_ints, ints_to_cards
 )
 from .tournament import (
     Tournament, TournamentRunner, TournamentConfig,
     BlindLevel, HandResult, TournamentResult
 )
+from .equity import calculate_equity, EquityResult
+from .simulation import simulate_tournament, POLICIES
+from .batch import run_batch, iter_batch, BatchStats, TournamentSummary
+from .history import HandHistoryStore, HistoryQueryError, open_history_store
+from .stats import StatsTracker, StatLine, OpponentLine, open_stats_tracker
+from .decision_parser import parse_decision, ParsedDecision, ParseError, DecisionParseError
+from .usage import Usage, PRICES
 from .ai_player import (
-    AIPlayer, AIPlayerManager, AIDecision, TrashTalkEvent
+    AIPlayer, AIPlayerManager, AIDecision, TrashTalkEvent, DecisionPrompt, PromptStats
 )
 
 __all__ = [
     'Card', 'Deck', 'Player', 'PokerGame', 'HandEvaluator',
     'Action', 'HandRank', 'Suit', 'Rank', 'HandState',
+    'cards_to_ints', 'ints_to_cards',
     'Tournament', 'TournamentRunner', 'TournamentConfig',
     'BlindLevel', 'HandResult', 'TournamentResult',
-    'AIPlayer', 'AIPlayerManager', 'AIDecision', 'TrashTalkEvent'
+    'calculate_equity', 'EquityResult',
+    'simulate_tournament', 'POLICIES',
+    'run_batch', 'iter_batch', 'BatchStats', 'TournamentSummary',
+    'HandHistoryStore', 'HistoryQueryError', 'open_history_store',
+    'StatsTracker', 'StatLine', 'OpponentLine', 'open_stats_tracker',
+    'parse_decision', 'ParsedDecision', 'ParseError', 'DecisionParseError',
+    'Usage', 'PRICES',
+    'AIPlayer', 'AIPlayerManager', 'AIDecision', 'TrashTalkEvent', 'DecisionPrompt', 'PromptStats'
 ]
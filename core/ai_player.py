@@ -5,20 +5,43 @@ Each AI maintains their own notes file with observations about opponents.
 """
 
 import os
-import json
+import atexit
 import asyncio
+import threading
+import weakref
 from abc import ABC, abstractmethod
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 
-from .game_engine import Action
+from .game_engine import Action, Card
+from .data_paths import DEFAULT_NOTES_DIR
+from .decision_parser import ParseError, parse_decision
+from .preflop import get_preflop_table, class_index, class_name
+from .usage import Usage, estimate_tokens, total
 
 
-NOTES_DIR = Path(__file__).parent.parent / "notes"
-NOTES_DIR.mkdir(exist_ok=True)
+NOTES_DIR = Path(os.getenv("NOTES_DIR") or DEFAULT_NOTES_DIR)  # Each AI's notes file
+NOTES_DIR.mkdir(parents=True, exist_ok=True)
 
 MAX_NOTES_SIZE = 2000  # Max characters in notes file
+NOTES_FLUSH_DELAY = 2.0  # Seconds to batch note updates before writing them out
+NOTES_FSYNC = os.getenv("NOTES_FSYNC", "0") == "1"  # fsync each write (durable across power loss)
+
+PREFIX_SECTIONS = ("identity", "personality", "notes", "instructions")  # Cached system prompt
+
+DECISION_INSTRUCTIONS = """
+
+IMPORTANT: Keep ALL text fields to 1-2 SHORT sentences MAX. Be concise like a real poker player.
+
+Respond in this exact JSON format:
+{
+    "action": "fold|check|call|bet|raise|all_in",
+    "amount": <number or 0>,
+    "reasoning": "<1-2 sentences MAX - brief poker logic>",
+    "inner_thoughts": "<1-2 sentences MAX - your honest read>",
+    "trash_talk": "<short quip or null - keep it punchy>"
+}"""
 
 
 @dataclass
@@ -31,6 +54,42 @@ class AIDecision:
     trash_talk: Optional[str] = None  # Directed at opponents - they can hear and remember this
 
 
+@dataclass
+class DecisionPrompt:
+    """
+    A decision prompt in two parts: `system` (identity, personality, notes,
+    response format) stays byte-identical until the notes change, so
+    providers with prompt caching reuse it; `user` is this decision.
+    """
+    system: str
+    user: str
+    tokens: Dict[str, int]  # Estimated tokens per section
+
+
+@dataclass
+class PromptStats:
+    """Estimated decision-prompt input tokens per section, summed over decisions."""
+    decisions: int = 0
+    prefix_builds: int = 0  # Times the system prompt was rebuilt (notes or personality changed)
+    tokens: Dict[str, int] = field(default_factory=dict)
+
+    def record(self, sections: Dict[str, int]):
+        self.decisions += 1
+        for name, count in sections.items():
+            self.tokens[name] = self.tokens.get(name, 0) + count
+
+    def summary(self) -> Dict:
+        per_decision = {name: round(count / self.decisions, 1) for name, count in self.tokens.items()} if self.decisions else {}
+        prefix = sum(count for name, count in per_decision.items() if name in PREFIX_SECTIONS)
+        return {
+            "decisions": self.decisions,
+            "prefix_builds": self.prefix_builds,
+            "per_decision": per_decision,
+            "prefix_tokens": round(prefix, 1),
+            "suffix_tokens": round(sum(per_decision.values()) - prefix, 1)
+        }
+
+
 @dataclass
 class TrashTalkEvent:
     """A trash talk event to remember."""
@@ -46,11 +105,26 @@ class AIPlayer(ABC):
     Each AI maintains their own notes file.
     """
 
-    def __init__(self, name: str, model_name: str):
+    def __init__(self, name: str, model_name: str, personality: str = ""):
         self.name = name
         self.model_name = model_name
+        self.personality = personality
         self.notes_file = NOTES_DIR / f"{name.lower()}_notes.md"
         self.trash_talk_log: List[TrashTalkEvent] = []  # Trash talk I've received
+        self.stats = None  # StatsTracker whose numbers go into decision prompts (PROMPT_STATS)
+        self.last_parse_error: Optional[ParseError] = None  # Why the last reply couldn't be used (None if it could)
+        self.parse_errors = 0  # Replies that came back as a parse-error fold
+        self.prompt_stats = PromptStats()
+        self.usage: Dict[str, Usage] = {}  # Per call kind ("decision", "reflection")
+        self._prefix: Optional[Tuple[Tuple, str, Dict[str, int]]] = None  # (key, system prompt, tokens)
+
+        # Notes live in memory; the file is loaded once and written behind
+        self._notes: Optional[str] = None
+        self._notes_version = 0    # Bumped on every change
+        self._written_version = 0  # Last version on disk
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock = threading.Lock()
+        _live_players.add(self)
 
         # Initialize notes file if doesn't exist
         if not self.notes_file.exists():
@@ -117,7 +191,9 @@ class AIPlayer(ABC):
 ---
 *Notes begin below:*
 """
-        self.notes_file.write_text(initial_notes)
+        self._notes = initial_notes
+        self._notes_version += 1
+        self.flush_notes_sync()
 
     def receive_trash_talk(self, speaker: str, message: str, hand_number: int):
         """Record trash talk received from another player."""
@@ -131,14 +207,14 @@ class AIPlayer(ABC):
         return self.trash_talk_log[-5:]  # Last 5 for context
 
     def get_notes(self) -> str:
-        """Read current notes."""
-        if self.notes_file.exists():
-            return self.notes_file.read_text()
-        return ""
+        """Current notes (read from disk on first use only)."""
+        if self._notes is None:
+            self._notes = self.notes_file.read_text() if self.notes_file.exists() else ""
+        return self._notes
 
     def update_notes(self, new_content: str):
         """
-        Update notes file with new content.
+        Update notes with new content (written to disk shortly after).
         Truncates oldest content if exceeds max size.
         """
         current = self.get_notes()
@@ -154,7 +230,48 @@ class AIPlayer(ABC):
             recent = "\n".join(lines[-50:])  # Keep recent
             updated = header + "\n\n[...older notes truncated...]\n\n" + recent
 
-        self.notes_file.write_text(updated)
+        self._notes = updated
+        self._notes_version += 1
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Debounced write-behind: one write per NOTES_FLUSH_DELAY, off the event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush_notes_sync()  # No loop (scripts, shutdown) - write now
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        # Updates landing during a write see this task still running and don't
+        # schedule another, so go round again until the file is current
+        while self._written_version != self._notes_version:
+            await asyncio.sleep(NOTES_FLUSH_DELAY)
+            await asyncio.to_thread(self.flush_notes_sync)
+
+    async def flush_notes(self):
+        """Write pending notes now without blocking the event loop."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._flush_task = None
+        await asyncio.to_thread(self.flush_notes_sync)
+
+    def flush_notes_sync(self):
+        """Write notes to disk if they changed (atomic rename, fsync if NOTES_FSYNC)."""
+        with self._write_lock:
+            version = self._notes_version
+            if version == self._written_version or self._notes is None:
+                return
+            tmp = self.notes_file.with_suffix(".md.tmp")
+            with open(tmp, "w") as f:
+                f.write(self._notes)
+                if NOTES_FSYNC:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp, self.notes_file)
+            self._written_version = version
 
     def clear_notes(self):
         """Clear notes (for new tournament if desired)."""
@@ -181,13 +298,48 @@ class AIPlayer(ABC):
         """
         pass
 
+    async def aclose(self):
+        """Release resources held between calls (HTTP clients, etc.) and flush notes."""
+        await self.flush_notes()
+
+    def total_usage(self) -> Usage:
+        """All calls so far, every kind (a new Usage)."""
+        return total(self.usage.values())
+
+    def _personality_hint(self) -> str:
+        return f"[Your personality: {self.personality}]" if self.personality else ""
+
+    def _decision_prefix(self) -> Tuple[str, Dict[str, int]]:
+        """System prompt and its section token counts, rebuilt only when notes or personality change."""
+        notes = self.get_notes()
+        key = (self._notes_version, self.personality)
+        if self._prefix is not None and self._prefix[0] == key:
+            return self._prefix[1], self._prefix[2]
+
+        hint = self._personality_hint()
+        sections = {
+            "identity": f"You are {self.name}, an AI playing Texas Hold'em poker.",
+            "personality": f"\n\n{hint}" if hint else "",
+            "notes": f"""
+
+=== YOUR NOTES (your own observations - these persist across tournaments) ===
+{notes}
+=== END NOTES ===""",
+            "instructions": DECISION_INSTRUCTIONS
+        }
+        system = "".join(sections.values())
+        tokens = {name: estimate_tokens(text) for name, text in sections.items()}
+        self._prefix = (key, system, tokens)
+        self.prompt_stats.prefix_builds += 1
+        return system, tokens
+
     def _build_decision_prompt(
         self,
         game_state: Dict,
         valid_actions: List[Tuple[Action, int, int]]
-    ) -> str:
-        """Build prompt for decision-making."""
-        notes = self.get_notes()
+    ) -> DecisionPrompt:
+        """Build prompt for decision-making: cached system prefix + this decision's situation."""
+        system, prefix_tokens = self._decision_prefix()
 
         actions_str = []
         for action, min_amt, max_amt in valid_actions:
@@ -210,52 +362,65 @@ class AIPlayer(ABC):
             for a in game_state['action_history']
         ]) or "No actions yet"
 
+        # Preflop: how this starting hand fares vs random hands
+        preflop_str = ""
+        if game_state['stage'] == "preflop":
+            preflop_str = self._preflop_equity_line(game_state)
+
+        # Long-run opponent stats, once there's a sample
+        stats_str = ""
+        if self.stats is not None:
+            lines = [self.stats.describe(o['name'], self.name) for o in game_state['opponents']]
+            lines = [line for line in lines if line]
+            if lines:
+                stats_str = "\n\nOPPONENT STATS (all tournaments so far):\n" + "\n".join(lines)
+
         # Include recent trash talk directed at this player
         trash_talk_str = ""
         recent_trash = self.get_recent_trash_talk()
         if recent_trash:
-            trash_talk_str = "\n\nRECENT TRASH TALK DIRECTED AT YOU:\n" + "\n".join([
+            trash_talk_str = "RECENT TRASH TALK DIRECTED AT YOU:\n" + "\n".join([
                 f"- {t.speaker} (hand #{t.hand_number}): \"{t.message}\""
                 for t in recent_trash
-            ])
-
-        prompt = f"""You are {self.name}, an AI playing Texas Hold'em poker.
-
-=== YOUR NOTES (your own observations - these persist across tournaments) ===
-{notes}
-=== END NOTES ==={trash_talk_str}
+            ]) + "\n\n"
 
-CURRENT SITUATION:
+        sections = {
+            "trash_talk": trash_talk_str,
+            "situation": f"""CURRENT SITUATION:
 - Your cards: {' '.join(game_state['your_cards'])}
 - Your chips: {game_state['your_chips']}
 - Your current bet: {game_state['your_bet']}
 - Pot: {game_state['pot']}
 - Community cards: {' '.join(game_state['community_cards']) or 'None (preflop)'}
 - Current bet to call: {game_state['current_bet']}
-- Stage: {game_state['stage']}
-
-OPPONENTS:
-{opponents_str}
-
-RECENT ACTIONS THIS HAND:
-{history_str}
+- Stage: {game_state['stage']}{preflop_str}""",
+            "opponents": f"\n\nOPPONENTS:\n{opponents_str}",
+            "stats": stats_str,
+            "history": f"\n\nRECENT ACTIONS THIS HAND:\n{history_str}",
+            "actions": f"""
 
 VALID ACTIONS: {', '.join(actions_str)}
 
-Based on your notes and the current situation, what do you do?
-
-IMPORTANT: Keep ALL text fields to 1-2 SHORT sentences MAX. Be concise like a real poker player.
-
-Respond in this exact JSON format:
-{{
-    "action": "fold|check|call|bet|raise|all_in",
-    "amount": <number or 0>,
-    "reasoning": "<1-2 sentences MAX - brief poker logic>",
-    "inner_thoughts": "<1-2 sentences MAX - your honest read>",
-    "trash_talk": "<short quip or null - keep it punchy>"
-}}
+Based on your notes and the current situation, what do you do? Respond with the JSON object only.
 """
-        return prompt
+        }
+        tokens = dict(prefix_tokens)
+        tokens.update((name, estimate_tokens(text)) for name, text in sections.items())
+        self.prompt_stats.record(tokens)
+        return DecisionPrompt(system, "".join(sections.values()), tokens)
+
+    def _preflop_equity_line(self, game_state: Dict) -> str:
+        """Prompt line with the hand's preflop equity, or "" if the table isn't built."""
+        table = get_preflop_table()
+        if table is None or len(game_state['your_cards']) != 2:
+            return ""
+
+        cards = [Card.from_str(c) for c in game_state['your_cards']]
+        players = 1 + sum(1 for o in game_state['opponents'] if not o['folded'])
+        equity = table.class_equity(cards, players)
+        hand = class_name(class_index(*cards))
+        field = "1 random hand" if players == 2 else f"{players - 1} random hands"
+        return f"\n- Preflop equity ({hand} vs {field}): {equity:.0%}"
 
     def _build_reflection_prompt(
         self,
@@ -290,77 +455,51 @@ Just write the note content, no JSON needed:
         return prompt
 
     def _parse_decision(self, response: str) -> AIDecision:
-        """Parse AI response into decision."""
-        try:
-            import re
-
-            # Clean the response thoroughly
-            response = response.strip()
-            # Remove BOM and zero-width characters
-            response = response.lstrip('\ufeff\u200b\u200c\u200d\u2060\u00a0')
-            # Remove markdown code block markers
-            response = re.sub(r'^```json\s*', '', response, flags=re.IGNORECASE)
-            response = re.sub(r'^```\s*', '', response)
-            response = re.sub(r'\s*```$', '', response)
-            response = response.strip()
-
-            # Find JSON with balanced braces
-            start = response.find('{')
-            if start != -1:
-                depth = 0
-                end = start
-                found_closing = False
-                for i in range(start, len(response)):
-                    if response[i] == '{':
-                        depth += 1
-                    elif response[i] == '}':
-                        depth -= 1
-                        if depth == 0:
-                            end = i + 1
-                            found_closing = True
-                            break
-
-                json_str = response[start:end]
-
-                # If JSON is incomplete (no closing brace found), try to repair it
-                if not found_closing:
-                    # Count how many braces we need to close
-                    json_str += '}'
-                    print(f"[{self.name}] Warning: Truncated JSON, attempting repair")
-
-                # Additional cleanup for JSON string
-                # Remove any trailing commas before closing braces (common LLM error)
-                json_str = re.sub(r',\s*}', '}', json_str)
-                json_str = re.sub(r',\s*]', ']', json_str)
-                # Remove incomplete string values at the end
-                json_str = re.sub(r',\s*"[^"]*$', '}', json_str)
-
-                data = json.loads(json_str)
-
-                action_str = data.get('action', 'fold').lower()
-                action_map = {
-                    'fold': Action.FOLD,
-                    'check': Action.CHECK,
-                    'call': Action.CALL,
-                    'bet': Action.BET,
-                    'raise': Action.RAISE,
-                    'all_in': Action.ALL_IN,
-                    'all-in': Action.ALL_IN,
-                    'allin': Action.ALL_IN
-                }
-                action = action_map.get(action_str, Action.FOLD)
-                amount = int(data.get('amount', 0))
-                reasoning = data.get('reasoning', '')
-                inner_thoughts = data.get('inner_thoughts')  # For viewers only
-                trash_talk = data.get('trash_talk')  # For other AIs
-
-                return AIDecision(action, amount, reasoning, inner_thoughts, trash_talk)
-        except Exception as e:
-            print(f"[{self.name}] Failed to parse response: {e}")
-            print(f"[{self.name}] Response was: {response[:300]}...")
+        """
+        Parse AI response into decision (see core/decision_parser.py).
+        A reply that can't be used is a fold, with the reason in last_parse_error.
+        """
+        parsed = parse_decision(response)
+        self._record_parse_error(parsed.error)
+        return AIDecision(parsed.action, parsed.amount, parsed.reasoning,
+                          parsed.inner_thoughts,  # For viewers only
+                          parsed.trash_talk)      # For other AIs
+
+    def _record_parse_error(self, error: Optional[ParseError]):
+        """Note why the last reply couldn't be used (None if it could)."""
+        self.last_parse_error = error
+        if error is not None:
+            self.parse_errors += 1
+
+
+# Every player with notes in memory, so nothing pending is lost at exit
+_live_players: "weakref.WeakSet[AIPlayer]" = weakref.WeakSet()
 
-        # Default to fold if parsing fails
-        return AIDecision(Action.FOLD, 0, "Parse error - defaulting to fold")
+
+@atexit.register
+def _flush_all_notes():
+    for player in list(_live_players):
+        player.flush_notes_sync()
+
+
+def prompt_stats() -> Dict[str, Dict]:
+    """Decision-prompt token accounting for every live player, by name."""
+    return {player.name: player.prompt_stats.summary() for player in list(_live_players)}
+
+
+# Manager whose tournament is running (or ran last), for the API
+_active_manager: Optional["weakref.ref[AIPlayerManager]"] = None
+
+
+def current_usage(hands: int = 0) -> Optional[Dict]:
+    """Token / cost report for the current tournament, with its last `hands` hands (None before one starts)."""
+    manager = _active_manager() if _active_manager is not None else None
+    if manager is None:
+        return None
+    report = manager.usage_summary()
+    if hands:
+        report["hands"] = manager.hand_usage[-hands:]
+    return report
 
 
 class AIPlayerManager:
@@ -368,6 +507,9 @@ class AIPlayerManager:
 
     def __init__(self):
         self.players: Dict[str, AIPlayer] = {}
+        self.hand_usage: List[Dict] = []  # Per hand: {"hand", "players": {name: usage}, "total"}
+        self._tournament_start: Dict[str, Dict[str, Usage]] = {}  # Usage counters when it started
+        self._hand_start: Optional[Tuple[int, Dict[str, Usage]]] = None
 
     def register_player(self, player: AIPlayer):
         """Register an AI player."""
@@ -435,6 +577,70 @@ class AIPlayerManager:
         except Exception as e:
             print(f"[{player.name}] Failed to update notes: {e}")
 
+    async def flush_notes(self):
+        """Write every player's pending notes to disk."""
+        await asyncio.gather(*(player.flush_notes() for player in self.players.values()))
+
+    async def aclose(self):
+        """Shut down every player's resources."""
+        await asyncio.gather(*(player.aclose() for player in self.players.values()))
+
+    def start_tournament(self):
+        """Start per-hand and tournament usage accounting from the players' current counters."""
+        global _active_manager
+        self._tournament_start = {name: self._usage_copy(player) for name, player in self.players.items()}
+        self.hand_usage = []
+        self._hand_start = None
+        _active_manager = weakref.ref(self)
+
+    def begin_hand(self, hand_number: int):
+        self._hand_start = (hand_number, {name: player.total_usage() for name, player in self.players.items()})
+
+    def end_hand(self) -> Optional[Dict]:
+        """
+        Usage of the hand since begin_hand (a reply still streaming its text
+        when the hand ends lands in the next one). None if no hand was begun.
+        """
+        if self._hand_start is None:
+            return None
+        hand_number, start = self._hand_start
+        self._hand_start = None
+        players = {name: player.total_usage().since(start.get(name)) for name, player in self.players.items()}
+        record = {
+            "hand": hand_number,
+            "players": {name: usage.summary() for name, usage in players.items() if usage.calls},
+            "total": total(players.values()).summary()
+        }
+        self.hand_usage.append(record)
+        return record
+
+    def usage_summary(self) -> Dict:
+        """Usage since start_tournament: per player and call kind, per player, and overall."""
+        players, totals = {}, []
+        for name, player in self.players.items():
+            start = self._tournament_start.get(name, {})
+            kinds = {kind: usage.since(start.get(kind)) for kind, usage in player.usage.items()}
+            player_total = total(kinds.values())
+            totals.append(player_total)
+            players[name] = {
+                "model": player.model_name,
+                **{kind: usage.summary() for kind, usage in kinds.items()},
+                "total": player_total.summary()
+            }
+        overall = total(totals)
+        hands = len(self.hand_usage)
+        return {
+            "players": players,
+            "total": overall.summary(),
+            "hands": hands,
+            "cost_per_hand": round(sum(h["total"]["cost"] for h in self.hand_usage) / hands, 6) if hands else None,
+            "tokens_per_hand": round(sum(h["total"]["total_tokens"] for h in self.hand_usage) / hands, 1) if hands else None
+        }
+
+    @staticmethod
+    def _usage_copy(player: AIPlayer) -> Dict[str, Usage]:
+        return {kind: replace(usage) for kind, usage in player.usage.items()}
+
     def get_all_notes(self) -> Dict[str, str]:
         """Get all players' notes for debugging."""
         return {name: player.get_notes() for name, player in self.players.items()}
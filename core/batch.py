@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Batch Simulation
+Runs many headless tournaments across worker processes and aggregates the results.
+
+Every tournament gets its own seed derived from (master_seed, index), so
+results don't depend on how tournaments are sharded: the same master seed
+gives the same aggregates with 1 worker or 64. Aggregates are kept as
+integer totals and only divided when read, so they are bit-identical
+whatever order shards come back in.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from .simulation import SIMULATION_CONFIG, simulate_tournament
+from .tournament import Policy, TournamentConfig
+
+
+DEFAULT_SHARD_SIZE = 50  # Tournaments per task sent to a worker
+
+
+def tournament_seed(master_seed: int, index: int) -> int:
+    """Independent 64-bit seed for tournament `index` of a batch."""
+    digest = hashlib.blake2b(f"{master_seed}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+@dataclass
+class TournamentSummary:
+    """Compact per-tournament result streamed back from workers."""
+    index: int          # Position in the batch
+    seed: int           # Replay with simulate_tournament(policies, seed=seed)
+    places: List[int]   # Finish place per seat (1 = winner)
+    chips: List[int]    # Chips at end per seat
+    hands: int
+
+
+@dataclass
+class BatchStats:
+    """Aggregated results per seat. Totals are ints; averages are computed on read."""
+    seats: List[str]
+    starting_chips: int
+    tournaments: int = 0
+    total_hands: int = 0
+    place_counts: List[List[int]] = field(default_factory=list)  # [seat][place - 1]
+    net_chips: List[int] = field(default_factory=list)           # Sum of (end - start) per seat
+
+    def __post_init__(self):
+        seats = len(self.seats)
+        if not self.place_counts:
+            self.place_counts = [[0] * seats for _ in range(seats)]
+        if not self.net_chips:
+            self.net_chips = [0] * seats
+
+    def add(self, summary: TournamentSummary):
+        self.tournaments += 1
+        self.total_hands += summary.hands
+        for seat, (place, chips) in enumerate(zip(summary.places, summary.chips)):
+            self.place_counts[seat][place - 1] += 1
+            self.net_chips[seat] += chips - self.starting_chips
+
+    @property
+    def avg_hands(self) -> float:
+        return self.total_hands / self.tournaments if self.tournaments else 0.0
+
+    def finish_distribution(self) -> Dict[str, List[float]]:
+        """{seat: [P(1st), P(2nd), ...]}"""
+        n = self.tournaments or 1
+        return {name: [c / n for c in counts] for name, counts in zip(self.seats, self.place_counts)}
+
+    def chip_ev(self) -> Dict[str, float]:
+        """{seat: average chips won/lost per tournament}"""
+        n = self.tournaments or 1
+        return {name: total / n for name, total in zip(self.seats, self.net_chips)}
+
+    def to_dict(self) -> Dict:
+        return {
+            "seats": self.seats,
+            "tournaments": self.tournaments,
+            "avg_hands": self.avg_hands,
+            "finish_distribution": self.finish_distribution(),
+            "chip_ev": self.chip_ev(),
+        }
+
+
+def _run_shard(policies: Dict[str, Policy], config: TournamentConfig,
+               master_seed: int, indices: range) -> List[TournamentSummary]:
+    """Worker entry point: play a contiguous range of tournaments."""
+    seats = list(policies)
+    summaries = []
+    for index in indices:
+        seed = tournament_seed(master_seed, index)
+        result = simulate_tournament(policies, seed=seed, config=config)
+        places = {s["name"]: s["place"] for s in result.final_standings}
+        chips = {s["name"]: s["chips_at_end"] for s in result.final_standings}
+        summaries.append(TournamentSummary(
+            index=index,
+            seed=seed,
+            places=[places[name] for name in seats],
+            chips=[chips[name] for name in seats],
+            hands=result.total_hands
+        ))
+    return summaries
+
+
+def iter_batch(
+    policies: Dict[str, Policy],
+    tournaments: int,
+    master_seed: int = 0,
+    workers: Optional[int] = None,
+    config: Optional[TournamentConfig] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE
+) -> Iterator[TournamentSummary]:
+    """
+    Play `tournaments` Sit & Gos, yielding each summary as its shard finishes
+    (completion order, not index order).
+
+    Args:
+        policies: {seat_name: policy} - policies must be picklable
+                  (module-level functions or HeuristicPolicy instances)
+        tournaments: Number of tournaments
+        master_seed: Seeds every tournament via tournament_seed()
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+        config: Tournament config (defaults to SIMULATION_CONFIG)
+        shard_size: Tournaments per worker task
+    """
+    config = config or SIMULATION_CONFIG
+    workers = workers or os.cpu_count() or 1
+    shards = [range(lo, min(lo + shard_size, tournaments)) for lo in range(0, tournaments, shard_size)]
+
+    if workers == 1:
+        for indices in shards:
+            yield from _run_shard(policies, config, master_seed, indices)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_shard, policies, config, master_seed, indices) for indices in shards]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def run_batch(
+    policies: Dict[str, Policy],
+    tournaments: int,
+    master_seed: int = 0,
+    workers: Optional[int] = None,
+    config: Optional[TournamentConfig] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE
+) -> BatchStats:
+    """Play a batch and return the aggregated stats (see iter_batch for args)."""
+    config = config or SIMULATION_CONFIG
+    stats = BatchStats(seats=list(policies), starting_chips=config.starting_chips)
+    for summary in iter_batch(policies, tournaments, master_seed, workers, config, shard_size):
+        stats.add(summary)
+    return stats
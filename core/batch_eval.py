@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Batched Hand Evaluation (NumPy)
+Scores thousands of hands per call with vectorized table lookups.
+
+Uses the same card ints (0-51) and strength ints as hand_tables, so
+results are directly comparable with HandEvaluator.strength. Requires
+numpy; the rest of core works without it.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from .hand_tables import CARD_RANK_KEY, CARD_RANK_BIT, FLUSH_TABLE, RANK_TABLE
+
+
+_RANK_KEY = np.array(CARD_RANK_KEY, dtype=np.int64)
+_RANK_BIT = np.array(CARD_RANK_BIT, dtype=np.int32)
+_FLUSH = np.array(FLUSH_TABLE, dtype=np.int32)
+
+# Rank keys are sparse 39-bit ints - look them up by binary search
+_SORTED_KEYS = np.array(sorted(RANK_TABLE), dtype=np.int64)
+_SORTED_STRENGTHS = np.array([RANK_TABLE[k] for k in sorted(RANK_TABLE)], dtype=np.int32)
+
+
+def evaluate_batch(cards: np.ndarray) -> np.ndarray:
+    """
+    Score a batch of hands.
+
+    Args:
+        cards: int array of shape (..., K) with K in 5-7, cards encoded 0-51
+
+    Returns:
+        int32 array of shape (...) of hand strengths (higher is better)
+    """
+    cards = np.asarray(cards)
+    if cards.shape[-1] < 5 or cards.shape[-1] > 7:
+        raise ValueError("Batch evaluation needs 5-7 cards per hand")
+
+    keys = _RANK_KEY[cards].sum(axis=-1)
+    strengths = _SORTED_STRENGTHS[np.searchsorted(_SORTED_KEYS, keys)]
+
+    # Cards are distinct, so summing a suit's rank bits is the same as OR-ing them
+    bits = _RANK_BIT[cards]
+    suits = cards & 3
+    for suit in range(4):
+        flush = _FLUSH[np.where(suits == suit, bits, 0).sum(axis=-1)]
+        strengths = np.where(flush > 0, flush, strengths)
+
+    return strengths
+
+
+def rank_players(holes: np.ndarray, boards: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score every player on every board in one call.
+
+    Args:
+        holes: (P, 2) hole cards shared across boards, or (N, P, 2) per board
+        boards: (N, 5) community cards
+
+    Returns:
+        (strengths, winners) - both shaped (N, P). winners is True for every
+        player holding the best hand on that board (several on a split).
+    """
+    holes = np.asarray(holes)
+    boards = np.asarray(boards)
+    n = boards.shape[0]
+    if holes.ndim == 2:
+        holes = np.broadcast_to(holes, (n,) + holes.shape)
+    players = holes.shape[1]
+
+    hands = np.concatenate(
+        [holes, np.broadcast_to(boards[:, None, :], (n, players, boards.shape[1]))],
+        axis=2
+    )
+    strengths = evaluate_batch(hands)
+    winners = strengths == strengths.max(axis=1, keepdims=True)
+    return strengths, winners
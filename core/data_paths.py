@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Data Paths
+Where what persists between runs is kept: the AIs' notes (which become
+the live models' system prompts), the hand history database and long-run
+player stats.
+
+Offline runs against the mock LLM server (LLM_BACKEND=mock) default to a
+fresh scratch directory instead, so mock hands and notes never reach the
+real ones - set MOCK_DATA_DIR to keep them somewhere, or NOTES_DIR /
+HISTORY_DB / PLAYER_STATS to choose each one.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+ROOT = Path(__file__).parent.parent
+OFFLINE = os.getenv("LLM_BACKEND", "live") == "mock"
+
+if OFFLINE:
+    SCRATCH_DIR = Path(os.getenv("MOCK_DATA_DIR") or tempfile.mkdtemp(prefix="ai-poker-mock-"))
+    DATA_DIR = SCRATCH_DIR
+    DEFAULT_NOTES_DIR = SCRATCH_DIR / "notes"
+else:
+    SCRATCH_DIR = None
+    DATA_DIR = ROOT / "data"
+    DEFAULT_NOTES_DIR = ROOT / "notes"
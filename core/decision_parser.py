@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Decision Parser
+Reads the JSON decision out of a model's reply, tolerating the ways LLM
+output goes wrong: code fences and chatter around the object, trailing
+commas, braces and escaped quotes inside strings, and replies cut off by
+the token limit.
+
+- Fast path: json.loads on the span from the first "{" to the last "}" -
+  well-formed replies (nearly all of them) never leave C code.
+- Repair path: one pass over the structural characters only (a
+  precompiled pattern skips everything else), tracking strings, escapes
+  and nesting to find where the object really ends, which commas are
+  trailing, and - if the reply was truncated - how to close it: a cut-off
+  string value is kept and closed, a dangling key or a literal that may
+  be cut short ("45" of "450") is dropped, open brackets are closed.
+
+parse_decision() never raises and never prints: a reply it can't use
+comes back as a fold with a ParseError saying why and where.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .game_engine import Action
+
+
+# "action" values models reply with
+ACTION_NAMES = {
+    'fold': Action.FOLD,
+    'check': Action.CHECK,
+    'call': Action.CALL,
+    'bet': Action.BET,
+    'raise': Action.RAISE,
+    'all_in': Action.ALL_IN,
+    'all-in': Action.ALL_IN,
+    'all in': Action.ALL_IN,
+    'allin': Action.ALL_IN
+}
+
+_STRUCTURAL = re.compile(r'["\\{}\[\],:]')
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?')
+MAX_CANDIDATES = 3  # "{" positions tried before giving up (preambles can contain braces too)
+EXCERPT = 40        # Characters of context either side of an error
+
+
+@dataclass
+class ParseError:
+    """Why a reply couldn't be used."""
+    kind: str                       # empty / no_object / invalid_json / no_action / unknown_action
+    message: str
+    position: Optional[int] = None  # Offset in the reply, when there is one
+    excerpt: str = ""               # Reply text around it
+
+    def __str__(self):
+        where = f" at {self.position}" if self.position is not None else ""
+        return f"{self.kind}{where}: {self.message}"
+
+
+class DecisionParseError(ValueError):
+    """Raised by callers that treat an unusable reply as a failed call."""
+
+    def __init__(self, error: ParseError):
+        super().__init__(str(error))
+        self.error = error
+
+
+@dataclass
+class ParsedDecision:
+    action: Action = Action.FOLD
+    amount: int = 0
+    reasoning: str = ""
+    inner_thoughts: Optional[str] = None
+    trash_talk: Optional[str] = None
+    repairs: Tuple[str, ...] = ()  # trailing_comma / truncated / bad_amount - fixed up, still usable
+    error: Optional[ParseError] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def parse_decision(text: str) -> ParsedDecision:
+    """The decision in a reply, or a fold carrying a ParseError."""
+    data, repairs, error = extract_object(text)
+    if error is not None:
+        return ParsedDecision(reasoning="Parse error - defaulting to fold", error=error)
+
+    raw_action = data.get("action")
+    if raw_action is None:
+        return ParsedDecision(reasoning="Parse error - defaulting to fold", repairs=tuple(repairs),
+                              error=ParseError("no_action", "Reply has no \"action\" field"))
+    action = ACTION_NAMES.get(str(raw_action).strip().lower())
+    amount, amount_ok = parse_amount(data.get("amount"))
+    if not amount_ok:
+        repairs.append("bad_amount")
+    decision = ParsedDecision(
+        action or Action.FOLD,
+        amount,
+        _text(data.get("reasoning")) or "",
+        _text(data.get("inner_thoughts")),
+        _text(data.get("trash_talk")),
+        tuple(repairs)
+    )
+    if action is None:
+        decision.error = ParseError("unknown_action", f"Unknown action {raw_action!r}")
+    return decision
+
+
+def parse_amount(value: Any) -> Tuple[int, bool]:
+    """Chips from an "amount" value (300, 300.0, "300", "1,200 chips"). (0, False) if there's no number."""
+    if value is None:
+        return 0, True
+    if isinstance(value, bool):
+        return 0, False
+    if isinstance(value, (int, float)):
+        return int(value), True
+    match = _NUMBER.search(str(value).replace(",", ""))
+    if match is None:
+        return 0, False
+    return int(float(match.group())), True
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+
+def extract_object(text: str) -> Tuple[Optional[Dict], List[str], Optional[ParseError]]:
+    """(object, repairs applied, error) for the first JSON object in `text`."""
+    if not text or not text.strip():
+        return None, [], ParseError("empty", "Empty reply")
+    start = text.find("{")
+    if start == -1:
+        return None, [], ParseError("no_object", "No JSON object in reply", None, text[:2 * EXCERPT])
+
+    end = text.rfind("}")
+    if end > start:
+        try:
+            data = json.loads(text[start:end + 1])
+            if isinstance(data, dict):
+                return data, [], None
+        except ValueError:
+            pass
+
+    error = None
+    for _ in range(MAX_CANDIDATES):
+        cleaned, repairs = _repair(text, start)
+        try:
+            data = json.loads(cleaned)
+            if isinstance(data, dict):
+                return data, repairs, None
+        except ValueError as e:
+            if error is None:
+                position = start + getattr(e, "pos", 0)
+                error = ParseError("invalid_json", getattr(e, "msg", str(e)), position,
+                                   text[max(0, position - EXCERPT):position + EXCERPT])
+        start = text.find("{", start + 1)
+        if start == -1:
+            break
+    return None, [], error
+
+
+def _repair(text: str, start: int) -> Tuple[str, List[str]]:
+    """
+    The object starting at text[start] as loadable JSON: cut at its closing
+    brace, trailing commas dropped, and closed off if the text ends first.
+    """
+    stack: List[str] = []
+    member_start: List[int] = []  # Per open bracket: where its member in progress began
+    drops: List[int] = []         # Trailing commas
+    in_string = is_key = expect_key = False
+    skip = 0        # Escaped character to ignore
+    prev, prev_pos = "", start  # Last structural token outside strings ("k"/"v" = closed key/value string)
+    end = None
+
+    for match in _STRUCTURAL.finditer(text, start):
+        i = match.start()
+        if i < skip:
+            continue
+        c = text[i]
+        if in_string:
+            if c == "\\":
+                skip = i + 2
+            elif c == '"':
+                in_string = False
+                prev, prev_pos = ("k" if is_key else "v"), i
+            continue
+        if c == '"':
+            in_string = True
+            is_key, expect_key = expect_key, False
+            continue
+        if c == "{" or c == "[":
+            stack.append(c)
+            member_start.append(i + 1)
+            expect_key = c == "{"
+        elif c == "}" or c == "]":
+            if prev == "," and not text[prev_pos + 1:i].strip():
+                drops.append(prev_pos)
+            if stack:
+                stack.pop()
+                member_start.pop()
+            if not stack:
+                end = i + 1
+                break
+            expect_key = False
+        elif c == ",":
+            if stack:
+                member_start[-1] = i
+                expect_key = stack[-1] == "{"
+        else:  # ":"
+            expect_key = False
+        prev, prev_pos = c, i
+
+    repairs = ["trailing_comma"] if drops else []
+    suffix = ""
+    if end is None:
+        repairs.append("truncated")
+        end = len(text)
+        if in_string:
+            if is_key:
+                end = member_start[-1]
+            else:
+                escape = skip - 2  # Last backslash escape in the text
+                if skip > end or (text[escape + 1:escape + 2] == "u" and end - escape < 6):
+                    end = escape  # Cut mid-escape ("\\" or a short "\u00")
+                suffix = '"'
+        else:
+            tail = text[prev_pos + 1:].strip()
+            value_position = prev == ":" or (prev in ",[" and stack[-1] == "[")
+            if value_position and tail and _is_literal(tail) and (not tail[-1].isdigit() or text[-1].isspace()):
+                pass  # true / false / null, or a number that was followed by whitespace (so not cut short)
+            elif value_position or prev == "k":
+                end = member_start[-1]
+            elif prev == ",":
+                end = prev_pos
+            else:
+                end = prev_pos + 1
+        suffix += "".join("}" if b == "{" else "]" for b in reversed(stack))
+
+    if not drops:
+        return text[start:end] + suffix, repairs
+    pieces, last = [], start
+    for pos in drops:
+        pieces.append(text[last:pos])
+        last = pos + 1
+    pieces.append(text[last:end])
+    return "".join(pieces) + suffix, repairs
+
+
+def _is_literal(token: str) -> bool:
+    try:
+        json.loads(token)
+        return True
+    except ValueError:
+        return False
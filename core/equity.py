@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Equity Engine
+Win probabilities for N players given hole cards, board and dead cards.
+
+Small runout spaces (flop/turn/river, or any spot with few unknown cards)
+are enumerated exactly. Anything larger falls back to Monte Carlo with a
+sample budget and a standard-error convergence cutoff - vectorized through
+batch_eval when numpy is installed, plain Python otherwise.
+"""
+
+import math
+import random
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence, Union
+
+from .game_engine import Card
+from .hand_tables import CARD_RANK_KEY, CARD_RANK_BIT, FLUSH_TABLE, RANK_TABLE
+from .preflop import get_preflop_table
+
+try:
+    import numpy as np
+    from .batch_eval import rank_players
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Enumerate exactly when runouts * players stays under this many evaluations
+EXACT_EVAL_LIMIT = 5000
+
+# Monte Carlo defaults
+DEFAULT_MAX_SAMPLES = 1000
+DEFAULT_MIN_SAMPLES = 200
+DEFAULT_TOLERANCE = 0.015  # Stop once every player's std error is below this
+BATCH_SIZE = 100
+NUMPY_BATCH_SIZE = 250
+
+CardLike = Union[Card, int]
+
+
+@dataclass
+class EquityResult:
+    """Equity for each player in a spot."""
+    equities: Dict[str, float]  # Expected share of the pot (ties split)
+    wins: Dict[str, float]      # Probability of winning outright
+    ties: Dict[str, float]      # Probability of splitting
+    samples: int                # Runouts evaluated
+    exact: bool                 # True if every runout was enumerated
+
+
+def _index(card: CardLike) -> int:
+    return card if isinstance(card, int) else card.index
+
+
+def _parts(cards: Sequence[int]):
+    """Rank key and per-suit rank masks for a partial hand."""
+    key = 0
+    masks = [0, 0, 0, 0]
+    for c in cards:
+        key += CARD_RANK_KEY[c]
+        masks[c & 3] |= CARD_RANK_BIT[c]
+    return key, masks
+
+
+class _Tally:
+    """Accumulates win/tie shares across runouts."""
+
+    def __init__(self, players: int):
+        self.players = players
+        self.share = [0.0] * players
+        self.share_sq = [0.0] * players
+        self.wins = [0] * players
+        self.ties = [0] * players
+        self.samples = 0
+
+    def add(self, hole_parts, board: Sequence[int]):
+        board_key, board_masks = _parts(board)
+        c0, c1, c2, c3 = board_masks
+        best = -1
+        winners = []
+        for i, (key, masks) in enumerate(hole_parts):
+            strength = (
+                FLUSH_TABLE[masks[0] | c0] or FLUSH_TABLE[masks[1] | c1] or
+                FLUSH_TABLE[masks[2] | c2] or FLUSH_TABLE[masks[3] | c3] or
+                RANK_TABLE[key + board_key]
+            )
+            if strength > best:
+                best = strength
+                winners = [i]
+            elif strength == best:
+                winners.append(i)
+
+        self.samples += 1
+        if len(winners) == 1:
+            w = winners[0]
+            self.wins[w] += 1
+            self.share[w] += 1.0
+            self.share_sq[w] += 1.0
+        else:
+            portion = 1.0 / len(winners)
+            for w in winners:
+                self.ties[w] += 1
+                self.share[w] += portion
+                self.share_sq[w] += portion * portion
+
+    def add_batch(self, winners):
+        """Add a (runouts, players) bool matrix of winners from batch_eval."""
+        count = winners.sum(axis=1)
+        portion = winners / count[:, None]
+        solo = winners & (count == 1)[:, None]
+        for i, (share, share_sq, wins, ties) in enumerate(zip(
+            portion.sum(axis=0).tolist(),
+            (portion * portion).sum(axis=0).tolist(),
+            solo.sum(axis=0).tolist(),
+            (winners & ~solo).sum(axis=0).tolist()
+        )):
+            self.share[i] += share
+            self.share_sq[i] += share_sq
+            self.wins[i] += wins
+            self.ties[i] += ties
+        self.samples += len(winners)
+
+    def converged(self, max_samples: int, tolerance: float) -> bool:
+        if self.samples >= max_samples:
+            return True
+        return self.samples >= DEFAULT_MIN_SAMPLES and self.max_std_error() <= tolerance
+
+    def max_std_error(self) -> float:
+        n = self.samples
+        worst = 0.0
+        for total, total_sq in zip(self.share, self.share_sq):
+            mean = total / n
+            variance = max(total_sq / n - mean * mean, 0.0)
+            worst = max(worst, math.sqrt(variance / n))
+        return worst
+
+
+def calculate_equity(
+    hands: Dict[str, Sequence[CardLike]],
+    board: Sequence[CardLike] = (),
+    dead: Sequence[CardLike] = (),
+    max_samples: int = DEFAULT_MAX_SAMPLES,
+    tolerance: float = DEFAULT_TOLERANCE,
+    exact_limit: int = EXACT_EVAL_LIMIT,
+    rng: Optional[random.Random] = None,
+    use_preflop_table: bool = True
+) -> EquityResult:
+    """
+    Compute equity for every player.
+
+    Args:
+        hands: {player_name: [hole1, hole2]} for players still in the hand
+        board: Community cards dealt so far (0-5)
+        dead: Known cards out of play (folded hands, burns shown, etc.)
+        max_samples: Monte Carlo sample budget
+        tolerance: Stop sampling once every player's std error is below this
+        exact_limit: Enumerate exactly when runouts * players <= this
+        rng: Random source for sampling (defaults to the module RNG)
+        use_preflop_table: Answer heads-up preflop spots from the precomputed
+                           matchup table when it has been built
+    """
+    names = list(hands.keys())
+    if not names:
+        return EquityResult({}, {}, {}, 0, True)
+
+    holes = [[_index(c) for c in hands[name]] for name in names]
+    board_ints = [_index(c) for c in board]
+    if len(board_ints) > 5:
+        raise ValueError("Board cannot have more than 5 cards")
+
+    used = set(board_ints)
+    used.update(_index(c) for c in dead)
+    for hole in holes:
+        used.update(hole)
+    remaining = [c for c in range(52) if c not in used]
+    needed = 5 - len(board_ints)
+    if needed > len(remaining):
+        raise ValueError("Not enough cards left to complete the board")
+
+    # Single player left: they have it all
+    if len(names) == 1:
+        name = names[0]
+        return EquityResult({name: 1.0}, {name: 1.0}, {name: 0.0}, 0, True)
+
+    # Heads-up preflop with nothing dead: straight from the matchup table
+    if use_preflop_table and len(names) == 2 and not board_ints and len(used) == 4:
+        table = get_preflop_table()
+        if table is not None:
+            win, tie = table.matchup(holes[0], holes[1])
+            loss = max(1.0 - win - tie, 0.0)
+            a, b = names
+            return EquityResult(
+                equities={a: win + tie / 2, b: loss + tie / 2},
+                wins={a: win, b: loss},
+                ties={a: tie, b: tie},
+                samples=0,
+                exact=False
+            )
+
+    hole_parts = [_parts(hole) for hole in holes]
+    tally = _Tally(len(names))
+
+    runouts = math.comb(len(remaining), needed)
+    exact = runouts * len(names) <= exact_limit
+    if exact:
+        for extra in combinations(remaining, needed):
+            tally.add(hole_parts, board_ints + list(extra))
+    elif NUMPY_AVAILABLE:
+        _sample_numpy(tally, holes, board_ints, remaining, needed, max_samples, tolerance, rng)
+    else:
+        rng = rng or random
+        sample = rng.sample
+        while not tally.converged(max_samples, tolerance):
+            for _ in range(min(BATCH_SIZE, max_samples - tally.samples)):
+                tally.add(hole_parts, board_ints + sample(remaining, needed))
+
+    n = tally.samples
+    return EquityResult(
+        equities={name: tally.share[i] / n for i, name in enumerate(names)},
+        wins={name: tally.wins[i] / n for i, name in enumerate(names)},
+        ties={name: tally.ties[i] / n for i, name in enumerate(names)},
+        samples=n,
+        exact=exact
+    )
+
+
+def _sample_numpy(
+    tally: _Tally,
+    holes: List[List[int]],
+    board: List[int],
+    remaining: List[int],
+    needed: int,
+    max_samples: int,
+    tolerance: float,
+    rng: Optional[random.Random]
+):
+    """Monte Carlo in vectorized batches of runouts."""
+    gen = np.random.default_rng((rng or random).getrandbits(64))
+    hole_arr = np.array(holes, dtype=np.int64)
+    deck = np.array(remaining, dtype=np.int64)
+
+    while not tally.converged(max_samples, tolerance):
+        size = min(NUMPY_BATCH_SIZE, max_samples - tally.samples)
+        # First `needed` columns of a random permutation = sample without replacement
+        picks = gen.random((size, len(deck))).argsort(axis=1)[:, :needed]
+        boards = np.concatenate(
+            [np.broadcast_to(np.array(board, dtype=np.int64), (size, len(board))), deck[picks]],
+            axis=1
+        )
+        _, winners = rank_players(hole_arr, boards)
+        tally.add_batch(winners)
@@ -5,11 +5,14 @@ Core logic for dealing, betting, and hand evaluation.
 """
 
 import random
+import sys
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 from enum import Enum, auto
 from itertools import combinations
 
+from .hand_tables import evaluate_indices, decode_strength, MAX_TABLE_CARDS
+
 
 class Suit(Enum):
     HEARTS = "♥"
@@ -56,24 +59,85 @@ class Action(Enum):
     ALL_IN = "all_in"
 
 
-@dataclass
+RANK_CHARS = "23456789TJQKA"
+_RANKS = tuple(Rank)  # Indexed by rank_index (0 = deuce, 12 = ace)
+_SUITS = (Suit.CLUBS, Suit.DIAMONDS, Suit.HEARTS, Suit.SPADES)  # Indexed by suit_index
+_SUIT_INDEX = {suit: i for i, suit in enumerate(_SUITS)}
+
+# Interned display strings ("A♠") for every card int
+CARD_STRINGS = tuple(
+    sys.intern(RANK_CHARS[i >> 2] + _SUITS[i & 3].value) for i in range(52)
+)
+_CARD_FROM_STR = {text: i for i, text in enumerate(CARD_STRINGS)}
+
+
 class Card:
-    rank: Rank
-    suit: Suit
+    """
+    A playing card stored as an int 0-51 (rank_index * 4 + suit_index).
+    Instances are interned - Card(rank, suit) always returns the same object.
+    """
+    __slots__ = ("index",)
+
+    def __new__(cls, rank: Rank, suit: Suit):
+        return _CARDS[(rank.value - 2) * 4 + _SUIT_INDEX[suit]]
+
+    @classmethod
+    def from_index(cls, index: int) -> "Card":
+        """Get the card for an int 0-51."""
+        return _CARDS[index]
+
+    @classmethod
+    def from_str(cls, text: str) -> "Card":
+        """Parse the display format ("A♠") back into a card."""
+        return _CARDS[_CARD_FROM_STR[text]]
+
+    @property
+    def rank(self) -> Rank:
+        return _RANKS[self.index >> 2]
+
+    @property
+    def suit(self) -> Suit:
+        return _SUITS[self.index & 3]
+
+    def __eq__(self, other):
+        if isinstance(other, Card):
+            return self.index == other.index
+        return NotImplemented
+
+    def __hash__(self):
+        return self.index
+
+    def __reduce__(self):
+        # Unpickle to the interned instance
+        return (Card.from_index, (self.index,))
 
     def __str__(self):
-        rank_str = {
-            Rank.TWO: "2", Rank.THREE: "3", Rank.FOUR: "4", Rank.FIVE: "5",
-            Rank.SIX: "6", Rank.SEVEN: "7", Rank.EIGHT: "8", Rank.NINE: "9",
-            Rank.TEN: "T", Rank.JACK: "J", Rank.QUEEN: "Q", Rank.KING: "K", Rank.ACE: "A"
-        }
-        return f"{rank_str[self.rank]}{self.suit.value}"
+        return CARD_STRINGS[self.index]
 
     def __repr__(self):
-        return str(self)
+        return CARD_STRINGS[self.index]
 
 
-@dataclass
+def _make_card(index: int) -> Card:
+    card = object.__new__(Card)
+    card.index = index
+    return card
+
+
+_CARDS = tuple(_make_card(i) for i in range(52))
+
+
+def cards_to_ints(cards: List[Card]) -> List[int]:
+    """Convert cards to their 0-51 int encoding."""
+    return [c.index for c in cards]
+
+
+def ints_to_cards(indices: List[int]) -> List[Card]:
+    """Convert 0-51 ints back to (interned) cards."""
+    return [_CARDS[i] for i in indices]
+
+
+@dataclass(slots=True)
 class Player:
     name: str
     chips: int
@@ -94,23 +158,20 @@ class Player:
 class Deck:
     """Standard 52-card deck."""
 
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None):
         self.cards: List[Card] = []
+        self.rng = rng or random
         self.reset()
 
     def reset(self):
         """Reset and shuffle deck."""
-        self.cards = [
-            Card(rank, suit)
-            for suit in Suit
-            for rank in Rank
-        ]
-        random.shuffle(self.cards)
+        self.cards = list(_CARDS)
+        self.rng.shuffle(self.cards)
 
     def deal(self, count: int = 1) -> List[Card]:
         """Deal cards from deck."""
         dealt = self.cards[:count]
-        self.cards = self.cards[count:]
+        del self.cards[:count]
         return dealt
 
 
@@ -123,6 +184,28 @@ class HandEvaluator:
         Evaluate best 5-card hand from given cards.
         Returns (HandRank, tiebreaker_values) for comparison.
         """
+        if len(cards) > MAX_TABLE_CARDS:
+            return HandEvaluator._evaluate_combinations(cards)
+
+        category, values = decode_strength(HandEvaluator.strength(cards))
+        return HandRank(category), values
+
+    @staticmethod
+    def strength(cards: List[Card]) -> int:
+        """
+        Score 5-7 cards as a single int via the precomputed tables.
+        Higher is better; equal strengths split the pot.
+        """
+        if len(cards) < 5:
+            raise ValueError("Need at least 5 cards to evaluate")
+        return evaluate_indices([c.index for c in cards])
+
+    @staticmethod
+    def _evaluate_combinations(cards: List[Card]) -> Tuple[HandRank, List[int]]:
+        """
+        Reference evaluator: brute force over every 5-card combination.
+        Used for hands larger than the tables cover and to verify them.
+        """
         if len(cards) < 5:
             raise ValueError("Need at least 5 cards to evaluate")
 
@@ -219,7 +302,7 @@ class HandEvaluator:
         return 0  # Tie
 
 
-@dataclass
+@dataclass(slots=True)
 class HandState:
     """State of current hand."""
     pot: int = 0
@@ -228,14 +311,21 @@ class HandState:
     min_raise: int = 0
     stage: str = "preflop"  # preflop, flop, turn, river, showdown
     action_history: List[Dict] = field(default_factory=list)
+    equities: Dict[str, float] = field(default_factory=dict)  # Latest spectator odds
+    contributions: Dict[str, int] = field(default_factory=dict)  # Chips each player put in this hand
+    pots: List[Dict] = field(default_factory=list)  # Main pot first: {"amount", "eligible"[, "winners"]}
+    on_action: Optional[Callable[[Dict], None]] = None  # Sees each action_history entry as it's added
 
     def add_action(self, player: str, action: Action, amount: int = 0):
-        self.action_history.append({
+        entry = {
             "player": player,
             "action": action.value,
             "amount": amount,
             "stage": self.stage
-        })
+        }
+        self.action_history.append(entry)
+        if self.on_action is not None:
+            self.on_action(entry)
 
 
 class PokerGame:
@@ -244,13 +334,15 @@ class PokerGame:
     Manages a single hand of Texas Hold'em.
     """
 
-    def __init__(self, players: List[Player], small_blind: int, big_blind: int, ante: int = 0):
+    def __init__(self, players: List[Player], small_blind: int, big_blind: int, ante: int = 0,
+                 rng: Optional[random.Random] = None):
         self.players = players
         self.small_blind = small_blind
         self.big_blind = big_blind
         self.ante = ante
-        self.deck = Deck()
+        self.deck = Deck(rng)
         self.state = HandState()
+        self.on_action: Optional[Callable[[Dict], None]] = None  # Passed to each hand's HandState
         self.button_pos = 0  # Dealer button position
         self.evaluator = HandEvaluator()
 
@@ -264,8 +356,9 @@ class PokerGame:
 
     def start_hand(self):
         """Start a new hand."""
-        self.deck.reset()
-        self.state = HandState()
+        if len(self.deck.cards) < len(_CARDS):  # A fresh deck is already shuffled
+            self.deck.reset()
+        self.state = HandState(on_action=self.on_action)
         self.state.min_raise = self.big_blind
 
         # Reset players for new hand
@@ -276,9 +369,7 @@ class PokerGame:
         # Collect antes
         if self.ante > 0:
             for p in self.active_players():
-                ante_amount = min(self.ante, p.chips)
-                p.chips -= ante_amount
-                self.state.pot += ante_amount
+                self._commit_chips(p, min(self.ante, p.chips))
 
         # Post blinds
         active = self.active_players()
@@ -289,18 +380,18 @@ class PokerGame:
             # Small blind
             sb_player = active[sb_pos]
             sb_amount = min(self.small_blind, sb_player.chips)
-            sb_player.chips -= sb_amount
+            self._commit_chips(sb_player, sb_amount)
             sb_player.current_bet = sb_amount
-            self.state.pot += sb_amount
 
             # Big blind
             bb_player = active[bb_pos]
             bb_amount = min(self.big_blind, bb_player.chips)
-            bb_player.chips -= bb_amount
+            self._commit_chips(bb_player, bb_amount)
             bb_player.current_bet = bb_amount
-            self.state.pot += bb_amount
             self.state.current_bet = bb_amount
 
+        self._update_pots()
+
         # Deal hole cards
         for p in self.active_players():
             p.hole_cards = self.deck.deal(2)
@@ -343,7 +434,7 @@ class PokerGame:
             actions.append((Action.CHECK, 0, 0))
             # Or bet
             if player.chips > 0:
-                min_bet = self.big_blind
+                min_bet = min(self.big_blind, player.chips)
                 max_bet = player.chips
                 actions.append((Action.BET, min_bet, max_bet))
         else:
@@ -370,41 +461,93 @@ class PokerGame:
         elif action == Action.CALL:
             to_call = self.state.current_bet - player.current_bet
             call_amount = min(to_call, player.chips)
-            player.chips -= call_amount
+            self._commit_chips(player, call_amount)
             player.current_bet += call_amount
-            self.state.pot += call_amount
-            if player.chips == 0:
-                player.all_in = True
         elif action == Action.BET:
-            player.chips -= amount
+            self._commit_chips(player, amount)
             player.current_bet += amount
-            self.state.pot += amount
             self.state.current_bet = player.current_bet
             self.state.min_raise = amount
-            if player.chips == 0:
-                player.all_in = True
         elif action == Action.RAISE:
             raise_to = player.current_bet + amount
             additional = amount
-            player.chips -= additional
+            self._commit_chips(player, additional)
             player.current_bet += additional
-            self.state.pot += additional
             self.state.min_raise = raise_to - self.state.current_bet
             self.state.current_bet = player.current_bet
-            if player.chips == 0:
-                player.all_in = True
         elif action == Action.ALL_IN:
             all_in_amount = player.chips
-            player.chips = 0
+            self._commit_chips(player, all_in_amount)
             player.current_bet += all_in_amount
-            self.state.pot += all_in_amount
             if player.current_bet > self.state.current_bet:
                 self.state.min_raise = player.current_bet - self.state.current_bet
                 self.state.current_bet = player.current_bet
             player.all_in = True
 
+        if action != Action.CHECK:
+            self._update_pots()
         self.state.add_action(player.name, action, amount)
 
+    def _commit_chips(self, player: Player, amount: int):
+        """Move chips from a player's stack into the pot."""
+        player.chips -= amount
+        self.state.pot += amount
+        contributions = self.state.contributions
+        contributions[player.name] = contributions.get(player.name, 0) + amount
+        if player.chips == 0:
+            player.all_in = True
+
+    def _update_pots(self):
+        """
+        Rebuild main/side pot layers from per-player contributions.
+        Every all-in amount caps a layer; chips above it go to the next one.
+        Only players who haven't folded and paid up to a layer's cap can win it.
+
+        One sweep over the contributions sorted by amount, O(P log P): a
+        contribution that ends inside a layer pays up to where it ends, every
+        larger one pays the whole layer, and players drop out of the eligible
+        list at the layer their contribution ends in.
+        """
+        contributions = self.state.contributions
+        if not contributions:
+            self.state.pots = []
+            return
+
+        caps = sorted({
+            contributions[p.name] for p in self.players
+            if p.all_in and not p.folded and p.name in contributions
+        })
+        order = sorted(contributions.items(), key=lambda item: item[1])
+        top = order[-1][1]
+        if not caps or caps[-1] < top:
+            caps.append(top)
+
+        eligible = [p.name for p in self.players if not p.folded and p.name in contributions]  # Seat order
+        pots: List[Dict] = []
+        previous = 0
+        i = 0
+        for cap in caps:
+            amount = 0
+            ended = set()
+            while i < len(order) and order[i][1] < cap:
+                name, contribution = order[i]
+                amount += contribution - previous
+                ended.add(name)
+                i += 1
+            amount += (len(order) - i) * (cap - previous)
+            if ended:
+                eligible = [name for name in eligible if name not in ended]
+            previous = cap
+            if amount == 0:
+                continue
+            if pots and (not eligible or eligible == pots[-1]["eligible"]):
+                # Nobody new can win these chips - fold them into the layer below
+                pots[-1]["amount"] += amount
+            else:
+                pots.append({"amount": amount, "eligible": eligible})
+
+        self.state.pots = pots
+
     def is_betting_complete(self) -> bool:
         """Check if betting round is complete."""
         active = [p for p in self.active_players() if not p.all_in]
@@ -459,39 +602,39 @@ class PokerGame:
             winner = active[0]
             won = self.state.pot
             winner.chips += won
+            self._update_pots()
+            for pot in self.state.pots:
+                pot["winners"] = [winner.name]
             return [(winner, won)]
 
-        # Showdown - evaluate hands
-        hands = {}
+        # Showdown - score each hand once (single int strength, higher wins)
+        strengths = {}
         for p in active:
             all_cards = p.hole_cards + self.state.community_cards
-            hands[p.name] = self.evaluator.evaluate(all_cards)
+            strengths[p.name] = self.evaluator.strength(all_cards)
 
-        # Find best hand(s)
-        best_hand = None
-        winners = []
+        # Best hand first; sort is stable so tied players keep seat order
+        ranked = sorted(active, key=lambda p: strengths[p.name], reverse=True)
 
-        for p in active:
-            if best_hand is None:
-                best_hand = hands[p.name]
-                winners = [p]
-            else:
-                cmp = self.evaluator.compare_hands(hands[p.name], best_hand)
-                if cmp > 0:
-                    best_hand = hands[p.name]
-                    winners = [p]
-                elif cmp == 0:
-                    winners.append(p)
+        # Award every pot layer to the best eligible hand(s)
+        self._update_pots()
+        winnings: Dict[str, int] = {}
+        for pot in self.state.pots:
+            eligible = set(pot["eligible"])
+            contenders = [p for p in ranked if p.name in eligible] or ranked
+            best = strengths[contenders[0].name]
+            winners = [p for p in contenders if strengths[p.name] == best]
+            pot["winners"] = [w.name for w in winners]
 
-        # Split pot among winners
-        share = self.state.pot // len(winners)
-        remainder = self.state.pot % len(winners)
+            share, remainder = divmod(pot["amount"], len(winners))
+            for i, w in enumerate(winners):
+                winnings[w.name] = winnings.get(w.name, 0) + share + (1 if i < remainder else 0)
 
         results = []
-        for i, w in enumerate(winners):
-            won = share + (1 if i < remainder else 0)
-            w.chips += won
-            results.append((w, won))
+        for p in active:
+            if p.name in winnings:
+                p.chips += winnings[p.name]
+                results.append((p, winnings[p.name]))
 
         return results
 
@@ -512,6 +655,32 @@ class PokerGame:
             if p.chips <= 0 and p.is_active:
                 p.is_active = False
 
+    def calculate_equity(self, exclude: List[str] = None, **kwargs) -> Dict[str, float]:
+        """
+        Equity of each player still in the hand (spectator view - uses all hole cards).
+        Folded hands count as dead cards. Extra kwargs go to equity.calculate_equity.
+        """
+        from .equity import calculate_equity
+
+        exclude = exclude or []
+        hands = {}
+        dead = []
+        for p in self.players:
+            if not p.is_active or not p.hole_cards:
+                continue
+            if p.folded or p.name in exclude:
+                dead.extend(p.hole_cards)
+            else:
+                hands[p.name] = p.hole_cards
+
+        result = calculate_equity(hands, self.state.community_cards, dead, **kwargs)
+        return result.equities
+
+    def update_equities(self) -> Dict[str, float]:
+        """Recompute and store equities for the current street."""
+        self.state.equities = self.calculate_equity()
+        return self.state.equities
+
     def get_game_state_for_player(self, player: Player) -> Dict:
         """Get game state from player's perspective."""
         return {
@@ -521,6 +690,7 @@ class PokerGame:
             "pot": self.state.pot,
             "community_cards": [str(c) for c in self.state.community_cards],
             "current_bet": self.state.current_bet,
+            "big_blind": self.big_blind,
             "stage": self.state.stage,
             "opponents": [
                 {
@@ -541,5 +711,6 @@ class PokerGame:
             "pot": self.state.pot,
             "community_cards": [str(c) for c in self.state.community_cards],
             "actions": self.state.action_history,
-            "stage": self.state.stage
+            "stage": self.state.stage,
+            "pots": self.state.pots
         }
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Precomputed Hand Strength Tables
+Lookup tables that score any 5, 6 or 7 card hand in O(1).
+
+Cards are encoded as ints 0-51: ``rank_index * 4 + suit_index`` where
+rank_index 0 is a deuce and 12 is an ace. A hand's strength is a single int
+that orders exactly like the (HandRank, tiebreakers) tuples produced by the
+combination-based evaluator:
+
+    strength = category << 20 | tiebreakers packed as 4-bit nibbles
+
+Two tables are built once at import:
+- RANK_TABLE: rank-multiset key -> strength, for hands without a flush
+- FLUSH_TABLE: 13-bit rank mask of the flush suit -> strength
+
+With 7 or fewer cards a flush rules out quads and full houses, so the flush
+table alone decides any hand holding five cards of one suit.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+
+# Hand categories (match HandRank values in game_engine)
+HIGH_CARD = 1
+PAIR = 2
+TWO_PAIR = 3
+THREE_OF_A_KIND = 4
+STRAIGHT = 5
+FLUSH = 6
+FULL_HOUSE = 7
+FOUR_OF_A_KIND = 8
+STRAIGHT_FLUSH = 9
+ROYAL_FLUSH = 10
+
+CATEGORY_SHIFT = 20
+
+# Number of tiebreaker values each category carries
+VALUE_COUNTS = {
+    HIGH_CARD: 5,
+    PAIR: 4,
+    TWO_PAIR: 3,
+    THREE_OF_A_KIND: 3,
+    STRAIGHT: 5,
+    FLUSH: 5,
+    FULL_HOUSE: 2,
+    FOUR_OF_A_KIND: 2,
+    STRAIGHT_FLUSH: 5,
+    ROYAL_FLUSH: 5,
+}
+
+# Per-card contributions: 3 bits of count per rank, 1 bit of presence per rank
+CARD_RANK_KEY = [1 << (3 * (c >> 2)) for c in range(52)]
+CARD_RANK_BIT = [1 << (c >> 2) for c in range(52)]
+
+MAX_TABLE_CARDS = 7
+
+
+def encode_strength(category: int, values: Sequence[int]) -> int:
+    """Pack a category and its tiebreaker values into one comparable int."""
+    strength = category << CATEGORY_SHIFT
+    shift = 16
+    for v in values:
+        strength |= v << shift
+        shift -= 4
+    return strength
+
+
+def _unpack_strength(strength: int) -> Tuple[int, List[int]]:
+    category = strength >> CATEGORY_SHIFT
+    values = [
+        (strength >> (16 - 4 * i)) & 0xF
+        for i in range(VALUE_COUNTS[category])
+    ]
+    return category, values
+
+
+def _straight_high(mask: int) -> int:
+    """Highest straight card value in a 13-bit rank mask, or 0."""
+    for low in range(8, -1, -1):
+        if (mask >> low) & 0x1F == 0x1F:
+            return low + 6
+    # Wheel: A-2-3-4-5
+    if mask & 0x100F == 0x100F:
+        return 5
+    return 0
+
+
+def _straight_values(high: int) -> List[int]:
+    if high == 5:
+        return [5, 4, 3, 2, 1]  # Ace plays low
+    return [high - i for i in range(5)]
+
+
+def _flush_strength(mask: int) -> int:
+    """Best hand using only the ranks of a single suit (5+ bits set)."""
+    high = _straight_high(mask)
+    if high:
+        category = ROYAL_FLUSH if high == 14 else STRAIGHT_FLUSH
+        return encode_strength(category, _straight_values(high))
+    top = [r + 2 for r in range(12, -1, -1) if mask >> r & 1][:5]
+    return encode_strength(FLUSH, top)
+
+
+def _rank_strength(counts: Sequence[int]) -> int:
+    """Best non-flush hand for a rank multiset (counts indexed by rank_index)."""
+    present = [r for r in range(12, -1, -1) if counts[r]]
+    values = [r + 2 for r in present]
+
+    quads = [r + 2 for r in present if counts[r] >= 4]
+    if quads:
+        kicker = next(v for v in values if v != quads[0])
+        return encode_strength(FOUR_OF_A_KIND, [quads[0], kicker])
+
+    trips = [r + 2 for r in present if counts[r] == 3]
+    pairs = [r + 2 for r in present if counts[r] == 2]
+    if trips:
+        fill = trips[1:] + pairs
+        if fill:
+            return encode_strength(FULL_HOUSE, [trips[0], max(fill)])
+
+    mask = 0
+    for r in present:
+        mask |= 1 << r
+    high = _straight_high(mask)
+    if high:
+        return encode_strength(STRAIGHT, _straight_values(high))
+
+    if trips:
+        kickers = [v for v in values if v != trips[0]][:2]
+        return encode_strength(THREE_OF_A_KIND, [trips[0]] + kickers)
+
+    if len(pairs) >= 2:
+        top = pairs[:2]
+        kicker = next(v for v in values if v not in top)
+        return encode_strength(TWO_PAIR, top + [kicker])
+
+    if pairs:
+        kickers = [v for v in values if v != pairs[0]][:3]
+        return encode_strength(PAIR, [pairs[0]] + kickers)
+
+    return encode_strength(HIGH_CARD, values[:5])
+
+
+def _build_rank_table() -> Dict[int, int]:
+    """Score every rank multiset of 5-7 cards (at most 4 of each rank)."""
+    table = {}
+    counts = [0] * 13
+
+    def fill(rank: int, remaining: int, key: int):
+        if rank == 13:
+            if MAX_TABLE_CARDS - remaining >= 5:
+                table[key] = _rank_strength(counts)
+            return
+        for n in range(min(4, remaining) + 1):
+            counts[rank] = n
+            fill(rank + 1, remaining - n, key + n * (1 << (3 * rank)))
+        counts[rank] = 0
+
+    fill(0, MAX_TABLE_CARDS, 0)
+    return table
+
+
+def _build_flush_table() -> List[int]:
+    table = [0] * 8192
+    for mask in range(8192):
+        if bin(mask).count("1") >= 5:
+            table[mask] = _flush_strength(mask)
+    return table
+
+
+RANK_TABLE: Dict[int, int] = _build_rank_table()
+FLUSH_TABLE: List[int] = _build_flush_table()
+
+# Only a few thousand distinct strengths exist - decode each one once
+_DECODED: Dict[int, Tuple[int, List[int]]] = {
+    s: _unpack_strength(s)
+    for s in set(RANK_TABLE.values()) | set(FLUSH_TABLE)
+    if s
+}
+
+
+def evaluate_indices(cards: Sequence[int]) -> int:
+    """
+    Score 5-7 cards given as ints 0-51.
+    Returns an int strength; higher is better, equal means a split.
+    """
+    key = 0
+    suit_masks = [0, 0, 0, 0]
+    for c in cards:
+        key += CARD_RANK_KEY[c]
+        suit_masks[c & 3] |= CARD_RANK_BIT[c]
+
+    for mask in suit_masks:
+        flush = FLUSH_TABLE[mask]
+        if flush:
+            return flush
+
+    return RANK_TABLE[key]
+
+
+def decode_strength(strength: int) -> Tuple[int, List[int]]:
+    """Unpack a strength into (category, tiebreaker_values)."""
+    decoded = _DECODED.get(strength)
+    if decoded is None:
+        return _unpack_strength(strength)
+    category, values = decoded
+    return category, list(values)
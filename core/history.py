@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Hand History Store
+Every completed hand - result, hole cards, board and full action history -
+in SQLite, so the arena's history survives restarts and can be queried
+long after the in-memory tournament is gone.
+
+Writes never block the game: record_hand() queues the HandResult and a
+background thread commits whatever has accumulated in one transaction
+(WAL mode, so API readers never wait on it). Reads use their own
+connection per thread.
+
+Queries are cursor-paginated, newest first or biggest pot first. Hand ids
+increase with play time, so date ranges are turned into id ranges up front
+and every query walks an index: the hands rowid, (pot, id), or
+hand_players (player, hand_id) / (player, pot, hand_id).
+"""
+
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .data_paths import DATA_DIR
+from .tournament import HandResult
+
+
+DEFAULT_HISTORY_PATH = DATA_DIR / "hand_history.db"
+HISTORY_DB = os.getenv("HISTORY_DB", str(DEFAULT_HISTORY_PATH))  # Empty to disable the store
+WRITE_BATCH = 500  # Most hands committed per transaction
+MAX_PAGE = 100     # Most hands returned per query
+
+SORT_RECENT = "recent"
+SORT_POT = "pot"
+SORT_ORDERS = (SORT_RECENT, SORT_POT)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tournaments (
+    id          TEXT PRIMARY KEY,
+    started_at  REAL NOT NULL,
+    ended_at    REAL,
+    players     TEXT NOT NULL,  -- JSON list
+    winner      TEXT,
+    total_hands INTEGER,
+    standings   TEXT            -- JSON list
+);
+CREATE TABLE IF NOT EXISTS hands (
+    id            INTEGER PRIMARY KEY,  -- Increases with played_at
+    tournament_id TEXT NOT NULL,
+    hand_number   INTEGER NOT NULL,
+    played_at     REAL NOT NULL,
+    pot           INTEGER NOT NULL,
+    small_blind   INTEGER NOT NULL,
+    big_blind     INTEGER NOT NULL,
+    ante          INTEGER NOT NULL,
+    showdown      INTEGER NOT NULL,
+    winners       TEXT NOT NULL,  -- JSON list
+    board         TEXT NOT NULL,  -- JSON list
+    summary       TEXT NOT NULL,
+    detail        TEXT NOT NULL   -- JSON: hole_cards, actions, pots, eliminations
+);
+CREATE UNIQUE INDEX IF NOT EXISTS hands_tournament ON hands (tournament_id, hand_number);
+CREATE INDEX IF NOT EXISTS hands_played_at ON hands (played_at);
+CREATE INDEX IF NOT EXISTS hands_pot ON hands (pot);
+CREATE TABLE IF NOT EXISTS hand_players (
+    player  TEXT NOT NULL,
+    hand_id INTEGER NOT NULL,
+    pot     INTEGER NOT NULL,  -- Copied from hands so per-player pot queries stay on this index
+    won     INTEGER NOT NULL,
+    PRIMARY KEY (player, hand_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS hand_players_pot ON hand_players (player, pot, hand_id);
+"""
+
+HAND_COLUMNS = ("h.id, h.tournament_id, h.hand_number, h.played_at, h.pot, h.small_blind, h.big_blind, "
+                "h.ante, h.showdown, h.winners, h.board, h.summary, h.detail")
+
+TimeBound = Union[float, str, datetime, None]
+
+
+class HistoryQueryError(ValueError):
+    """Bad query parameters (unknown sort, malformed cursor or date, won without player)."""
+
+
+def _timestamp(value: TimeBound) -> Optional[float]:
+    """Unix time from a number, ISO 8601 string or datetime."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            raise HistoryQueryError(f"Bad date: {value!r}")
+    return value.timestamp()
+
+
+def _parse_cursor(cursor: Optional[str], sort: str) -> Optional[tuple]:
+    if not cursor:
+        return None
+    try:
+        parts = tuple(int(part) for part in cursor.split(":"))
+    except ValueError:
+        raise HistoryQueryError(f"Bad cursor: {cursor!r}")
+    if len(parts) != (2 if sort == SORT_POT else 1):
+        raise HistoryQueryError(f"Cursor {cursor!r} is not a {sort} cursor")
+    return parts
+
+
+class HandHistoryStore:
+    """SQLite hand history: queued background writes, indexed cursor-paginated reads."""
+
+    def __init__(self, path: Union[str, Path] = HISTORY_DB):
+        self.path = Path(path)
+        self._queue: queue.Queue = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._readers = threading.local()
+        self.hands_written = 0
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, isolation_level=None)  # Explicit BEGIN/COMMIT
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints; a crash loses at most the last batch
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.executescript(SCHEMA)
+        return conn
+
+    # --- Writes (any thread; committed by the writer thread) ---
+
+    def record_hand(self, tournament_id: str, result: HandResult, played_at: Optional[float] = None):
+        """Queue a completed hand. Never blocks on the database."""
+        self._put(("hand", tournament_id, played_at or time.time(), result))
+
+    def record_tournament(self, tournament_id: str, players: List[str], started_at: Optional[float] = None,
+                          winner: Optional[str] = None, standings: Optional[List[Dict]] = None,
+                          total_hands: Optional[int] = None):
+        """Queue a tournament row: once at the start, again with the result (ended when `winner` is set)."""
+        ended_at = time.time() if winner is not None else None
+        self._put(("tournament", tournament_id, started_at or time.time(), ended_at,
+                   players, winner, total_hands, standings))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is committed. False on timeout."""
+        if self._writer is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Commit what's queued and stop the writer (it restarts on the next record)."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+
+    def _put(self, item: tuple):
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, name="hand-history", daemon=True)
+                    self._writer.start()
+                    atexit.register(self.close)
+        self._queue.put(item)
+
+    def _write_loop(self):
+        conn = self._connect()
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < WRITE_BATCH:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                records = [item for item in batch if isinstance(item, tuple)]
+                if records:
+                    try:
+                        self._write(conn, records)
+                    except sqlite3.Error as e:
+                        print(f"[HISTORY] Failed to write {len(records)} records: {e}")
+                for item in batch:
+                    if isinstance(item, threading.Event):
+                        item.set()
+                if None in batch:
+                    return
+        finally:
+            conn.close()
+
+    def _write(self, conn: sqlite3.Connection, records: List[tuple]):
+        players, tournaments = [], []
+        written = 0
+        conn.execute("BEGIN IMMEDIATE")  # Take the write lock before reading the next id
+        try:
+            next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM hands").fetchone()[0]
+            for record in records:
+                if record[0] == "tournament":
+                    _, tid, started_at, ended_at, names, winner, total_hands, standings = record
+                    tournaments.append((tid, started_at, ended_at, json.dumps(names), winner, total_hands,
+                                        None if standings is None else json.dumps(standings)))
+                    continue
+                _, tid, played_at, result = record
+                inserted = conn.execute(
+                    "INSERT INTO hands VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (tournament_id, hand_number) DO NOTHING",  # Already stored - keep the first copy
+                    (
+                        next_id, tid, result.hand_number, played_at, result.pot, *result.blinds,
+                        int(result.showdown), json.dumps(result.winners), json.dumps(result.final_board),
+                        result.summary,
+                        json.dumps({
+                            "hole_cards": {name: [str(c) for c in cards] for name, cards in result.hole_cards.items()},
+                            "actions": result.actions,
+                            "pots": result.pots,
+                            "eliminations": result.eliminations
+                        }, default=str)
+                    )
+                ).rowcount
+                if not inserted:
+                    continue
+                players.extend((name, next_id, result.pot, int(name in result.winners))
+                               for name in result.hole_cards)
+                next_id += 1
+                written += 1
+            conn.executemany(
+                "INSERT INTO tournaments VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET "
+                "ended_at = excluded.ended_at, winner = excluded.winner, "
+                "total_hands = excluded.total_hands, standings = excluded.standings",
+                tournaments)
+            conn.executemany("INSERT INTO hand_players VALUES (?, ?, ?, ?)", players)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self.hands_written += written
+
+    # --- Reads ---
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            conn = self._readers.conn = self._connect()
+            conn.execute("PRAGMA query_only=1")
+        return conn
+
+    def query(
+        self,
+        player: Optional[str] = None,
+        tournament: Optional[str] = None,
+        min_pot: Optional[int] = None,
+        max_pot: Optional[int] = None,
+        since: TimeBound = None,
+        until: TimeBound = None,
+        won: Optional[bool] = None,
+        sort: str = SORT_RECENT,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> Dict:
+        """
+        One page of hands matching every filter given, plus the cursor for
+        the next page (None on the last one). `player` matches hands the
+        player was dealt into; `won` (with `player`) narrows to wins or
+        losses; `since` is inclusive, `until` exclusive.
+        """
+        if sort not in SORT_ORDERS:
+            raise HistoryQueryError(f"Unknown sort: {sort!r} (expected one of {', '.join(SORT_ORDERS)})")
+        if won is not None and not player:
+            raise HistoryQueryError("won needs a player")
+        after = _parse_cursor(cursor, sort)
+        limit = max(1, min(limit, MAX_PAGE))
+        conn = self._reader()
+
+        # Dates -> id range, via the played_at index
+        low_id = high_id = None
+        since, until = _timestamp(since), _timestamp(until)
+        if since is not None:
+            row = conn.execute("SELECT id FROM hands WHERE played_at >= ? ORDER BY played_at LIMIT 1",
+                               (since,)).fetchone()
+            if row is None:
+                return {"hands": [], "next_cursor": None}
+            low_id = row[0]
+        if until is not None:
+            row = conn.execute("SELECT id FROM hands WHERE played_at < ? ORDER BY played_at DESC LIMIT 1",
+                               (until,)).fetchone()
+            if row is None:
+                return {"hands": [], "next_cursor": None}
+            high_id = row[0]
+
+        # With a player filter everything but the tournament is answered from hand_players
+        source = "hand_players p JOIN hands h ON h.id = p.hand_id" if player else "hands h"
+        t = "p" if player else "h"
+        id_column = "p.hand_id" if player else "h.id"
+        where, params = [], []
+        if player:
+            where.append("p.player = ?")
+            params.append(player)
+            if won is not None:
+                where.append("p.won = ?")
+                params.append(int(won))
+        if tournament:
+            where.append("h.tournament_id = ?")
+            params.append(tournament)
+        if min_pot is not None:
+            where.append(f"{t}.pot >= ?")
+            params.append(min_pot)
+        if max_pot is not None:
+            where.append(f"{t}.pot <= ?")
+            params.append(max_pot)
+        if low_id is not None:
+            where.append(f"{id_column} >= ?")
+            params.append(low_id)
+        if high_id is not None:
+            where.append(f"{id_column} <= ?")
+            params.append(high_id)
+        if sort == SORT_POT:
+            if after:
+                where.append(f"({t}.pot, {id_column}) < (?, ?)")
+                params.extend(after)
+            order = f"{t}.pot DESC, {id_column} DESC"
+        else:
+            if after:
+                where.append(f"{id_column} < ?")
+                params.append(after[0])
+            order = f"{id_column} DESC"
+
+        sql = f"SELECT {HAND_COLUMNS} FROM {source}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ?"
+        rows = conn.execute(sql, (*params, limit)).fetchall()
+
+        hands = [self._hand(row) for row in rows]
+        next_cursor = None
+        if len(rows) == limit:
+            last = hands[-1]
+            next_cursor = f"{last['pot']}:{last['id']}" if sort == SORT_POT else str(last["id"])
+        return {"hands": hands, "next_cursor": next_cursor}
+
+    def get_hand(self, hand_id: int) -> Optional[Dict]:
+        row = self._reader().execute(f"SELECT {HAND_COLUMNS} FROM hands h WHERE h.id = ?", (hand_id,)).fetchone()
+        return self._hand(row) if row else None
+
+    @staticmethod
+    def _hand(row: tuple) -> Dict:
+        (hand_id, tournament_id, hand_number, played_at, pot, small_blind, big_blind, ante,
+         showdown, winners, board, summary, detail) = row
+        return {
+            "id": hand_id,
+            "tournament_id": tournament_id,
+            "hand_number": hand_number,
+            "played_at": datetime.fromtimestamp(played_at).isoformat(),
+            "pot": pot,
+            "blinds": {"small_blind": small_blind, "big_blind": big_blind, "ante": ante},
+            "showdown": bool(showdown),
+            "winners": json.loads(winners),
+            "board": json.loads(board),
+            "summary": summary,
+            **json.loads(detail)
+        }
+
+
+def open_history_store() -> Optional[HandHistoryStore]:
+    """The configured store, or None if HISTORY_DB is set to empty."""
+    return HandHistoryStore(HISTORY_DB) if HISTORY_DB else None
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Preflop Equity Tables
+Precomputed preflop equities, memory-mapped from a binary file on first use.
+
+The file is produced by scripts/build_preflop_tables.py and holds:
+- Equity of each of the 169 starting-hand classes vs random hands, 2-5 players
+- Heads-up win/tie probabilities for every combo vs combo matchup (1326 x 1326)
+
+Layout (little endian):
+    header   "<4s5I": magic, version, classes, min_players, max_players, combos
+    classes  float32[169][max_players - min_players + 1]
+    wins     uint16[1326][1326]   (probability * 65535)
+    ties     uint16[1326][1326]
+"""
+
+import mmap
+import struct
+from array import array
+from pathlib import Path
+from typing import Optional, Sequence, Tuple, Union
+
+from .game_engine import Card, RANK_CHARS
+
+
+PREFLOP_TABLE_PATH = Path(__file__).parent.parent / "data" / "preflop_equity.bin"
+
+MAGIC = b"PFEQ"
+VERSION = 1
+HEADER = struct.Struct("<4s5I")
+NUM_CLASSES = 169
+NUM_COMBOS = 1326
+MIN_PLAYERS = 2
+MAX_PLAYERS = 5
+SCALE = 65535
+
+CardLike = Union[Card, int]
+
+
+def _index(card: CardLike) -> int:
+    return card if isinstance(card, int) else card.index
+
+
+def combo_index(card1: CardLike, card2: CardLike) -> int:
+    """Index 0-1325 of an unordered pair of distinct cards."""
+    a, b = _index(card1), _index(card2)
+    if a > b:
+        a, b = b, a
+    return b * (b - 1) // 2 + a
+
+
+def combo_cards(index: int) -> Tuple[int, int]:
+    """Inverse of combo_index: the two card ints (low, high)."""
+    b = int(((8 * index + 1) ** 0.5 + 1) / 2)
+    while b * (b - 1) // 2 > index:
+        b -= 1
+    while (b + 1) * b // 2 <= index:
+        b += 1
+    return index - b * (b - 1) // 2, b
+
+
+def class_index(card1: CardLike, card2: CardLike) -> int:
+    """
+    Index 0-168 of a starting-hand class on the 13x13 grid:
+    pairs on the diagonal, suited at [high][low], offsuit at [low][high].
+    """
+    a, b = _index(card1), _index(card2)
+    high, low = max(a >> 2, b >> 2), min(a >> 2, b >> 2)
+    if (a & 3) == (b & 3):
+        return high * 13 + low
+    return low * 13 + high
+
+
+def class_name(index: int) -> str:
+    """Human-readable class for an index ("AA", "AKs", "T9o")."""
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANK_CHARS[row] * 2
+    if row > col:
+        return f"{RANK_CHARS[row]}{RANK_CHARS[col]}s"
+    return f"{RANK_CHARS[col]}{RANK_CHARS[row]}o"
+
+
+def class_from_name(name: str) -> int:
+    """Parse "AKs" / "AKo" / "AA" into a class index."""
+    high = RANK_CHARS.index(name[0].upper())
+    low = RANK_CHARS.index(name[1].upper())
+    if high < low:
+        high, low = low, high
+    if high == low:
+        return high * 13 + low
+    if name[2:].lower() == "s":
+        return high * 13 + low
+    return low * 13 + high
+
+
+class PreflopTable:
+    """Read-only view over a memory-mapped preflop equity file."""
+
+    def __init__(self, path: Path = PREFLOP_TABLE_PATH):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, classes, min_players, max_players, combos = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a v{VERSION} preflop equity table: {self.path}")
+        if classes != NUM_CLASSES or combos != NUM_COMBOS:
+            raise ValueError(f"Unexpected table dimensions in {self.path}")
+
+        self.min_players = min_players
+        self.max_players = max_players
+        self._player_counts = max_players - min_players + 1
+
+        view = memoryview(self._mmap)
+        offset = HEADER.size
+        class_bytes = NUM_CLASSES * self._player_counts * 4
+        matrix_bytes = NUM_COMBOS * NUM_COMBOS * 2
+        self._classes = view[offset:offset + class_bytes].cast("f")
+        offset += class_bytes
+        self._wins = view[offset:offset + matrix_bytes].cast("H")
+        offset += matrix_bytes
+        self._ties = view[offset:offset + matrix_bytes].cast("H")
+
+    def class_equity(self, hand: Union[str, Sequence[CardLike]], players: int = 2) -> float:
+        """Equity of a hand (class name or two cards) vs random hands."""
+        if isinstance(hand, str):
+            idx = class_from_name(hand)
+        else:
+            idx = class_index(hand[0], hand[1])
+        players = min(max(players, self.min_players), self.max_players)
+        return self._classes[idx * self._player_counts + players - self.min_players]
+
+    def matchup(self, hand1: Sequence[CardLike], hand2: Sequence[CardLike]) -> Tuple[float, float]:
+        """Heads-up (win, tie) probabilities of hand1 vs hand2."""
+        cell = combo_index(*hand1) * NUM_COMBOS + combo_index(*hand2)
+        return self._wins[cell] / SCALE, self._ties[cell] / SCALE
+
+    def matchup_equity(self, hand1: Sequence[CardLike], hand2: Sequence[CardLike]) -> float:
+        """Heads-up pot share of hand1 vs hand2 (ties split)."""
+        win, tie = self.matchup(hand1, hand2)
+        return win + tie / 2
+
+
+def write_table(path: Path, class_equities: Sequence[float],
+                wins: Sequence[int], ties: Sequence[int]):
+    """
+    Write a table file.
+    class_equities: 169 * player_counts floats, row-major by class
+    wins / ties: 1326 * 1326 scaled uint16 values, row-major by hand1 combo
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header = HEADER.pack(MAGIC, VERSION, NUM_CLASSES, MIN_PLAYERS, MAX_PLAYERS, NUM_COMBOS)
+    parts = [array("f", class_equities), array("H", wins), array("H", ties)]
+
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        for part in parts:
+            part.tofile(f)
+    tmp.replace(path)
+
+
+_table: Optional[PreflopTable] = None
+_table_missing = False
+
+
+def get_preflop_table() -> Optional[PreflopTable]:
+    """
+    Shared table, memory-mapped on first call.
+    Returns None if the file hasn't been built (run scripts/build_preflop_tables.py).
+    """
+    global _table, _table_missing
+    if _table is None and not _table_missing:
+        try:
+            _table = PreflopTable()
+        except FileNotFoundError:
+            _table_missing = True
+    return _table
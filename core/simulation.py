@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Headless Simulation
+Plays complete Sit & Gos with plug-in policy functions instead of LLM agents.
+
+Everything runs synchronously on one seeded RNG - no asyncio, no callbacks,
+no equity tracking - so a tournament replays exactly from its seed and
+thousands of hands a second are possible for validating blind structures
+and engine changes.
+
+A policy is any callable (game, player, valid_actions, rng) -> (Action, amount),
+matching the get_ai_action contract (RAISE amount = total chips added).
+"""
+
+import random
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+from .game_engine import Action, Card, HandEvaluator, Player, PokerGame
+from .hand_tables import CATEGORY_SHIFT, PAIR, TWO_PAIR
+from .preflop import NUM_CLASSES, class_index
+from .tournament import Policy, Tournament, TournamentConfig, TournamentResult, TournamentRunner
+
+
+ValidActions = List[Tuple[Action, int, int]]
+
+
+def _chen_score(index: int) -> int:
+    """Chen formula points for a starting-hand class index."""
+    row, col = divmod(index, 13)
+    high, low = max(row, col), min(row, col)
+    points = {12: 10.0, 11: 8.0, 10: 7.0, 9: 6.0}.get(high, (high + 2) / 2)
+
+    if high == low:
+        return int(max(points * 2, 5))
+    if row > col:  # Suited
+        points += 2
+    gap = high - low - 1
+    points -= (0, 1, 2, 4)[gap] if gap < 4 else 5
+    if gap <= 1 and high < 10:
+        points += 1
+    return int(-(-points // 1))  # Round up
+
+
+# Chen points for each of the 169 starting-hand classes (AA=20 ... 72o=-1)
+CHEN_SCORES = [_chen_score(i) for i in range(NUM_CLASSES)]
+
+
+def preflop_score(player: Player) -> int:
+    """Chen points of a player's hole cards."""
+    a, b = player.hole_cards
+    return CHEN_SCORES[class_index(a, b)]
+
+
+def _find(valid_actions: ValidActions, action: Action) -> Optional[Tuple[Action, int, int]]:
+    for option in valid_actions:
+        if option[0] == action:
+            return option
+    return None
+
+
+def check_or_fold(valid_actions: ValidActions) -> Tuple[Action, int]:
+    """Take a free look if there is one, otherwise give up."""
+    if _find(valid_actions, Action.CHECK):
+        return Action.CHECK, 0
+    return Action.FOLD, 0
+
+
+def check_or_call(valid_actions: ValidActions) -> Tuple[Action, int]:
+    """Stay in for the minimum (calling all-in if that's all there is)."""
+    for action in (Action.CHECK, Action.CALL, Action.ALL_IN):
+        option = _find(valid_actions, action)
+        if option:
+            return action, option[1]
+    return Action.FOLD, 0
+
+
+def bet_or_raise(valid_actions: ValidActions, amount: int) -> Tuple[Action, int]:
+    """Bet/raise `amount` chips, clamped to the legal range; call if raising isn't allowed."""
+    for action in (Action.BET, Action.RAISE):
+        option = _find(valid_actions, action)
+        if option:
+            _, low, high = option
+            return action, max(low, min(amount, high))
+    return check_or_call(valid_actions)
+
+
+def shove(valid_actions: ValidActions) -> Tuple[Action, int]:
+    """Put every chip in."""
+    for action in (Action.BET, Action.RAISE, Action.ALL_IN):
+        option = _find(valid_actions, action)
+        if option:
+            return action, option[2]
+    return check_or_call(valid_actions)
+
+
+def made_hand(game: PokerGame, player: Player) -> int:
+    """Hand category (HIGH_CARD..ROYAL_FLUSH) with the current board."""
+    return hand_category(player.hole_cards, game.state.community_cards)
+
+
+def hand_category(hole_cards: List[Card], board: List[Card]) -> int:
+    return HandEvaluator.strength(hole_cards + board) >> CATEGORY_SHIFT
+
+
+def random_policy(game: PokerGame, player: Player, valid_actions: ValidActions,
+                  rng: random.Random) -> Tuple[Action, int]:
+    """Uniform over legal actions (never folds when checking is free)."""
+    options = valid_actions
+    if _find(valid_actions, Action.CHECK):
+        options = [o for o in valid_actions if o[0] != Action.FOLD]
+    action, low, high = rng.choice(options)
+    return action, rng.randint(low, high) if high > low else low
+
+
+@dataclass(frozen=True)
+class HeuristicPolicy:
+    """
+    Chen-formula preflop, made-hand postflop.
+    Thresholds decide how tight or loose it plays.
+    """
+    play_score: int         # Chen points needed to call preflop
+    raise_score: int        # Chen points needed to raise preflop
+    max_call_ratio: float   # Largest call as a fraction of the pot (before calling)
+    bluff_frequency: float  # Chance to bet air when checked to
+
+    def __call__(self, game: PokerGame, player: Player, valid_actions: ValidActions,
+                 rng: random.Random) -> Tuple[Action, int]:
+        state = game.state
+        return self.decide(state.stage, player.hole_cards, state.community_cards,
+                           state.current_bet - player.current_bet, state.pot,
+                           game.big_blind, valid_actions, rng)
+
+    def decide(self, stage: str, hole_cards: List[Card], board: List[Card], to_call: int, pot: int,
+               big_blind: int, valid_actions: ValidActions, rng: random.Random) -> Tuple[Action, int]:
+        """The policy on plain values (no game objects needed)."""
+        if stage == "preflop":
+            score = CHEN_SCORES[class_index(*hole_cards)]
+            if score >= self.raise_score:
+                return bet_or_raise(valid_actions, to_call + 2 * big_blind)
+            if score >= self.play_score and to_call <= pot * self.max_call_ratio:
+                return check_or_call(valid_actions)
+            return check_or_fold(valid_actions)
+
+        category = hand_category(hole_cards, board)
+        if category >= TWO_PAIR:
+            return bet_or_raise(valid_actions, to_call + pot // 2)
+        if category == PAIR and to_call <= pot * self.max_call_ratio:
+            return check_or_call(valid_actions)
+        if to_call == 0 and rng.random() < self.bluff_frequency:
+            return bet_or_raise(valid_actions, pot // 2)
+        return check_or_fold(valid_actions)
+
+
+TIGHT_POLICY = HeuristicPolicy(play_score=8, raise_score=10, max_call_ratio=0.5, bluff_frequency=0.05)
+LOOSE_POLICY = HeuristicPolicy(play_score=4, raise_score=8, max_call_ratio=1.0, bluff_frequency=0.25)
+
+
+# Minimum Chen points to open-shove by stack depth in big blinds (deepest first)
+PUSH_CHART = [(20, 10), (15, 9), (10, 7), (6, 5), (0, 3)]
+CALL_MARGIN = 2  # Calling an all-in needs this many more points than shoving
+
+
+def push_fold_policy(game: PokerGame, player: Player, valid_actions: ValidActions,
+                     rng: random.Random) -> Tuple[Action, int]:
+    """Short-stack chart: all-in or fold preflop, showdown-bound after that."""
+    if game.state.stage != "preflop":
+        if made_hand(game, player) >= PAIR:
+            return check_or_call(valid_actions)
+        return check_or_fold(valid_actions)
+
+    stack_bb = (player.chips + player.current_bet) / game.big_blind
+    needed = next(score for depth, score in PUSH_CHART if stack_bb >= depth)
+    facing_raise = game.state.current_bet > game.big_blind
+    if facing_raise:
+        needed += CALL_MARGIN
+
+    if preflop_score(player) >= needed:
+        return shove(valid_actions)
+    return check_or_fold(valid_actions)
+
+
+POLICIES: Dict[str, Policy] = {
+    "random": random_policy,
+    "tight": TIGHT_POLICY,
+    "loose": LOOSE_POLICY,
+    "pushfold": push_fold_policy,
+}
+
+def state_decision(policy: HeuristicPolicy, game_state: Dict, valid_actions: ValidActions,
+                   rng: random.Random) -> Tuple[Action, int]:
+    """
+    Run a heuristic policy on the state dict an LLM agent is given
+    (get_game_state_for_player) - the local fallback when the model is
+    late or unreachable.
+    """
+    return policy.decide(
+        game_state["stage"],
+        [Card.from_str(c) for c in game_state["your_cards"]],
+        [Card.from_str(c) for c in game_state["community_cards"]],
+        game_state["current_bet"] - game_state["your_bet"],
+        game_state["pot"],
+        game_state["big_blind"],
+        valid_actions,
+        rng
+    )
+
+
+# No wall clock, no spectator equities: results depend on the seed alone
+SIMULATION_CONFIG = TournamentConfig(track_equity=False, use_clock=False)
+
+
+def simulate_tournament(policies: Dict[str, Policy], seed: Optional[int] = None,
+                        config: Optional[TournamentConfig] = None) -> TournamentResult:
+    """
+    Play one Sit & Go to completion.
+
+    Args:
+        policies: {player_name: policy} in seat order
+        seed: RNG seed - the same seed and policies replay the same tournament
+        config: Blind structure / stacks (clock and equity tracking are forced off)
+    """
+    config = replace(config or SIMULATION_CONFIG, track_equity=False, use_clock=False)
+    tournament = Tournament(list(policies), config, rng=random.Random(seed))
+    return TournamentRunner(tournament).run_tournament_sync(policies)
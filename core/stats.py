@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Opponent Statistics
+Long-run HUD numbers for every player, kept up to date as the cards are
+played instead of recomputed from hand histories:
+
+- VPIP:   put money in voluntarily preflop (calls and raises, not blinds)
+- PFR:    raised preflop
+- 3-bet:  re-raised a single preflop raise, out of the times they faced one
+- AF:     postflop (bets + raises) / calls
+- WTSD:   went to showdown, out of the flops they saw (W$SD: won there)
+
+Counters are kept per player, per (player, position) and per (player,
+opponent) - how each player responds to the other's bets and open raises.
+
+StatsTracker hooks into a Tournament: start_hand() sets up the seats,
+on_action() gets every HandState.add_action entry (O(1): a few dict
+lookups and increments), end_hand() folds the hand's flags into the
+counters (O(players)). Memory is fixed by the number of players, so
+millions of hands cost nothing extra; the counters are saved as a small
+JSON file and picked up again by the next tournament.
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass, fields
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from .data_paths import DATA_DIR
+from .game_engine import PokerGame
+
+
+DEFAULT_STATS_PATH = DATA_DIR / "player_stats.json"
+STATS_PATH = os.getenv("PLAYER_STATS", str(DEFAULT_STATS_PATH))  # Empty to disable tracking
+PROMPT_STATS = os.getenv("PROMPT_STATS", "0") == "1"  # Show opponents' stats in decision prompts
+MIN_SAMPLE = 30  # Hands before a player's stats are shown to the bots
+VERSION = 1
+
+AGGRESSIVE = {"bet", "raise"}
+CALLS = {"call", "all_in"}  # all_in is only offered when a player can't cover the call
+
+
+@dataclass(slots=True)
+class StatLine:
+    """Raw counters behind the percentages (one per player and per player/position)."""
+    hands: int = 0
+    vpip: int = 0
+    pfr: int = 0
+    three_bet_chances: int = 0
+    three_bets: int = 0
+    postflop_aggressive: int = 0  # Bets + raises on the flop, turn and river
+    postflop_calls: int = 0
+    saw_flop: int = 0
+    showdowns: int = 0
+    showdowns_won: int = 0
+
+    def summary(self) -> Dict:
+        return {
+            "hands": self.hands,
+            "vpip": _ratio(self.vpip, self.hands),
+            "pfr": _ratio(self.pfr, self.hands),
+            "three_bet": _ratio(self.three_bets, self.three_bet_chances),
+            "af": _ratio(self.postflop_aggressive, self.postflop_calls),
+            "wtsd": _ratio(self.showdowns, self.saw_flop),
+            "wsd": _ratio(self.showdowns_won, self.showdowns)
+        }
+
+
+@dataclass(slots=True)
+class OpponentLine:
+    """How a player responds to one opponent's aggression."""
+    faced_bets: int = 0  # Times they acted facing this opponent's bet / raise
+    folded: int = 0
+    called: int = 0
+    raised: int = 0
+    faced_opens: int = 0  # Times they faced this opponent's single preflop raise
+    three_bets: int = 0
+
+    def summary(self) -> Dict:
+        return {
+            "faced_bets": self.faced_bets,
+            "fold_to_bet": _ratio(self.folded, self.faced_bets),
+            "raise_vs_bet": _ratio(self.raised, self.faced_bets),
+            "faced_opens": self.faced_opens,
+            "three_bet_vs_open": _ratio(self.three_bets, self.faced_opens)
+        }
+
+
+def _ratio(count: int, total: int) -> Optional[float]:
+    return round(count / total, 3) if total else None
+
+
+@lru_cache(maxsize=None)
+def position_names(players: int) -> Tuple[str, ...]:
+    """Position of each seat counting from the button, as the engine posts blinds."""
+    names = []
+    for offset in range(players):
+        if offset == 1 % players:
+            names.append("SB")
+        elif offset == 2 % players:
+            names.append("BB")  # Heads-up the button posts the big blind
+        elif offset == 0:
+            names.append("BTN")
+        elif offset == players - 1:
+            names.append("CO")
+        else:
+            names.append("UTG" if offset == 3 else f"UTG+{offset - 3}")
+    return tuple(names)
+
+
+class _Seat:
+    """One player's flags for the hand in progress."""
+    __slots__ = ("position", "vpip", "pfr", "three_bet_chance", "three_bet",
+                 "aggressive", "calls", "folded_on")
+
+    def __init__(self, position: str):
+        self.position = position
+        self.vpip = self.pfr = self.three_bet_chance = self.three_bet = False
+        self.aggressive = self.calls = 0
+        self.folded_on: Optional[str] = None
+
+
+class StatsTracker:
+    """Incremental VPIP / PFR / 3-bet / AF / WTSD counters, persisted between tournaments."""
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self.path = Path(path) if path else None
+        self.hands = 0
+        self.players: Dict[str, StatLine] = {}
+        self.positions: Dict[Tuple[str, str], StatLine] = {}
+        self.opponents: Dict[Tuple[str, str], OpponentLine] = {}
+        # Hand in progress
+        self._seats: Dict[str, _Seat] = {}
+        self._stage = "preflop"
+        self._raises = 0        # Preflop raises so far (1 = open raise)
+        self._opener: Optional[str] = None
+        self._aggressor: Optional[str] = None  # Last bettor / raiser this street
+
+    # --- Live updates ---
+
+    def attach(self, tournament):
+        """Follow every action of a tournament (hand start/end still come from its callbacks)."""
+        tournament.on_action = self.on_action
+
+    def start_hand(self, game: PokerGame):
+        """Seat everyone dealt in (call after blinds are posted, before the first action)."""
+        seated = game.players_in_tournament()
+        names = position_names(len(seated))
+        button = game.button_pos % len(seated)
+        self._seats = {
+            player.name: _Seat(names[(i - button) % len(seated)])
+            for i, player in enumerate(seated)
+        }
+        self._stage = "preflop"
+        self._raises = 0
+        self._opener = None
+        self._aggressor = None
+
+    def on_action(self, entry: Dict):
+        """One action_history entry: {"player", "action", "amount", "stage"}."""
+        name, action, stage = entry["player"], entry["action"], entry["stage"]
+        seat = self._seats.get(name)
+        if seat is None:
+            return
+        if stage != self._stage:
+            self._stage = stage
+            self._aggressor = None
+
+        aggressor = self._aggressor
+        if aggressor is not None and aggressor != name:
+            line = self._opponent(name, aggressor)
+            line.faced_bets += 1
+            if action == "fold":
+                line.folded += 1
+            elif action in AGGRESSIVE:
+                line.raised += 1
+            elif action in CALLS:
+                line.called += 1
+
+        if stage == "preflop":
+            if self._raises == 1 and not seat.three_bet_chance and name != self._opener:
+                seat.three_bet_chance = True
+                vs_open = self._opponent(name, self._opener)
+                vs_open.faced_opens += 1
+                if action in AGGRESSIVE:
+                    seat.three_bet = True
+                    vs_open.three_bets += 1
+            if action in AGGRESSIVE:
+                seat.vpip = seat.pfr = True
+                self._raises += 1
+                if self._raises == 1:
+                    self._opener = name
+            elif action in CALLS:
+                seat.vpip = True
+        elif action in AGGRESSIVE:
+            seat.aggressive += 1
+        elif action in CALLS:
+            seat.calls += 1
+
+        if action in AGGRESSIVE:
+            self._aggressor = name
+        elif action == "fold":
+            seat.folded_on = stage
+
+    def end_hand(self, result):
+        """Fold the finished hand (a HandResult) into the long-run counters."""
+        saw_flop = len(result.final_board) >= 3
+        for name, seat in self._seats.items():
+            for line in (self._line(self.players, name), self._line(self.positions, (name, seat.position))):
+                line.hands += 1
+                line.vpip += seat.vpip
+                line.pfr += seat.pfr
+                line.three_bet_chances += seat.three_bet_chance
+                line.three_bets += seat.three_bet
+                line.postflop_aggressive += seat.aggressive
+                line.postflop_calls += seat.calls
+                if saw_flop and seat.folded_on != "preflop":
+                    line.saw_flop += 1
+                    if result.showdown and seat.folded_on is None:
+                        line.showdowns += 1
+                        line.showdowns_won += name in result.winners
+        self.hands += 1
+        self._seats = {}
+
+    def _opponent(self, player: str, opponent: str) -> OpponentLine:
+        line = self.opponents.get((player, opponent))
+        if line is None:
+            line = self.opponents[(player, opponent)] = OpponentLine()
+        return line
+
+    @staticmethod
+    def _line(table: Dict, key) -> StatLine:
+        line = table.get(key)
+        if line is None:
+            line = table[key] = StatLine()
+        return line
+
+    # --- Queries ---
+
+    def summary(self, player: str) -> Optional[Dict]:
+        """A player's stats overall, by position and against each opponent."""
+        line = self.players.get(player)
+        if line is None:
+            return None
+        return {
+            "player": player,
+            **line.summary(),
+            "positions": {pos: stats.summary() for (name, pos), stats in self.positions.items() if name == player},
+            "opponents": {opp: stats.summary() for (name, opp), stats in self.opponents.items() if name == player}
+        }
+
+    def overview(self) -> Dict:
+        """Every player's headline stats."""
+        return {
+            "hands": self.hands,
+            "players": {name: line.summary() for name, line in self.players.items()}
+        }
+
+    def describe(self, player: str, viewer: Optional[str] = None) -> Optional[str]:
+        """
+        One prompt line about `player` (None until MIN_SAMPLE hands), plus
+        how they've treated `viewer`'s bets if there's any history.
+        """
+        line = self.players.get(player)
+        if line is None or line.hands < MIN_SAMPLE:
+            return None
+        s = line.summary()
+        parts = [f"VPIP {_pct(s['vpip'])}", f"PFR {_pct(s['pfr'])}", f"3-bet {_pct(s['three_bet'])}",
+                 f"AF {s['af']:.1f}" if s["af"] is not None else "AF -", f"WTSD {_pct(s['wtsd'])}"]
+        text = f"- {player} ({line.hands} hands): " + ", ".join(parts)
+        vs = self.opponents.get((player, viewer)) if viewer else None
+        if vs is not None and vs.faced_bets >= 5:
+            text += f"; folds to your bets {_pct(vs.summary()['fold_to_bet'])} ({vs.faced_bets})"
+        return text
+
+    # --- Persistence ---
+
+    def snapshot(self) -> Dict:
+        """Plain-data copy of the counters (cheap - take it on the game's thread, write it anywhere)."""
+        return {
+            "version": VERSION,
+            "hands": self.hands,
+            "players": {name: asdict(line) for name, line in self.players.items()},
+            "positions": [[name, pos, asdict(line)] for (name, pos), line in self.positions.items()],
+            "opponents": [[name, opp, asdict(line)] for (name, opp), line in self.opponents.items()]
+        }
+
+    def save(self, snapshot: Optional[Dict] = None):
+        """Atomically write a snapshot (taken now unless given) to self.path."""
+        if self.path is None:
+            return
+        snapshot = snapshot if snapshot is not None else self.snapshot()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(snapshot))
+        os.replace(tmp, self.path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path, None] = STATS_PATH) -> "StatsTracker":
+        """Tracker continuing from the counters saved at `path` (empty if there are none yet)."""
+        tracker = cls(path)
+        if tracker.path is None or not tracker.path.exists():
+            return tracker
+        try:
+            data = json.loads(tracker.path.read_text())
+        except (OSError, ValueError) as e:
+            print(f"[STATS] Could not read {tracker.path}, starting fresh: {e}")
+            return tracker
+        if data.get("version") != VERSION:
+            return tracker
+        tracker.hands = data["hands"]
+        tracker.players = {name: _restore(StatLine, line) for name, line in data["players"].items()}
+        tracker.positions = {(name, pos): _restore(StatLine, line) for name, pos, line in data["positions"]}
+        tracker.opponents = {(name, opp): _restore(OpponentLine, line) for name, opp, line in data["opponents"]}
+        return tracker
+
+
+def _restore(cls, values: Dict):
+    """Counters from a saved dict, ignoring fields this version doesn't know."""
+    known = {f.name for f in fields(cls)}
+    return cls(**{k: v for k, v in values.items() if k in known})
+
+
+def _pct(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.0%}"
+
+
+def open_stats_tracker() -> Optional[StatsTracker]:
+    """The tracker saved at PLAYER_STATS, or None if PLAYER_STATS is set to empty."""
+    return StatsTracker.load(STATS_PATH) if STATS_PATH else None
@@ -4,14 +4,19 @@ Sit & Go Tournament System
 Manages blind levels, eliminations, and tournament flow.
 """
 
+import random
 import time
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Callable
+from typing import List, Dict, Optional, Callable, Tuple
 from datetime import datetime
 
 from .game_engine import Player, PokerGame, Action
 
 
+# Sync decision function for headless runs: (game, player, valid_actions, rng) -> (Action, amount)
+Policy = Callable[[PokerGame, Player, List[Tuple[Action, int, int]], random.Random], Tuple[Action, int]]
+
+
 @dataclass
 class BlindLevel:
     """A blind level in the tournament."""
@@ -44,6 +49,8 @@ class TournamentConfig:
     """Tournament configuration."""
     starting_chips: int = 10000
     blind_structure: List[BlindLevel] = field(default_factory=lambda: DEFAULT_BLIND_STRUCTURE)
+    track_equity: bool = True  # Compute spectator win odds each street and on folds
+    use_clock: bool = True  # Level up on duration_minutes too (off for reproducible simulations)
 
 
 @dataclass
@@ -56,6 +63,10 @@ class HandResult:
     showdown: bool
     final_board: List[str]
     summary: str
+    pots: List[Dict] = field(default_factory=list)  # Main pot first: {"amount", "eligible", "winners"}
+    hole_cards: Dict[str, List] = field(default_factory=dict)  # Cards dealt to each player (Card objects)
+    actions: List[Dict] = field(default_factory=list)  # Full action history of the hand
+    blinds: Tuple[int, int, int] = (0, 0, 0)  # Small blind, big blind, ante
 
 
 @dataclass
@@ -74,8 +85,10 @@ class Tournament:
     Runs a complete tournament with 5 AI players.
     """
 
-    def __init__(self, player_names: List[str], config: TournamentConfig = None):
+    def __init__(self, player_names: List[str], config: TournamentConfig = None,
+                 rng: Optional[random.Random] = None):
         self.config = config or TournamentConfig()
+        self.rng = rng or random.Random()  # Deck shuffles (seed it to replay a tournament)
         self.players = [
             Player(name=name, chips=self.config.starting_chips)
             for name in player_names
@@ -85,6 +98,7 @@ class Tournament:
         self.level_start_time = time.time()
         self.tournament_start_time = None
         self.hand_number = 0
+        self.button_pos = 0  # Index into active_players() for the next hand
         self.hand_history: List[HandResult] = []
         self.game: Optional[PokerGame] = None
         self.eliminations: List[str] = []
@@ -96,7 +110,9 @@ class Tournament:
         self.on_elimination: Optional[Callable] = None
         self.on_level_up: Optional[Callable] = None
         self.on_tournament_complete: Optional[Callable] = None
-        self.on_community_cards: Optional[Callable] = None  # (stage, cards)
+        self.on_community_cards: Optional[Callable] = None  # (stage, cards, equities)
+        self.on_action: Optional[Callable] = None  # (action_history entry) as each action is applied
+        self.on_fold: Optional[Callable] = None  # (player name, equities) once a fold is applied and equities refreshed
 
     @property
     def current_blinds(self) -> BlindLevel:
@@ -115,12 +131,10 @@ class Tournament:
     def check_level_up(self):
         """Check if blinds should increase."""
         blinds = self.current_blinds
-        elapsed = time.time() - self.level_start_time
-
-        should_level = (
-            self.hands_at_level >= blinds.duration_hands or
-            elapsed >= blinds.duration_minutes * 60
-        )
+        should_level = self.hands_at_level >= blinds.duration_hands
+        if self.config.use_clock:
+            elapsed = time.time() - self.level_start_time
+            should_level = should_level or elapsed >= blinds.duration_minutes * 60
 
         if should_level and self.current_level < len(self.config.blind_structure) - 1:
             self.current_level += 1
@@ -146,8 +160,11 @@ class Tournament:
             players=self.players,
             small_blind=blinds.small_blind,
             big_blind=blinds.big_blind,
-            ante=blinds.ante
+            ante=blinds.ante,
+            rng=self.rng
         )
+        self.game.button_pos = self.button_pos % len(self.active_players())
+        self.game.on_action = self.on_action
         self.game.start_hand()
 
         if self.on_hand_start:
@@ -177,12 +194,17 @@ class Tournament:
             eliminations=eliminated_this_hand,
             showdown=len([p for p in self.game.active_players()]) > 1,
             final_board=[str(c) for c in self.game.state.community_cards],
-            summary=self._create_hand_summary(winners, eliminated_this_hand)
+            summary=self._create_hand_summary(winners, eliminated_this_hand),
+            pots=self.game.state.pots,
+            hole_cards={p.name: p.hole_cards for p in self.game.players
+                        if p.hole_cards and (p.is_active or p.name in eliminated_this_hand)},
+            actions=self.game.state.action_history,
+            blinds=(self.game.small_blind, self.game.big_blind, self.game.ante)
         )
         self.hand_history.append(result)
 
-        # Advance button
-        self.game.advance_button()
+        # Advance button (wraps over the remaining players at the next deal)
+        self.button_pos = self.game.button_pos + 1
 
         if self.on_hand_complete:
             self.on_hand_complete(result)
@@ -193,7 +215,13 @@ class Tournament:
         """Create human-readable hand summary."""
         lines = [f"Hand #{self.hand_number}"]
 
-        if len(winners) == 1:
+        pots = self.game.state.pots
+        if len(pots) > 1:
+            for i, pot in enumerate(pots):
+                label = "Main pot" if i == 0 else f"Side pot {i}"
+                names = ", ".join(pot.get("winners", []))
+                lines.append(f"{label} ${pot['amount']}: {names}")
+        elif len(winners) == 1:
             lines.append(f"{winners[0][0].name} wins ${winners[0][1]}")
         else:
             names = ", ".join(w[0].name for w in winners)
@@ -264,22 +292,52 @@ class TournamentRunner:
     High-level tournament runner with AI integration.
     """
 
-    def __init__(self, tournament: Tournament, get_ai_action: Callable):
+    def __init__(self, tournament: Tournament, get_ai_action: Optional[Callable] = None):
         """
         Args:
             tournament: Tournament instance
             get_ai_action: Callback to get AI action
                            Signature: (player_name, game_state, valid_actions, notes) -> (Action, amount)
+                           Not needed for run_tournament_sync.
         """
         self.tournament = tournament
         self.get_ai_action = get_ai_action
 
     async def run_hand(self) -> HandResult:
         """Run a single hand with AI players."""
+        hand = self._play_hand()
+        try:
+            player, valid_actions = next(hand)
+            while True:
+                game_state = self.tournament.game.get_game_state_for_player(player)
+                decision = await self.get_ai_action(player.name, game_state, valid_actions)
+                player, valid_actions = hand.send(decision)
+        except StopIteration as done:
+            return done.value
+
+    def run_hand_sync(self, policies: Dict[str, Policy]) -> HandResult:
+        """Run a single hand with synchronous policy functions (no asyncio, no state dicts)."""
+        hand = self._play_hand()
+        rng = self.tournament.rng
+        try:
+            player, valid_actions = next(hand)
+            game = self.tournament.game
+            while True:
+                decision = policies[player.name](game, player, valid_actions, rng)
+                player, valid_actions = hand.send(decision)
+        except StopIteration as done:
+            return done.value
+
+    def _play_hand(self):
+        """
+        Play one hand as a generator: yields (player, valid_actions) whenever a
+        decision is needed, expects (action, amount) sent back, returns the HandResult.
+        """
         game = self.tournament.start_hand()
+        self._update_equities(game)
 
         # Preflop betting
-        await self._run_betting_round(game)
+        yield from self._betting_round(game)
 
         # Continue through streets if multiple players remain
         while len([p for p in game.active_players() if not p.all_in]) > 1:
@@ -287,37 +345,42 @@ class TournamentRunner:
                 break
 
             game.deal_community()
+            self._update_equities(game)
             # Notify of community cards
             if self.tournament.on_community_cards:
                 cards = [str(c) for c in game.state.community_cards]
-                self.tournament.on_community_cards(game.state.stage, cards)
+                self.tournament.on_community_cards(game.state.stage, cards, game.state.equities)
             game.reset_betting_round()
-            await self._run_betting_round(game)
+            yield from self._betting_round(game)
 
         # If players remain but all-in, deal remaining cards
         while len(game.active_players()) > 1 and game.state.stage != "river":
             game.deal_community()
+            self._update_equities(game)
             # Notify of community cards
             if self.tournament.on_community_cards:
                 cards = [str(c) for c in game.state.community_cards]
-                self.tournament.on_community_cards(game.state.stage, cards)
+                self.tournament.on_community_cards(game.state.stage, cards, game.state.equities)
 
         # Showdown
         winners = game.determine_winners()
         return self.tournament.complete_hand(winners)
 
-    async def _run_betting_round(self, game: PokerGame):
-        """Run a betting round with AI decisions."""
-        # Determine action order
-        active = game.active_players()
+    def _update_equities(self, game: PokerGame):
+        """Refresh spectator equities if enabled (only matters with 2+ players in)."""
+        if self.tournament.config.track_equity and len(game.active_players()) > 1:
+            game.update_equities()
+
+    def _betting_round(self, game: PokerGame):
+        """Run a betting round, yielding to the caller for each decision."""
+        # Seats in the hand, in table order (folded players are skipped below)
+        active = game.players_in_tournament()
         if not active:
             return
 
-        # Start after big blind for preflop, or from button+1 for other streets
-        start_idx = 0
-        if game.state.stage == "preflop":
-            # UTG (after BB) acts first preflop
-            start_idx = 3 % len(active) if len(active) > 2 else 0
+        # UTG (after BB) acts first preflop, first seat left of the button after that
+        offset = 3 if game.state.stage == "preflop" else 1
+        start_idx = (game.button_pos + offset) % len(active)
 
         acted = set()
         current_idx = start_idx
@@ -329,7 +392,7 @@ class TournamentRunner:
             # Skip folded/all-in players
             if player.folded or player.all_in:
                 current_idx += 1
-                if current_idx >= len(active) * 2:  # Safety
+                if current_idx - start_idx >= len(active) * 2:  # Safety
                     break
                 continue
 
@@ -343,17 +406,16 @@ class TournamentRunner:
                 current_idx += 1
                 continue
 
-            # Get AI decision
-            game_state = game.get_game_state_for_player(player)
-            action, amount = await self.get_ai_action(
-                player.name,
-                game_state,
-                valid_actions
-            )
+            # Get decision from the driver
+            action, amount = yield player, valid_actions
 
             # Apply action
             game.apply_action(player, action, amount)
             acted.add(player.name)
+            if action == Action.FOLD:
+                self._update_equities(game)
+                if self.tournament.on_fold:
+                    self.tournament.on_fold(player.name, game.state.equities)
 
             # Track raises for round completion
             if action in [Action.BET, Action.RAISE, Action.ALL_IN]:
@@ -364,7 +426,7 @@ class TournamentRunner:
             current_idx += 1
 
             # Safety check for infinite loops
-            if current_idx >= len(active) * 10:
+            if current_idx - start_idx >= len(active) * 10:
                 break
 
     async def run_tournament(self) -> TournamentResult:
@@ -380,3 +442,17 @@ class TournamentRunner:
             self.tournament.on_tournament_complete(results)
 
         return results
+
+    def run_tournament_sync(self, policies: Dict[str, Policy]) -> TournamentResult:
+        """Run a complete tournament headless, one policy function per player name."""
+        self.tournament.start_tournament()
+
+        while not self.tournament.is_complete():
+            self.run_hand_sync(policies)
+
+        results = self.tournament.get_final_results()
+
+        if self.tournament.on_tournament_complete:
+            self.tournament.on_tournament_complete(results)
+
+        return results
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Token and Cost Accounting
+What the LLM calls cost: tokens as the provider reported them (estimated
+from the text when it doesn't), prompt-cache hits, retries and latency,
+priced per model.
+
+Agents keep a Usage per call kind ("decision", "reflection"); the
+AIPlayerManager diffs their running totals per hand and per tournament.
+
+Prices are list prices per million tokens and drift - override them with
+LLM_PRICES='{"model": [input, cached_input, output], ...}'.
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Dict, Optional, Tuple
+
+
+CHARS_PER_TOKEN = 4  # Estimate when a provider reports no usage (tokenizers differ anyway)
+
+# USD per 1M tokens: (input, cached input, output)
+PRICES: Dict[str, Tuple[float, float, float]] = {
+    "grok-4-1-fast": (0.20, 0.05, 0.50),
+    "gpt-4-turbo-preview": (10.00, 10.00, 30.00),
+    "deepseek-chat": (0.28, 0.028, 0.42),
+    "gemini-2.5-flash-lite": (0.10, 0.025, 0.40),
+    "qwen3-235b": (0.0, 0.0, 0.0),  # Self-hosted
+}
+PRICES.update({model: tuple(price) for model, price in json.loads(os.getenv("LLM_PRICES") or "{}").items()})
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def token_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+    """USD for one call (0 for models without a price)."""
+    price_in, price_cached, price_out = PRICES.get(model, (0.0, 0.0, 0.0))
+    fresh = max(0, prompt_tokens - cached_tokens)
+    return (fresh * price_in + cached_tokens * price_cached + completion_tokens * price_out) / 1_000_000
+
+
+@dataclass
+class Usage:
+    """Call and token counters - for one kind of call, a player, a hand or a tournament."""
+    calls: int = 0
+    failed: int = 0            # Calls that ended in an error (their tokens, if billed, aren't known)
+    retries: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0     # Of prompt_tokens, read from the provider's prompt cache
+    completion_tokens: int = 0
+    estimated: int = 0         # Calls whose provider sent no usage - tokens estimated from the text
+    latency: float = 0.0       # Seconds, summed over calls
+    cost: float = 0.0          # USD at PRICES
+
+    def add(self, other: "Usage") -> "Usage":
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+        return self
+
+    def since(self, earlier: Optional["Usage"]) -> "Usage":
+        """What was added after `earlier` (a copy taken from these same counters)."""
+        if earlier is None:
+            return replace(self)
+        return Usage(**{f.name: getattr(self, f.name) - getattr(earlier, f.name) for f in fields(self)})
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def summary(self) -> Dict:
+        return {
+            **asdict(self),
+            "latency": round(self.latency, 3),
+            "cost": round(self.cost, 6),
+            "total_tokens": self.total_tokens,
+            "mean_latency": round(self.latency / self.calls, 3) if self.calls else None,
+            "cache_hit_rate": round(self.cached_tokens / self.prompt_tokens, 3) if self.prompt_tokens else None
+        }
+
+
+def total(usages) -> Usage:
+    """Sum of some Usage counters."""
+    result = Usage()
+    for usage in usages:
+        result.add(usage)
+    return result
@@ -8,9 +8,11 @@ import os
 import sys
 import asyncio
 import json
+import random
+import secrets
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # Add project to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -20,17 +22,19 @@ load_dotenv(os.path.expanduser("~/.env.keys"))
 
 from core import (
     Tournament, TournamentConfig, TournamentRunner,
-    AIPlayerManager, Action, AIDecision
+    AIPlayerManager, Action, AIDecision, open_history_store, open_stats_tracker
 )
-from agents import create_all_agents
+from core.stats import PROMPT_STATS
+from core.preflop import get_preflop_table
+from agents import create_all_agents, decision_stats, provider_stats
 
 # Import broadcast functions for WebSocket updates
 try:
     from api import (
-        broadcast_hand_start, broadcast_hole_cards, broadcast_action,
+        broadcast_hand_start, broadcast_hole_cards, broadcast_action, broadcast_action_text,
         broadcast_community_cards, broadcast_hand_result,
         broadcast_elimination, broadcast_blinds_up, broadcast_tournament_end,
-        broadcast_tournament_start, update_player_chips
+        broadcast_tournament_start, update_player_chips, close_broker
     )
     WEBSOCKET_ENABLED = True
     print("[RUN_TOURNAMENT] WebSocket broadcasts ENABLED")
@@ -39,6 +43,10 @@ except ImportError as e:
     print(f"[RUN_TOURNAMENT] WebSocket broadcasts DISABLED: {e}")
 
 
+STATS_SAVE_EVERY = 25  # Hands between stats saves (and once per tournament)
+TOURNAMENT_SEED = os.getenv("TOURNAMENT_SEED")  # Seeds deck shuffles - with LLM_BACKEND=mock, a replayable tournament
+
+
 class PokerArena:
     """
     Main poker arena controller.
@@ -51,15 +59,24 @@ class PokerArena:
         self.tournament_history = []
         self.hand_number = 0
         self.current_game = None  # Reference to current game for pot/chips tracking
+        self.history = open_history_store()  # Every hand to SQLite (None if HISTORY_DB is empty)
+        self.tournament_id = None
+        self.stats = open_stats_tracker()  # Long-run VPIP/PFR/... (None if PLAYER_STATS is empty)
+        self._stats_save: Optional[asyncio.Task] = None
+        self._pending_fold: Optional[Tuple] = None  # Fold broadcast waiting for on_fold (player, decision, pot, chips)
 
         # Initialize agents
         self._setup_agents()
+        if self.stats and PROMPT_STATS:
+            for player in self.manager.players.values():
+                player.stats = self.stats
 
     def _setup_agents(self):
         """Set up all AI players."""
         agents = create_all_agents()
         for agent in agents:
             self.manager.register_player(agent)
+            agent.on_decision_text = self.on_decision_text
             print(f"[ARENA] Registered: {agent.name} ({agent.model_name})")
 
     async def get_ai_action(
@@ -85,28 +102,73 @@ class PokerArena:
             # Get current pot and player chips from game
             pot = 0
             player_chips = {}
+            equities = None
             if self.current_game:
                 pot = self.current_game.state.pot if hasattr(self.current_game, 'state') else 0
                 player_chips = {p.name: p.chips for p in self.current_game.players if p.is_active}
+                equities = self.current_game.state.equities or None
+
+            if equities and decision.action == Action.FOLD:
+                # A fold changes the odds - broadcast from on_fold, with the equities the runner refreshes
+                self._pending_fold = (player_name, decision, pot, player_chips)
+            else:
+                asyncio.create_task(broadcast_action(
+                    player_name,
+                    action_str,
+                    decision.amount,
+                    decision.reasoning,
+                    decision.inner_thoughts,
+                    decision.trash_talk,
+                    None,  # trash_talk_target
+                    pot,
+                    player_chips,
+                    equities
+                ))
+
+        return (decision.action, decision.amount)
 
-            asyncio.create_task(broadcast_action(
+    def on_fold(self, player_name: str, equities: Optional[Dict[str, float]]):
+        """Called once a fold is applied: broadcast it with the odds as they now stand."""
+        pending, self._pending_fold = self._pending_fold, None
+        if not WEBSOCKET_ENABLED or pending is None or pending[0] != player_name:
+            return
+        _, decision, pot, player_chips = pending
+        remaining = [p.name for p in self.current_game.active_players()]
+        if len(remaining) == 1:
+            equities = {remaining[0]: 1.0}  # Hand over - the runner only refreshes with 2+ players in
+        asyncio.create_task(broadcast_action(
+            player_name,
+            "fold",
+            decision.amount,
+            decision.reasoning,
+            decision.inner_thoughts,
+            decision.trash_talk,
+            None,  # trash_talk_target
+            pot,
+            player_chips,
+            equities or None
+        ))
+
+    def on_decision_text(self, player_name: str, decision: AIDecision, final: bool):
+        """Text of a streamed decision, arriving after the action was played."""
+        if final and decision.reasoning:
+            print(f"    [{player_name}] \"{decision.reasoning}\"")
+        if WEBSOCKET_ENABLED:
+            asyncio.create_task(broadcast_action_text(
                 player_name,
-                action_str,
-                decision.amount,
                 decision.reasoning,
                 decision.inner_thoughts,
                 decision.trash_talk,
-                None,  # trash_talk_target
-                pot,
-                player_chips
+                final
             ))
 
-        return (decision.action, decision.amount)
-
     def on_hand_start(self, hand_number: int, game):
         """Called when a new hand starts."""
         self.hand_number = hand_number
         self.current_game = game  # Store reference for pot/chips tracking
+        self.manager.begin_hand(hand_number)
+        if self.stats:
+            self.stats.start_hand(game)
         print(f"\n{'='*50}")
         print(f"HAND #{hand_number}")
         print(f"Blinds: {game.small_blind}/{game.big_blind}")
@@ -162,11 +224,32 @@ class PokerArena:
                 if p.is_active and p.hole_cards:
                     player_cards[p.name] = [str(c) for c in p.hole_cards]
             if player_cards:
-                asyncio.create_task(broadcast_hole_cards(player_cards, deal_order))
+                asyncio.create_task(broadcast_hole_cards(
+                    player_cards, deal_order, self._preflop_equities(game)
+                ))
+
+    def _preflop_equities(self, game) -> Optional[Dict[str, float]]:
+        """Each dealt hand's equity vs random hands, from the preflop table (if built)."""
+        table = get_preflop_table()
+        if table is None:
+            return None
+        dealt = [p for p in game.players if p.is_active and p.hole_cards]
+        return {p.name: table.class_equity(p.hole_cards, len(dealt)) for p in dealt}
 
     def on_hand_complete(self, result):
         """Called when a hand completes."""
         print(f"\n{result.summary}")
+        usage = self.manager.end_hand()
+        if usage and usage["total"]["calls"]:
+            u = usage["total"]
+            print(f"  [USAGE] {u['calls']} calls, {u['prompt_tokens']:,} in / {u['completion_tokens']:,} out tokens, "
+                  f"${u['cost']:.4f}")
+        if self.history:
+            self.history.record_hand(self.tournament_id, result)
+        if self.stats:
+            self.stats.end_hand(result)
+            if result.hand_number % STATS_SAVE_EVERY == 0:
+                self._save_stats()
 
         # Broadcast to WebSocket
         if WEBSOCKET_ENABLED:
@@ -174,7 +257,9 @@ class PokerArena:
                 result.winners[0] if result.winners else "Unknown",
                 result.pot,
                 result.final_board,
-                result.summary
+                result.summary,
+                None,  # showdown_cards
+                result.pots
             ))
 
     def on_elimination(self, name: str, place: int):
@@ -198,13 +283,16 @@ class PokerArena:
                 level, blinds.small_blind, blinds.big_blind, blinds.ante
             ))
 
-    def on_community_cards(self, stage: str, cards: list):
+    def on_community_cards(self, stage: str, cards: list, equities: dict = None):
         """Called when community cards are dealt."""
         print(f"  [BOARD] {stage.upper()}: {' '.join(cards)}")
+        if equities:
+            odds = ", ".join(f"{name} {eq:.0%}" for name, eq in equities.items())
+            print(f"  [ODDS] {odds}")
 
         # Broadcast to WebSocket
         if WEBSOCKET_ENABLED:
-            asyncio.create_task(broadcast_community_cards(cards, stage))
+            asyncio.create_task(broadcast_community_cards(cards, stage, equities))
 
     def on_tournament_complete(self, results):
         """Called when tournament ends."""
@@ -217,6 +305,11 @@ class PokerArena:
         print("\nFinal Standings:")
         for standing in results.final_standings:
             print(f"  {standing['place']}. {standing['name']}")
+        self._print_provider_stats()
+        if self.history:
+            self.history.record_tournament(self.tournament_id, [s["name"] for s in results.final_standings],
+                                           winner=results.winner, standings=results.final_standings,
+                                           total_hands=results.total_hands)
 
         # Broadcast to WebSocket
         if WEBSOCKET_ENABLED:
@@ -238,6 +331,10 @@ class PokerArena:
         # Get player names from registered agents
         player_names = list(self.manager.players.keys())
         print(f"Players: {', '.join(player_names)}")
+        self.tournament_id = f"{datetime.now():%Y%m%d_%H%M%S}_{secrets.token_hex(3)}"
+        self.manager.start_tournament()
+        if self.history:
+            self.history.record_tournament(self.tournament_id, player_names)
 
         # Broadcast tournament start to WebSocket clients
         if WEBSOCKET_ENABLED:
@@ -248,7 +345,8 @@ class PokerArena:
 
         # Create tournament
         config = TournamentConfig(starting_chips=10000)
-        tournament = Tournament(player_names, config)
+        rng = random.Random(int(TOURNAMENT_SEED)) if TOURNAMENT_SEED else None
+        tournament = Tournament(player_names, config, rng)
 
         # Set up callbacks
         tournament.on_hand_start = self.on_hand_start
@@ -257,6 +355,9 @@ class PokerArena:
         tournament.on_level_up = self.on_level_up
         tournament.on_tournament_complete = self.on_tournament_complete
         tournament.on_community_cards = self.on_community_cards
+        tournament.on_fold = self.on_fold
+        if self.stats:
+            self.stats.attach(tournament)
 
         # Create runner
         runner = TournamentRunner(tournament, self.get_ai_action)
@@ -266,9 +367,11 @@ class PokerArena:
 
         # Update notes for all players after tournament
         await self._post_tournament_reflection(tournament, results)
+        await self.manager.flush_notes()
 
         # Save results
         self._save_results(results)
+        await self.flush_stats()
 
         return results
 
@@ -303,6 +406,78 @@ class PokerArena:
             except Exception as e:
                 print(f"[{name}] Post-tournament reflection failed: {e}")
 
+    async def aclose(self):
+        """Close agent HTTP connections and flush queued hand history and broker events."""
+        await self.manager.aclose()
+        if self.history:
+            await asyncio.to_thread(self.history.close)
+        if self._stats_save:
+            await self._stats_save
+        if WEBSOCKET_ENABLED:
+            await close_broker()
+
+    def _save_stats(self):
+        """Write the stats counters in the background (skipped while a write is still running)."""
+        if self.stats and (self._stats_save is None or self._stats_save.done()):
+            self._stats_save = asyncio.create_task(asyncio.to_thread(self.stats.save, self.stats.snapshot()))
+
+    async def flush_stats(self):
+        """Write the stats counters as they are now."""
+        if self._stats_save:
+            await self._stats_save
+        if self.stats:
+            await asyncio.to_thread(self.stats.save, self.stats.snapshot())
+
+    def _print_provider_stats(self):
+        """Per agent: how often the local policy played; per LLM provider: retries, failures, breaker state."""
+        agents = decision_stats()
+        if agents:
+            print("\nDecision clock:")
+            for name, d in agents.items():
+                if d["decisions"]:
+                    print(f"  {name}: {d['fallbacks']}/{d['decisions']} fallbacks ({d['fallback_rate']:.0%}; "
+                          f"deadline {d['deadline']}, breaker {d['circuit_open']}, unparseable {d['parse_errors']}, errors {d['errors']}), "
+                          f"avg {d['mean_seconds']:.1f}s, max {d['max_seconds']:.1f}s")
+        prompts = {name: player.prompt_stats.summary() for name, player in self.manager.players.items()
+                   if hasattr(player, "prompt_stats")}
+        if any(p["decisions"] for p in prompts.values()):
+            print("\nPrompt tokens per decision (estimated; prefix = cached system prompt):")
+            for name, p in prompts.items():
+                if p["decisions"]:
+                    largest = sorted(p["per_decision"].items(), key=lambda item: -item[1])[:3]
+                    print(f"  {name}: {p['prefix_tokens']:.0f} prefix + {p['suffix_tokens']:.0f} per-decision, "
+                          f"prefix rebuilt {p['prefix_builds']}x; largest: "
+                          + ", ".join(f"{section} {count:.0f}" for section, count in largest))
+        self._print_usage()
+        providers = provider_stats()
+        if not providers:
+            return
+        print("\nProviders:")
+        for name, p in providers.items():
+            latency = f"{p['mean_latency']:.1f}s" if p["mean_latency"] is not None else "-"
+            print(f"  {name}: {p['successes']}/{p['calls']} ok, {p['retries']} retries, "
+                  f"{p['rate_limited']} rate-limited, {p['timeouts']} timeouts, "
+                  f"{p['breaker_rejections']} fast-failed, avg {latency} [{p['breaker']}]")
+
+    def _print_usage(self):
+        """Tokens and cost per player for this tournament (reflections after it aren't in yet)."""
+        usage = self.manager.usage_summary()
+        if not usage["total"]["calls"]:
+            return
+        print("\nToken usage:")
+        for name, u in usage["players"].items():
+            t = u["total"]
+            if not t["calls"]:
+                continue
+            cached = f", {t['cache_hit_rate']:.0%} cached" if t["cache_hit_rate"] else ""
+            estimated = f", {t['estimated']} estimated" if t["estimated"] else ""
+            print(f"  {name} ({u['model']}): {t['calls']} calls ({t['failed']} failed, {t['retries']} retries), "
+                  f"{t['prompt_tokens']:,} in{cached} / {t['completion_tokens']:,} out{estimated}, ${t['cost']:.4f}")
+        t = usage["total"]
+        print(f"  Total: {t['total_tokens']:,} tokens, ${t['cost']:.4f}"
+              + (f" (${usage['cost_per_hand']:.4f} and {usage['tokens_per_hand']:,.0f} tokens per hand)"
+                 if usage["hands"] else ""))
+
     def _save_results(self, results):
         """Save tournament results to file."""
         results_dir = Path(__file__).parent / "results"
@@ -317,7 +492,14 @@ class PokerArena:
             "final_standings": results.final_standings,
             "total_hands": results.total_hands,
             "duration_seconds": results.duration_seconds,
-            "hand_summaries": [h.summary for h in results.hand_history]
+            "hand_summaries": [h.summary for h in results.hand_history],
+            "providers": provider_stats(),
+            "decision_clock": {name: player.decision_stats.summary()
+                               for name, player in self.manager.players.items() if hasattr(player, "decision_stats")},
+            "prompt_tokens": {name: player.prompt_stats.summary()
+                              for name, player in self.manager.players.items() if hasattr(player, "prompt_stats")},
+            "usage": self.manager.usage_summary(),
+            "usage_by_hand": self.manager.hand_usage
         }
 
         with open(filename, "w") as f:
@@ -335,7 +517,10 @@ async def main():
     print("Notes persist across tournaments - AIs will learn over time.\n")
 
     # Run a single tournament for now
-    results = await arena.run_tournament()
+    try:
+        results = await arena.run_tournament()
+    finally:
+        await arena.aclose()
 
     return results
 
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+AI Poker Arena - Broadcast Serialization Benchmark
+===================================================
+Events/sec delivered to every viewer when each connection re-encodes the
+event with json.dumps (what send_json per connection did) vs encoding once
+with the fastest available encoder and sharing the frame
+(ConnectionManager.broadcast). Both go through the same per-viewer queues,
+so the difference is serialization alone.
+
+Usage:
+    python bench_broadcast.py                     # 1k and 10k connections
+    python bench_broadcast.py --connections 1000 5000 20000 --events 50
+
+Connections are in-process fakes whose send is a no-op, so the numbers are
+the server-side CPU cost of fan-out (encoding + queueing + writer tasks).
+Run with orjson uninstalled to see the stdlib json numbers.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.connections import ORJSON_AVAILABLE, ClientConnection, Frame, encode_event
+from api.server import ConnectionManager
+
+
+class NullSocket:
+    """Accepts frames instantly and counts them."""
+
+    def __init__(self, counter: "Counter"):
+        self.counter = counter
+
+    async def send_text(self, text: str):
+        self.counter.tick()
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+class Counter:
+    """Frames delivered across all sockets; fires once the target is hit."""
+
+    def __init__(self, target: int):
+        self.target = target
+        self.sent = 0
+        self.done = asyncio.Event()
+
+    def tick(self):
+        self.sent += 1
+        if self.sent >= self.target:
+            self.done.set()
+
+
+class PerClientEncodeManager(ConnectionManager):
+    """The old behavior: send_json ran stdlib json.dumps once per viewer."""
+
+    async def broadcast(self, message: dict):
+        for client in list(self.clients.values()):
+            text = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+            client.enqueue(Frame(message.get("type"), None, text))
+
+
+def action_event(i: int) -> dict:
+    """A typical action event (the most frequent broadcast)."""
+    return {
+        "type": "action",
+        "timestamp": "2026-01-01T12:00:00.000000",
+        "data": {
+            "player": "Grok",
+            "action": "raise",
+            "amount": 600 + i,
+            "reasoning": "Position and fold equity - the blinds have been folding to steals.",
+            "inner_thoughts": "GPT-4 has folded to three raises in a row. Keep the pressure on.",
+            "trash_talk": "You can't fold your way to a bracelet.",
+            "trash_talk_target": "GPT-4",
+            "pot": 1400 + i,
+            "player_chips": {"Grok": 9400, "GPT-4": 10200, "DeepSeek": 9800, "Gemini": 10600, "Qwen": 10000},
+            "equities": {"Grok": 0.41, "GPT-4": 0.33, "Gemini": 0.26}
+        }
+    }
+
+
+async def measure(manager_class, connections: int, events: int) -> float:
+    """Events/sec until every connection has been sent every event."""
+    manager = manager_class()
+    counter = Counter(connections * events)
+    for _ in range(connections):
+        sock = NullSocket(counter)
+        manager.clients[sock] = ClientConnection(sock, manager._on_client_closed, max_queue=events + 1)
+
+    start = time.perf_counter()
+    for i in range(events):
+        await manager.broadcast(action_event(i))
+    await counter.done.wait()
+    rate = events / (time.perf_counter() - start)
+
+    for client in list(manager.clients.values()):
+        client.close()
+    await asyncio.sleep(0)
+    return rate
+
+
+def encode_rate(events: int) -> float:
+    """Raw encoder throughput, for reference."""
+    messages = [action_event(i) for i in range(events)]
+    start = time.perf_counter()
+    for message in messages:
+        encode_event(message)
+    return events / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark broadcast serialization")
+    parser.add_argument("--connections", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--events", type=int, default=100, help="Events per measurement")
+    args = parser.parse_args()
+
+    encoder = "orjson" if ORJSON_AVAILABLE else "json"
+    print(f"Encoder: {encoder} ({encode_rate(10_000):,.0f} encodes/sec), {args.events} action events\n")
+    print(f"  {'connections':>11} {'json per client':>18} {'encode once':>15} {'speedup':>8}")
+    for connections in args.connections:
+        old = asyncio.run(measure(PerClientEncodeManager, connections, args.events))
+        new = asyncio.run(measure(ConnectionManager, connections, args.events))
+        print(f"  {connections:>11,} {old:>13,.1f} ev/s {new:>10,.1f} ev/s {new / old:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
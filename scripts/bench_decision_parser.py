@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+AI Poker Arena - Decision Parser Check & Benchmark
+===================================================
+Runs core/decision_parser.py over a corpus of malformed replies seen from
+the models (code fences, chatter, trailing commas, braces and quotes in
+the reasoning, replies cut off by the token limit), then over randomly
+generated ones where the right answer is known, then times parses/sec
+against the old brace-counting parser from AIPlayer._parse_decision.
+
+Usage:
+    python bench_decision_parser.py
+    python bench_decision_parser.py --fuzz 20000 --seconds 2 --seed 7
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.decision_parser import ACTION_NAMES, parse_decision
+from core.game_engine import Action
+
+# (reply, expected action or error kind, expected amount)
+CORPUS = [
+    ('{"action": "call", "amount": 0, "reasoning": "Pot odds are fine."}', "call", 0),
+    ('```json\n{"action": "raise", "amount": 300, "reasoning": "Value."}\n```', "raise", 300),
+    ('```\n{"action": "fold", "amount": 0, "reasoning": "Too weak."}\n```\nLet me know!', "fold", 0),
+    ('\ufeff{"action": "check", "amount": 0, "reasoning": "Free card."}', "check", 0),
+    ('Here is my decision:\n{"action": "bet", "amount": 150, "reasoning": "C-bet."}', "bet", 150),
+    ('{"action": "raise", "amount": 600, "reasoning": "Squeeze.",}', "raise", 600),
+    ('{\n  "action": "call",\n  "amount": 0,\n  "reasoning": "Set mining.",\n}', "call", 0),
+    ('{"action": "call", "amount": 0, "reasoning": "Range is {AA, KK} or air"}', "call", 0),
+    ('{"action": "fold", "amount": 0, "reasoning": "He said \\"I have it\\" and I believe him }"}', "fold", 0),
+    ('{"action": "bet", "amount": 200, "reasoning": "Backslash \\\\ then brace }"}', "bet", 200),
+    ('{"action": "raise", "amount": 450, "reasoning": "Pressure on the short stack, he has been fold', "raise", 450),
+    ('{"action": "call", "amount": 0, "reasoning": "Odds", "inner_thoughts": "He is weak", "trash_', "call", 0),
+    ('{"action": "check", "amount": 0, "reasoning": "Pot control", "inner_thoughts":', "check", 0),
+    ('{"action": "call", "amount": 0, "reasoning": "Odds",', "call", 0),
+    ('{"action": "bet", "amount": 120, "reasoning": "Thin value \\u00', "bet", 120),
+    ('{"action": "raise", "amount": 4', "raise", 0),  # Can't tell 4 from 400 - drop it
+    ('{"action": "all-in", "amount": 2400, "reasoning": "Shove."}', "all_in", 2400),
+    ('{"action": "ALL IN", "amount": 2400}', "all_in", 2400),
+    ('{"action": "Raise", "amount": "900", "reasoning": "String amount."}', "raise", 900),
+    ('{"action": "raise", "amount": "1,200 chips", "reasoning": "Formatted."}', "raise", 1200),
+    ('{"action": "bet", "amount": 250.0, "reasoning": "Float."}', "bet", 250),
+    ('{"action": "call", "amount": null, "reasoning": "Null amount."}', "call", 0),
+    ('{"action": "call", "amount": 0, "reasoning": "Extra", "notes": {"villain": ["loose", "{tilted}"]}}', "call", 0),
+    ('Thinking {carefully} about it... {"action": "fold", "amount": 0, "reasoning": "Dominated."}', "fold", 0),
+    ('{"action": "check", "amount": 0}\n\nI checked because {reasons}.', "check", 0),
+    ('{"action": "call", "amount": 0, "reasoning": "Two objects"} {"action": "fold"}', "call", 0),
+    ('I will fold this hand.', "no_object", 0),
+    ('', "empty", 0),
+    ('{"amount": 300, "reasoning": "Forgot the action."}', "no_action", 0),
+    ('{"action": "shove", "amount": 2400}', "unknown_action", 0),
+    ("{'action': 'call', 'amount': 0}", "invalid_json", 0),
+]
+
+TRICKY = ['{', '}', '[', ']', '"', '\\', ',', ':', '```', '{"action": "fold"}', '\\n', '\u00e9', '\u2660', '  ']
+WORDS = "pot odds villain range river turn flop bluff value fold equity stack position".split()
+
+
+def legacy_parse(response: str):
+    """AIPlayer._parse_decision before core/decision_parser.py (prints removed) - the baseline."""
+    try:
+        response = response.strip()
+        response = response.lstrip('\ufeff\u200b\u200c\u200d\u2060\u00a0')
+        response = re.sub(r'^```json\s*', '', response, flags=re.IGNORECASE)
+        response = re.sub(r'^```\s*', '', response)
+        response = re.sub(r'\s*```$', '', response)
+        response = response.strip()
+
+        start = response.find('{')
+        if start != -1:
+            depth = 0
+            end = start
+            found_closing = False
+            for i in range(start, len(response)):
+                if response[i] == '{':
+                    depth += 1
+                elif response[i] == '}':
+                    depth -= 1
+                    if depth == 0:
+                        end = i + 1
+                        found_closing = True
+                        break
+
+            json_str = response[start:end]
+            if not found_closing:
+                json_str += '}'
+            json_str = re.sub(r',\s*}', '}', json_str)
+            json_str = re.sub(r',\s*]', ']', json_str)
+            json_str = re.sub(r',\s*"[^"]*$', '}', json_str)
+
+            data = json.loads(json_str)
+            action = ACTION_NAMES.get(data.get('action', 'fold').lower(), Action.FOLD)
+            return action, int(data.get('amount', 0))
+    except Exception:
+        pass
+    return Action.FOLD, 0
+
+
+def expected_ok(parsed, want: str, amount: int) -> bool:
+    if want in ACTION_NAMES:
+        return parsed.ok and parsed.action == ACTION_NAMES[want] and parsed.amount == amount
+    return parsed.error is not None and parsed.error.kind == want and parsed.action == Action.FOLD
+
+
+def random_text(rng: random.Random) -> str:
+    return " ".join(rng.choice(TRICKY) if rng.random() < 0.25 else rng.choice(WORDS)
+                    for _ in range(rng.randint(0, 30)))
+
+
+def random_reply(rng: random.Random):
+    """(reply text, decision dict, offset after which a cut leaves action and amount whole)."""
+    decision = {
+        "action": rng.choice(["fold", "check", "call", "bet", "raise", "all_in"]),
+        "amount": rng.choice([0, 40, 150, 600, 2400, 12000]),
+        "reasoning": random_text(rng),
+        "inner_thoughts": random_text(rng),
+        "trash_talk": random_text(rng),
+    }
+    body = json.dumps(decision, indent=rng.choice([None, 2, 4]), ensure_ascii=rng.random() < 0.5)
+    if rng.random() < 0.3:  # Trailing comma
+        body = body[:body.rfind('"') + 1] + ",\n}"
+    prefix = rng.choice(["", "```json\n", "```\n", "Here's my move:\n", "\ufeff", "Range {AA, KK}: "])
+    suffix = rng.choice(["", "\n```", "\n```\nGood luck {everyone}!", " That's it."])
+    reply = prefix + body + suffix
+    amount_end = len(prefix) + body.index('"reasoning"')
+    return reply, decision, amount_end
+
+
+def fuzz(count: int, seed: int) -> int:
+    """Random replies, whole and cut at every kind of point. Returns failures."""
+    rng = random.Random(seed)
+    failures = 0
+    for n in range(count):
+        reply, want, safe = random_reply(rng)
+        truncated = n % 2 == 1
+        if truncated:
+            reply = reply[:rng.randint(safe, len(reply))]
+        try:
+            parsed = parse_decision(reply)
+        except Exception as e:  # Must never raise
+            failures += 1
+            print(f"  RAISED {type(e).__name__}: {e}\n    {reply!r}")
+            continue
+        ok = parsed.ok and parsed.action == ACTION_NAMES[want["action"]] and parsed.amount == want["amount"]
+        if truncated:
+            ok = ok and want["reasoning"].startswith(parsed.reasoning)
+        else:
+            ok = ok and parsed.reasoning == want["reasoning"] and parsed.trash_talk == want["trash_talk"]
+        if not ok:
+            failures += 1
+            if failures <= 5:
+                print(f"  FAIL {parsed}\n    {reply!r}")
+
+    # Cut anywhere (including inside "action"/"amount"): never raises, always a decision
+    for _ in range(count):
+        reply, _, _ = random_reply(rng)
+        try:
+            parse_decision(reply[:rng.randint(0, len(reply))])
+        except Exception as e:
+            failures += 1
+            print(f"  RAISED on arbitrary cut {type(e).__name__}: {e}")
+    return failures
+
+
+def rate(parse, replies, seconds: float) -> float:
+    """Parses per second over `replies`, repeated for about `seconds`."""
+    done, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for reply in replies:
+            parse(reply)
+        done += len(replies)
+    return done / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the LLM decision parser")
+    parser.add_argument("--fuzz", type=int, default=5000, help="Random replies to check")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Timing per benchmark row")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print("\nCorpus:")
+    failures = legacy_right = 0
+    for reply, want, amount in CORPUS:
+        parsed = parse_decision(reply)
+        ok = expected_ok(parsed, want, amount)
+        failures += not ok
+        if want in ACTION_NAMES:
+            legacy_right += legacy_parse(reply) == (ACTION_NAMES[want], amount)
+        else:
+            legacy_right += legacy_parse(reply) == (Action.FOLD, 0)
+        if not ok:
+            print(f"  FAIL {reply[:60]!r}: {parsed}")
+    print(f"  {len(CORPUS) - failures}/{len(CORPUS)} right (old parser: {legacy_right}/{len(CORPUS)})")
+
+    print(f"\nFuzz ({args.fuzz} whole/cut replies + {args.fuzz} arbitrary cuts):")
+    fuzz_failures = fuzz(args.fuzz, args.seed)
+    failures += fuzz_failures
+    print(f"  {fuzz_failures} failures")
+
+    rng = random.Random(args.seed)
+    clean = [json.dumps(random_reply(rng)[1]) for _ in range(200)]
+    messy = [reply for reply, _, _ in CORPUS] + [random_reply(rng)[0][:-rng.randint(1, 40)] for _ in range(100)]
+    print(f"\n  {'parses/sec':<22} {'old':>10} {'new':>10}")
+    for label, replies in (("well-formed", clean), ("malformed/truncated", messy)):
+        old = rate(legacy_parse, replies, args.seconds)
+        new = rate(parse_decision, replies, args.seconds)
+        print(f"  {label:<22} {old:>10,.0f} {new:>10,.0f}  ({new / old:.1f}x)")
+
+    print(f"\nDone - {failures} failures")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
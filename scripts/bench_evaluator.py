@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+AI Poker Arena - Hand Evaluator Benchmark
+==========================================
+Hands/sec for the per-hand HandEvaluator paths vs the NumPy batch API.
+
+Usage:
+    python bench_evaluator.py                 # 100k random 7-card hands
+    python bench_evaluator.py --hands 1000000
+    python bench_evaluator.py --players 5     # Also time rank_players
+
+Requirements:
+    pip install numpy
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.game_engine import Card, HandEvaluator
+from core.hand_tables import evaluate_indices
+
+try:
+    import numpy as np
+    from core.batch_eval import evaluate_batch, rank_players
+except ImportError:
+    print("Error: numpy not installed")
+    print("Run: pip install numpy")
+    sys.exit(1)
+
+
+def timed(label: str, count: int, fn) -> float:
+    """Run fn once and print throughput."""
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed
+    print(f"  {label:<38} {rate:>14,.0f} hands/sec  ({elapsed:.2f}s)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hand evaluation paths")
+    parser.add_argument("--hands", type=int, default=100_000, help="Random 7-card hands")
+    parser.add_argument("--players", type=int, default=5, help="Players per board for rank_players")
+    parser.add_argument("--seed", type=int, default=1, help="RNG seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    deck = list(range(52))
+    int_hands = [rng.sample(deck, 7) for _ in range(args.hands)]
+    card_hands = [[Card.from_index(c) for c in hand] for hand in int_hands]
+    batch = np.array(int_hands, dtype=np.int64)
+    per_hand_count = min(args.hands, 20_000)
+
+    print(f"Evaluating {args.hands:,} random 7-card hands")
+    base = timed(
+        "HandEvaluator._evaluate_combinations",
+        per_hand_count,
+        lambda: [HandEvaluator._evaluate_combinations(h) for h in card_hands[:per_hand_count]]
+    )
+    timed("HandEvaluator.evaluate", args.hands,
+          lambda: [HandEvaluator.evaluate(h) for h in card_hands])
+    timed("HandEvaluator.strength", args.hands,
+          lambda: [HandEvaluator.strength(h) for h in card_hands])
+    timed("hand_tables.evaluate_indices", args.hands,
+          lambda: [evaluate_indices(h) for h in int_hands])
+    batch_rate = timed("batch_eval.evaluate_batch", args.hands, lambda: evaluate_batch(batch))
+
+    # Sanity check: batch agrees with the scalar path
+    sample = batch[:1000]
+    expected = [evaluate_indices(h) for h in sample.tolist()]
+    assert evaluate_batch(sample).tolist() == expected, "batch/scalar mismatch"
+
+    boards_n = args.hands // args.players
+    players = args.players
+    deals = np.array([rng.sample(deck, 5 + 2 * players) for _ in range(boards_n)], dtype=np.int64)
+    holes = deals[:, 5:].reshape(boards_n, players, 2)
+    timed(f"batch_eval.rank_players ({players} players)", boards_n * players,
+          lambda: rank_players(holes, deals[:, :5]))
+
+    print(f"\nBatch speedup vs brute force: {batch_rate / base:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+AI Poker Arena - Hand History Store Benchmark
+==============================================
+Fills a hand-history database with simulated hands (real HandResults from
+core.simulation, replayed under new tournament ids and spread over a year
+of play) and times the /api/history query shapes against it.
+
+Usage:
+    python bench_history_store.py                     # 1M hands in a temp database
+    python bench_history_store.py --hands 5000000
+    python bench_history_store.py --db history.db     # Reuse / grow an existing file
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import POLICIES, HandHistoryStore, simulate_tournament
+
+PLAYERS = ["Grok", "GPT-4", "DeepSeek", "Gemini", "Qwen"]
+YEAR = 365 * 24 * 3600
+
+
+def simulated_hands(tournaments: int) -> list:
+    policies = dict(zip(PLAYERS, [POLICIES[p] for p in ("tight", "loose", "pushfold", "random", "tight")]))
+    hands = []
+    for seed in range(tournaments):
+        hands.extend(simulate_tournament(policies, seed=seed).hand_history)
+    return hands
+
+
+def fill(store: HandHistoryStore, pool: list, count: int):
+    """Record `count` hands, ~100 per tournament, evenly spaced over the last year."""
+    start_time = time.time() - YEAR
+    step = YEAR / count
+    start = time.perf_counter()
+    tournament, i = 0, 0
+    while i < count:
+        tournament += 1
+        tid = f"bench_{tournament}"
+        first = random.randrange(len(pool))
+        for hand in range(1, min(100, count - i) + 1):
+            result = replace(pool[(first + hand) % len(pool)], hand_number=hand)
+            store.record_hand(tid, result, played_at=start_time + i * step)
+            i += 1
+    queued = time.perf_counter() - start
+    store.flush()
+    elapsed = time.perf_counter() - start
+    print(f"  Recorded {count:,} hands: {queued / count * 1e6:.1f} us/hand on the caller, "
+          f"{count / elapsed:,.0f} hands/s committed")
+
+
+def timed(label: str, store: HandHistoryStore, repeat: int = 20, pages: int = 1, **query):
+    """Best-of-`repeat` time to fetch `pages` consecutive pages."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cursor, rows = None, 0
+        for _ in range(pages):
+            page = store.query(cursor=cursor, **query)
+            rows += len(page["hands"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<44} {best * 1000 / pages:>8.2f} ms/page  ({rows} hands)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite hand-history store")
+    parser.add_argument("--hands", type=int, default=1_000_000, help="Hands to add to the database")
+    parser.add_argument("--db", help="Database file (default: a temporary file)")
+    parser.add_argument("--pool", type=int, default=50, help="Simulated tournaments to draw hands from")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "hand_history.db")
+    store = HandHistoryStore(path)
+    print(f"\nSimulating {args.pool} tournaments for the hand pool...")
+    pool = simulated_hands(args.pool)
+    print(f"Writing to {path}")
+    fill(store, pool, args.hands)
+    store.close()
+    print(f"  Database size: {os.path.getsize(path) / 1e6:,.0f} MB\n")
+
+    now = time.time()
+    tournament = store.query(limit=1)["hands"][0]["tournament_id"]
+    print(f"  {'query (limit 20)':<44} {'best':>8}")
+    timed("newest", store)
+    timed("newest, pages 1-50 by cursor", store, repeat=3, pages=50)
+    timed("player", store, player="Grok")
+    timed("player, won, pot >= 20000", store, player="Grok", won=True, min_pot=20000)
+    timed("pot >= 40000", store, min_pot=40000)
+    timed("biggest pots", store, sort="pot")
+    timed("biggest pots, pages 1-50 by cursor", store, repeat=3, pages=50, sort="pot")
+    timed("player, biggest pots", store, player="Qwen", sort="pot")
+    timed("one week, six months ago", store, since=now - YEAR / 2, until=now - YEAR / 2 + 7 * 86400)
+    timed("player, one week, six months ago", store, player="Gemini",
+          since=now - YEAR / 2, until=now - YEAR / 2 + 7 * 86400)
+    timed("one tournament", store, tournament=tournament)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+AI Poker Arena - LLM Client Latency Benchmark
+==============================================
+Per-call latency of a fresh httpx client per request (the old behavior)
+vs an agent's pooled keep-alive client, against a local stand-in for an
+OpenAI-compatible endpoint.
+
+Usage:
+    python bench_llm_client.py                  # Plain HTTP, 200 calls each
+    python bench_llm_client.py --tls            # HTTPS with a throwaway self-signed cert
+    python bench_llm_client.py --delay 50       # Simulate 50 ms of model time per call
+
+A fresh client also rebuilds its SSL context (loading the CA bundle) even
+for plain HTTP, which is most of the per-call cost on localhost. --tls adds
+the handshake that real API calls pay. Requires the openssl CLI for --tls.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ["NOTES_DIR"] = tempfile.mkdtemp(prefix="bench-llm-client-")  # Bench agent's notes, not the real ones
+
+import httpx
+
+from agents.base_agent import QwenAgent
+
+
+REPLY = json.dumps({
+    "choices": [{"message": {"content": '{"action": "check", "amount": 0, "reasoning": "bench"}'}}]
+}).encode()
+
+
+def make_handler(delay: float):
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive
+        disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if delay:
+                time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(REPLY)))
+            self.end_headers()
+            self.wfile.write(REPLY)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StandInHandler
+
+
+def self_signed_cert(directory: str):
+    """Throwaway cert/key for 127.0.0.1 via the openssl CLI."""
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+         "-keyout", key, "-out", cert],
+        check=True, capture_output=True
+    )
+    return cert, key
+
+
+async def fresh_client_calls(url: str, calls: int) -> list:
+    """One new client per call, exactly like the old agents: new connection and SSL context each time."""
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.post(url, json={"messages": [{"role": "user", "content": "hi"}]})
+            response.raise_for_status()
+            response.json()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def pooled_agent_calls(agent: QwenAgent, calls: int) -> list:
+    """The agent's real _call_llm path over its shared client."""
+    latencies = []
+    try:
+        for _ in range(calls):
+            start = time.perf_counter()
+            await agent._call_llm("hi", max_tokens=10)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        await agent.aclose()
+    return latencies
+
+
+def report(label: str, latencies: list):
+    ms = sorted(x * 1000 for x in latencies)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(f"  {label:<24} mean {statistics.mean(ms):7.2f} ms   "
+          f"p50 {statistics.median(ms):7.2f} ms   p95 {p95:7.2f} ms")
+    return statistics.mean(ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-call vs pooled LLM client latency")
+    parser.add_argument("--calls", type=int, default=200, help="Calls per client mode")
+    parser.add_argument("--delay", type=float, default=0.0, help="Simulated model time per call (ms)")
+    parser.add_argument("--tls", action="store_true", help="Serve HTTPS with a self-signed cert")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.delay / 1000))
+    scheme = "http"
+    if args.tls:
+        cert, key = self_signed_cert(tmpdir)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        os.environ["SSL_CERT_FILE"] = cert  # Trusted by both clients
+        scheme = "https"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    base_url = f"{scheme}://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ["QWEN_API_URL"] = base_url
+    agent = QwenAgent()
+
+    print(f"Stand-in server: {base_url} ({args.calls} calls per mode, "
+          f"{args.delay:.0f} ms model delay, http2={agent.http2})\n")
+    fresh = report("New client per call", asyncio.run(
+        fresh_client_calls(f"{base_url}/chat/completions", args.calls)))
+    pooled = report("Pooled agent client", asyncio.run(pooled_agent_calls(agent, args.calls)))
+    print(f"\n  Saved {fresh - pooled:.2f} ms per call ({fresh / pooled:.1f}x faster)")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
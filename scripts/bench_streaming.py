@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+AI Poker Arena - Streaming Decision Benchmark
+==============================================
+Time-to-action of a full (non-streaming) completion vs a streamed one that
+is played as soon as "action"/"amount" arrive, against a local stand-in
+that writes a typical decision reply token by token in both the
+OpenAI-compatible and Gemini stream formats. Also checks that the text
+fields streamed in afterwards end up the same as a whole-reply parse, and
+that the token usage each format reports is counted.
+
+Usage:
+    python bench_streaming.py                        # 20 decisions per mode
+    python bench_streaming.py --first-ms 400 --token-ms 20 --calls 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ["NOTES_DIR"] = tempfile.mkdtemp(prefix="bench-streaming-")  # Bench agents' notes, not the real ones
+
+from agents.base_agent import GeminiAgent, QwenAgent
+from core import Tournament, TournamentConfig, TournamentRunner
+
+REPLY = json.dumps({
+    "action": "raise",
+    "amount": 600,
+    "reasoning": "Ace-king suited in late position plays well against a single limper; raising takes the initiative.",
+    "inner_thoughts": "The big blind has folded to every 3-bet so far, so a bigger sizing should just take it down.",
+    "trash_talk": "Hope you brought a bigger stack this time."
+}, indent=4)
+TOKENS = [REPLY[i:i + 4] for i in range(0, len(REPLY), 4)]  # ~4 characters per token
+PROMPT_TOKENS = 900  # Reported usage (a typical decision prompt)
+
+
+def first_decision():
+    """Game state and valid actions for the first player to act in a fresh tournament."""
+    tournament = Tournament(["Qwen", "Gemini", "Grok"], TournamentConfig())
+    player, valid_actions = next(TournamentRunner(tournament)._play_hand())
+    return tournament.game.get_game_state_for_player(player), valid_actions
+
+
+def make_handler(first: float, per_token: float):
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            gemini = self.path.startswith("/gemini")
+            streaming = body.get("stream") or "streamGenerateContent" in self.path
+            time.sleep(first)
+            openai_usage = {"prompt_tokens": PROMPT_TOKENS, "completion_tokens": len(TOKENS)}
+            gemini_usage = {"promptTokenCount": PROMPT_TOKENS, "candidatesTokenCount": len(TOKENS)}
+            if not streaming:
+                time.sleep(per_token * len(TOKENS))  # The whole completion is generated first
+                if gemini:
+                    reply = {"candidates": [{"content": {"parts": [{"text": REPLY}]}}], "usageMetadata": gemini_usage}
+                else:
+                    reply = {"choices": [{"message": {"content": REPLY}}], "usage": openai_usage}
+                data = json.dumps(reply).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for n, token in enumerate(TOKENS, 1):
+                    if gemini:
+                        event = {"candidates": [{"content": {"parts": [{"text": token}]}}],
+                                 "usageMetadata": {**gemini_usage, "candidatesTokenCount": n}}
+                    else:
+                        event = {"choices": [{"delta": {"content": token}}]}
+                    self._chunk(f"data: {json.dumps(event)}\n\n")
+                    time.sleep(per_token)
+                if not gemini:
+                    if (body.get("stream_options") or {}).get("include_usage"):
+                        self._chunk(f"data: {json.dumps({'choices': [], 'usage': openai_usage})}\n\n")
+                    self._chunk("data: [DONE]\n\n")
+                self._chunk("")
+            except OSError:
+                pass  # Client closed early
+
+        def _chunk(self, text: str):
+            data = text.encode()
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def log_message(self, format, *args):
+            pass
+
+    return StandInHandler
+
+
+async def run(url: str, calls: int):
+    game_state, valid_actions = first_decision()
+    qwen = QwenAgent()
+    qwen.api_url = f"{url}/v1"
+    gemini = GeminiAgent()
+    gemini.api_key = "bench"
+    gemini.api_url = f"{url}/gemini:generateContent"
+    gemini.stream_url = f"{url}/gemini:streamGenerateContent"
+
+    finals = {}
+    for agent in (qwen, gemini):
+        agent.on_decision_text = lambda name, decision, final: final and finals.__setitem__(name, decision)
+
+    reference, mismatches = None, 0
+    print(f"  {'mode':<28} {'median':>9} {'p90':>9}")
+    for agent, label in ((qwen, "OpenAI-compatible"), (gemini, "Gemini")):
+        for streaming in (False, True):
+            agent.streaming = streaming
+            times = []
+            for _ in range(calls):
+                start = time.perf_counter()
+                decision = await agent.get_decision(game_state, valid_actions)
+                times.append(time.perf_counter() - start)
+                if streaming:
+                    while agent._streams:  # Let the text finish before the next call
+                        await asyncio.sleep(0.01)
+                    decision = finals.pop(agent.name)
+                if reference is None:
+                    reference = decision
+                elif decision != reference:
+                    mismatches += 1
+                    print(f"  MISMATCH {label}: {decision} != {reference}")
+            times.sort()
+            mode = f"{label}, {'streamed' if streaming else 'full reply'}"
+            print(f"  {mode:<28} {statistics.median(times) * 1000:>7.0f}ms "
+                  f"{times[int(len(times) * 0.9) - 1] * 1000:>7.0f}ms")
+        await agent.aclose()
+    print(f"\n  Action played: {reference.action.name.lower()} {reference.amount}; "
+          f"{mismatches} decisions differed from the first full-reply parse")
+    for agent in (qwen, gemini):
+        u = agent.total_usage()
+        print(f"  {agent.name} usage: {u.calls} calls, {u.prompt_tokens:,} in / {u.completion_tokens:,} out tokens "
+              f"({u.estimated} estimated; expected {2 * calls * PROMPT_TOKENS:,} / {2 * calls * len(TOKENS):,})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark time-to-action of streamed vs full LLM replies")
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--first-ms", type=float, default=300, help="Time to first token")
+    parser.add_argument("--token-ms", type=float, default=15, help="Time per token after that")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.first_ms / 1000, args.token_ms / 1000))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"\nReply: {len(TOKENS)} tokens, {args.first_ms:.0f}ms to first token, {args.token_ms:.0f}ms/token")
+    asyncio.run(run(url, args.calls))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
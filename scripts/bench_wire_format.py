@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+AI Poker Arena - Wire Format Bandwidth Comparison
+==================================================
+Bytes per viewer for a full tournament's event stream as JSON (the default)
+vs the compact binary format (/ws?format=compact), with and without
+per-message deflate, broken down by event type. Every compact frame is
+decoded again and checked against the original event.
+
+Usage:
+    python bench_wire_format.py                       # Simulate a tournament and compare
+    python bench_wire_format.py --save run.jsonl      # ...and keep the recording
+    python bench_wire_format.py --events run.jsonl    # Compare a saved recording
+    python bench_wire_format.py --record ws://localhost:8080/ws --save live.jsonl
+
+The simulated tournament goes through PokerArena's real broadcast hooks,
+with core.simulation policies standing in for the LLMs and canned
+reasoning / inner thoughts / trash talk of typical length (--no-text to
+leave them out and compare structure only). --record captures a live
+server's JSON stream until tournament_end.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import random
+import sys
+import zlib
+from collections import defaultdict
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import api.server
+from api.connections import dumps
+from api.wire import CompactDecoder, CompactEncoder
+from core import AIDecision
+from core.simulation import POLICIES
+from core.usage import Usage
+from run_tournament import PokerArena
+
+REASONING = [
+    "Pot odds are good enough with two overcards and position on the button.",
+    "He has been raising light from the cutoff all orbit - time to push back with a re-raise.",
+    "Short stack shoved, and my range is way ahead of his at this stack depth. Easy call.",
+    "Board is very wet and I have nothing. Checking to keep the pot small.",
+]
+INNER_THOUGHTS = [
+    "If DeepSeek calls here I'm in trouble, but she has folded to every three-bet so far.",
+    "Stay patient. The blinds are going up and these maniacs will hand me their chips.",
+    "I have no idea where I am in this hand.",
+]
+TRASH_TALK = ["You can't fold your way to a bracelet.", "Nice hand. Shame about the rest of your game.", None, None]
+
+
+class PolicyPlayers:
+    """Stands in for AIPlayerManager: decisions come from core.simulation policies."""
+
+    def __init__(self, arena: "SimulatedArena", policies, rng: random.Random, text: bool):
+        self.arena = arena
+        self.policies = policies
+        self.players = {name: None for name in policies}
+        self.rng = rng
+        self.text = text
+        self.hand_usage = []  # No LLM calls, so nothing to account
+
+    async def get_action(self, name, game_state, valid_actions) -> AIDecision:
+        game = self.arena.current_game
+        player = next(p for p in game.players if p.name == name)
+        action, amount = self.policies[name](game, player, valid_actions, self.rng)
+        if not self.text:
+            return AIDecision(action, amount, "")
+        return AIDecision(action, amount, self.rng.choice(REASONING),
+                          self.rng.choice(INNER_THOUGHTS), self.rng.choice(TRASH_TALK))
+
+    def start_tournament(self):
+        pass
+
+    def begin_hand(self, hand_number):
+        pass
+
+    def end_hand(self):
+        return None
+
+    def usage_summary(self):
+        return {"players": {}, "total": Usage().summary(), "hands": 0, "cost_per_hand": None, "tokens_per_hand": None}
+
+    async def flush_notes(self):
+        pass
+
+    async def aclose(self):
+        pass
+
+
+class SimulatedArena(PokerArena):
+    """PokerArena (same hooks, same broadcasts) without LLM agents, notes, hand history, stats or result files."""
+
+    def __init__(self, policies, rng: random.Random, text: bool):
+        self.players_spec = (policies, rng, text)
+        super().__init__()
+        self.history = self.stats = None
+
+    def _setup_agents(self):
+        self.manager = PolicyPlayers(self, *self.players_spec)
+
+    async def _post_tournament_reflection(self, tournament, results):
+        pass
+
+    def _save_results(self, results):
+        pass
+
+
+class Recorder:
+    """Takes the place of api.server.broker and keeps every published event."""
+
+    def __init__(self):
+        self.events = []
+
+    async def publish(self, event, state=None):
+        self.events.append(event)
+
+    async def aclose(self):
+        pass
+
+
+async def simulate(seed: int, text: bool) -> list:
+    recorder = Recorder()
+    api.server.broker = recorder
+    names = ["Grok", "GPT-4", "DeepSeek", "Gemini", "Qwen"]
+    policies = dict(zip(names, [POLICIES[p] for p in ("loose", "tight", "tight", "loose", "pushfold")]))
+    with contextlib.redirect_stdout(io.StringIO()):  # The arena narrates every hand
+        await SimulatedArena(policies, random.Random(seed), text).run_tournament()
+        # Broadcasts are fire-and-forget tasks - let them all finish
+        pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        await asyncio.gather(*pending)
+    return recorder.events
+
+
+async def record(url: str) -> list:
+    import websockets
+    events = []
+    async with websockets.connect(url, max_size=None) as ws:
+        async for text in ws:
+            message = json.loads(text)
+            if message.get("type") in ("init", "resume", "pong"):
+                continue
+            events.append(message)
+            print(f"\r  {len(events)} events", end="", flush=True)
+            if message.get("type") == "tournament_end":
+                break
+    print()
+    return events
+
+
+def strip_for_compare(message: dict) -> dict:
+    """What the compact format preserves: timestamps to the ms, equities to 4 places."""
+    message = json.loads(dumps(message))
+    message.pop("timestamp", None)
+    data = message.get("data")
+    if isinstance(data, dict):
+        data = {k: v for k, v in data.items() if v is not None}
+        for key in ("equities", "preflop_equity"):
+            if isinstance(data.get(key), dict):
+                data[key] = {name: round(v * 10000) for name, v in data[key].items()}
+        message["data"] = data
+    return message
+
+
+def compare(events: list):
+    encoder = CompactEncoder()
+    decoder = CompactDecoder(encoder.base())
+    json_deflate = zlib.compressobj(wbits=-15)  # permessage-deflate with context takeover
+    compact_deflate = zlib.compressobj(wbits=-15)
+    totals = defaultdict(lambda: [0, 0, 0, 0, 0])  # count, json, compact, json+deflate, compact+deflate
+    mismatches = 0
+
+    for seq, event in enumerate(events, 1):
+        message = {**event, "seq": seq}
+        text = dumps(message).encode()
+        frame = encoder.encode(seq, message)
+        if strip_for_compare(decoder.decode(frame)) != strip_for_compare(message):
+            mismatches += 1
+        row = totals[event.get("type")]
+        row[0] += 1
+        row[1] += len(text)
+        row[2] += len(frame)
+        row[3] += len(json_deflate.compress(text) + json_deflate.flush(zlib.Z_SYNC_FLUSH)) - 4
+        row[4] += len(compact_deflate.compress(frame) + compact_deflate.flush(zlib.Z_SYNC_FLUSH)) - 4
+
+    print(f"\n  {'event':<17} {'count':>6} {'json':>10} {'compact':>10} {'saved':>6} "
+          f"{'json+defl':>10} {'cmp+defl':>10} {'saved':>6}")
+    overall = [0] * 5
+    for event_type, row in sorted(totals.items(), key=lambda kv: -kv[1][1]):
+        overall = [a + b for a, b in zip(overall, row)]
+        print_row(event_type, row)
+    print_row("total", overall)
+    print(f"\n  Round trip: {len(events) - mismatches}/{len(events)} events decoded identically")
+    return mismatches == 0
+
+
+def print_row(label: str, row: list):
+    count, plain, compact, plain_z, compact_z = row
+    print(f"  {label:<17} {count:>6,} {plain:>10,} {compact:>10,} {1 - compact / plain:>6.0%} "
+          f"{plain_z:>10,} {compact_z:>10,} {1 - compact_z / plain_z:>6.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON vs compact wire format bandwidth")
+    parser.add_argument("--events", help="JSONL recording to compare instead of simulating")
+    parser.add_argument("--record", metavar="WS_URL", help="Record a live tournament from a server")
+    parser.add_argument("--save", help="Write the events used to this JSONL file")
+    parser.add_argument("--seed", type=int, default=0, help="Policy RNG seed (the deal itself is not seeded)")
+    parser.add_argument("--no-text", action="store_true", help="Simulate without reasoning/trash talk text")
+    args = parser.parse_args()
+
+    if args.events:
+        with open(args.events) as f:
+            events = [json.loads(line) for line in f if line.strip()]
+        source = args.events
+    elif args.record:
+        events = asyncio.run(record(args.record))
+        source = args.record
+    else:
+        events = asyncio.run(simulate(args.seed, not args.no_text))
+        source = "a simulated tournament"
+
+    if args.save:
+        with open(args.save, "w") as f:
+            for event in events:
+                f.write(dumps(event) + "\n")
+
+    print(f"\n{len(events):,} events from {source} (bytes per viewer)")
+    sys.exit(0 if compare(events) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+AI Poker Arena - Multi-worker Fan-out Check
+============================================
+Spins up the whole broker topology on localhost and checks it end to end:
+a broker, N uvicorn workers subscribed to it, WebSocket viewers on every
+worker, and this process publishing a synthetic tournament through the
+real broadcast_* functions.
+
+Checks that
+- every viewer on every worker receives the same events in the same order
+- a viewer that drops and reconnects to a *different* worker with
+  ?since=&epoch= gets exactly the events it missed (or a current snapshot
+  if it missed more than the ring / its send queue holds)
+- a worker started mid-tournament serves the same state as the others
+
+Usage:
+    python fanout_cluster.py                         # 3 workers, 20 viewers each
+    python fanout_cluster.py --workers 4 --viewers 100 --hands 50
+    python fanout_cluster.py --unix                  # Broker on a unix socket
+
+Requires uvicorn, websockets and httpx.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import httpx
+import websockets
+
+PLAYERS = ["Grok", "GPT-4", "DeepSeek", "Gemini", "Qwen"]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn(args, env):
+    return subprocess.Popen(
+        [sys.executable, *args], cwd=ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def start_worker(port: int, env) -> subprocess.Popen:
+    return spawn(["-m", "uvicorn", "api.server:app", "--host", "127.0.0.1", "--port", str(port),
+                  "--log-level", "warning"], env)
+
+
+async def wait_ready(port: int, timeout: float = 20.0):
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.perf_counter() < deadline:
+            try:
+                if (await client.get(f"http://127.0.0.1:{port}/api/status")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"Worker on port {port} did not start")
+
+
+async def status(port: int) -> dict:
+    async with httpx.AsyncClient() as client:
+        return (await client.get(f"http://127.0.0.1:{port}/api/status")).json()
+
+
+class Viewer:
+    """A WebSocket spectator recording every sequenced event it sees."""
+
+    def __init__(self, port: int, query: str = ""):
+        self.url = f"ws://127.0.0.1:{port}/ws{query}"
+        self.messages = []
+        self.ws = None
+        self.task = None
+
+    async def start(self):
+        self.ws = await websockets.connect(self.url, max_queue=None)
+        self.messages.append(json.loads(await self.ws.recv()))  # init / resume
+        self.task = asyncio.create_task(self._read())
+
+    async def _read(self):
+        try:
+            async for text in self.ws:
+                self.messages.append(json.loads(text))
+        except websockets.ConnectionClosed:
+            pass
+
+    @property
+    def seqs(self):
+        return [m["seq"] for m in self.messages if "seq" in m and m["type"] != "init"]
+
+    async def stop(self):
+        await self.ws.close()
+        await self.task
+
+
+async def publish_hands(api, first: int, hands: int):
+    """A synthetic tournament slice through the real broadcast functions."""
+    for hand in range(first, first + hands):
+        await api.broadcast_hand_start(hand, [{"name": p, "chips": 10000} for p in PLAYERS],
+                                       {"sb_player": PLAYERS[0], "bb_player": PLAYERS[1]})
+        await api.broadcast_hole_cards({p: ["As", "Kd"] for p in PLAYERS})
+        for i, player in enumerate(PLAYERS * 2):
+            await api.broadcast_action(player, "call", 100, "Pot odds.", pot=100 * (i + 1))
+        await api.broadcast_community_cards(["2c", "7d", "Jh"], "flop")
+        await api.broadcast_hand_result(PLAYERS[hand % 5], 1000, "Pair", f"Hand {hand}")
+        for player in PLAYERS:
+            await api.update_player_chips(player, 10000 + hand)
+        await asyncio.sleep(0.005)
+
+
+async def wait_for(condition, timeout: float = 10.0):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+    return condition()
+
+
+async def run(args, broker_url: str, env) -> bool:
+    # Imported after BROKER_URL is set, so broadcasts go to the broker
+    import api
+    from api.connections import QUEUE_SIZE
+    from api.event_log import EVENT_BUFFER_SIZE
+
+    ports = [free_port() for _ in range(args.workers + 1)]
+    procs = [start_worker(port, env) for port in ports[:-1]]
+    try:
+        await asyncio.gather(*(wait_ready(port) for port in ports[:-1]))
+        viewers = [Viewer(port) for port in ports[:-1] for _ in range(args.viewers)]
+        await asyncio.gather(*(v.start() for v in viewers))
+        await asyncio.sleep(0.5)  # Workers finish their broker handshake
+        print(f"{args.workers} workers, {len(viewers)} viewers, broker {broker_url}")
+
+        quiet = contextlib.redirect_stdout(io.StringIO())  # broadcast_* log every event
+        start = time.perf_counter()
+        with quiet:
+            await api.broadcast_tournament_start(PLAYERS, {"starting_chips": 10000})
+            half = args.hands // 2
+            await publish_hands(api, 1, half)
+
+        # One viewer drops mid-tournament; a new worker joins late
+        dropped = viewers.pop(0)
+        await dropped.stop()
+        resume_from = dropped.seqs[-1] if dropped.seqs else 0
+        epoch = dropped.messages[0]["epoch"]
+        procs.append(start_worker(ports[-1], env))
+
+        with quiet:
+            await publish_hands(api, half + 1, args.hands - half)
+            await api.broadcast_tournament_end(PLAYERS[0], [], {})
+            await api.close_broker()
+        publish_time = time.perf_counter() - start
+
+        await wait_ready(ports[-1])
+        total = (await status(ports[0]))["last_seq"]
+        # The dropped viewer comes back on a different worker
+        resumed = Viewer(ports[1 % args.workers], f"?since={resume_from}&epoch={epoch}")
+        await resumed.start()
+        late = Viewer(ports[-1])
+        await late.start()
+
+        replayable = total - resume_from < min(EVENT_BUFFER_SIZE, QUEUE_SIZE)
+        everyone_done = await wait_for(lambda: all(v.seqs and v.seqs[-1] == total for v in viewers)
+                                       and (not replayable or (resumed.seqs and resumed.seqs[-1] == total)))
+        print(f"Published {total} events in {publish_time:.2f}s (incl. 5 ms pause per hand)\n")
+
+        expected = list(range(1, total + 1))
+        ok_all = sum(v.seqs == expected for v in viewers)
+        check("all viewers received every event in order", everyone_done and ok_all == len(viewers),
+              f"{ok_all}/{len(viewers)}")
+        if replayable:
+            check("resumed viewer got exactly the missed events",
+                  resumed.messages[0]["type"] == "resume" and resumed.seqs == list(range(resume_from + 1, total + 1)),
+                  f"since={resume_from}, replayed {len(resumed.seqs)}")
+        else:
+            check("resumed viewer got a current snapshot (gap too large to replay)",
+                  resumed.messages[0]["type"] == "init" and resumed.messages[0]["seq"] == total,
+                  f"since={resume_from}, gap {total - resume_from}")
+
+        statuses = [await status(port) for port in ports]
+        reference = {k: statuses[0][k] for k in ("players", "is_running", "last_seq")}
+        late_state = {k: statuses[-1][k] for k in reference}
+        check("late worker serves the same state", late_state == reference,
+              f"last_seq {late_state['last_seq']}, players match: {late_state['players'] == reference['players']}")
+        check("late worker's init snapshot is current", late.messages[0]["seq"] == total,
+              f"init seq {late.messages[0]['seq']}")
+
+        await asyncio.gather(*(v.stop() for v in viewers + [resumed, late]))
+        return all(CHECKS)
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.wait()
+
+
+CHECKS = []
+
+
+def check(label: str, passed: bool, detail: str):
+    CHECKS.append(passed)
+    print(f"  [{'PASS' if passed else 'FAIL'}] {label} ({detail})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end check of broker fan-out on localhost")
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--viewers", type=int, default=20, help="Viewers per worker")
+    parser.add_argument("--hands", type=int, default=20, help="Synthetic hands to publish")
+    parser.add_argument("--unix", action="store_true", help="Broker on a unix socket instead of TCP")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    broker_url = f"unix://{tmpdir}/broker.sock" if args.unix else f"tcp://127.0.0.1:{free_port()}"
+    os.environ["BROKER_URL"] = broker_url
+    env = dict(os.environ)
+
+    broker = spawn(["-m", "api.pubsub", "--listen", broker_url], env)
+    try:
+        time.sleep(0.5)
+        passed = asyncio.run(run(args, broker_url, env))
+    finally:
+        broker.terminate()
+        broker.wait()
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
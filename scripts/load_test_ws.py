@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+AI Poker Arena - Spectator Fan-out Load Test
+=============================================
+Time ConnectionManager.broadcast with thousands of simulated viewers, some
+of them slow, and compare against the old sequential send loop.
+
+Usage:
+    python load_test_ws.py                          # 3000 viewers, 0/10/100/1000 slow
+    python load_test_ws.py --clients 8000 --slow 0 500 2000
+    python load_test_ws.py --policy disconnect --queue-size 32
+
+Viewers are in-process fakes: fast ones yield once per send, slow ones sleep
+--slow-ms per send (a congested socket). Broadcast latency should stay flat
+no matter how many are slow; only their own queues back up.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.connections import OVERFLOW_POLICIES, ClientConnection
+from api.server import ConnectionManager
+
+
+LEGACY_CAP = 10.0  # Seconds to let the old loop run for one event
+
+
+class FakeViewer:
+    """Stands in for a starlette WebSocket."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.received = 0
+
+    async def send_text(self, text):
+        await asyncio.sleep(self.delay)
+        self.received += 1
+
+    async def send_json(self, message):
+        await self.send_text(json.dumps(message))
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def event(i: int) -> dict:
+    """Realistic mix: mostly actions, a chip update per action, a hand marker every 20."""
+    if i % 20 == 0:
+        return {"type": "hand_start", "data": {"hand_number": i // 20, "players": []}}
+    if i % 2:
+        return {"type": "chip_update", "data": {"player": f"P{i % 5}", "chips": 10000 - i}}
+    return {"type": "action", "data": {"player": f"P{i % 5}", "action": "call", "amount": 200,
+                                       "reasoning": "Pot odds are fine here." * 3}}
+
+
+async def legacy_broadcast(viewers, message):
+    """The old loop: await each send in turn."""
+    for viewer in viewers:
+        await viewer.send_json(message)
+
+
+async def run(clients: int, slow: int, args) -> dict:
+    manager = ConnectionManager()
+    viewers = [FakeViewer(args.slow_ms / 1000 if i < slow else 0) for i in range(clients)]
+    for viewer in viewers:
+        manager.clients[viewer] = ClientConnection(
+            viewer, manager._on_client_closed, max_queue=args.queue_size, policy=args.policy
+        )
+
+    latencies = []
+    for i in range(args.events):
+        start = time.perf_counter()
+        await manager.broadcast(event(i))
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(args.interval_ms / 1000)  # Writers drain between events
+
+    # Let fast viewers finish draining before checking they got everything
+    fast = viewers[slow:]
+    fast_clients = [manager.clients[v] for v in fast if v in manager.clients]
+    deadline = time.perf_counter() + 5
+    while any(c.pending for c in fast_clients) and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+    stats = manager.queue_stats()
+    for client in list(manager.clients.values()):
+        client.close()
+    await asyncio.sleep(0)
+
+    return {
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "max_ms": max(latencies) * 1000,
+        "fast_complete": sum(v.received == args.events for v in fast) / max(len(fast), 1),
+        **stats
+    }
+
+
+async def run_legacy(clients: int, slow: int, args) -> str:
+    """One event through the old loop (capped - it grows with slow * slow_ms)."""
+    viewers = [FakeViewer(args.slow_ms / 1000 if i < slow else 0) for i in range(clients)]
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(legacy_broadcast(viewers, event(1)), LEGACY_CAP)
+    except asyncio.TimeoutError:
+        return f">{LEGACY_CAP:.0f}s"
+    return f"{(time.perf_counter() - start) * 1000:,.0f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test spectator broadcast fan-out")
+    parser.add_argument("--clients", type=int, default=3000, help="Simulated viewers")
+    parser.add_argument("--slow", type=int, nargs="+", default=[0, 10, 100, 1000],
+                        help="How many of them are slow (one run per value)")
+    parser.add_argument("--slow-ms", type=float, default=200, help="Per-send delay of slow viewers")
+    parser.add_argument("--events", type=int, default=100, help="Events broadcast per run")
+    parser.add_argument("--interval-ms", type=float, default=20, help="Gap between events")
+    parser.add_argument("--queue-size", type=int, default=64, help="Per-viewer queue bound")
+    parser.add_argument("--policy", choices=OVERFLOW_POLICIES, default="coalesce")
+    args = parser.parse_args()
+
+    print(f"{args.clients:,} viewers, {args.events} events every {args.interval_ms:.0f} ms, "
+          f"slow viewers take {args.slow_ms:.0f} ms/send, queue {args.queue_size}, policy {args.policy}\n")
+    print(f"  {'slow':>6} {'bcast mean':>11} {'bcast max':>10} {'fast ok':>8} "
+          f"{'dropped':>8} {'coalesced':>10} {'kicked':>7} {'old loop/event':>15}")
+    for slow in args.slow:
+        result = asyncio.run(run(args.clients, slow, args))
+        legacy_ms = asyncio.run(run_legacy(args.clients, slow, args))
+        print(f"  {slow:>6} {result['mean_ms']:>9.2f}ms {result['max_ms']:>8.2f}ms "
+              f"{result['fast_complete']:>8.0%} {result['dropped_events']:>8,} "
+              f"{result['coalesced_events']:>10,} {result['laggards_dropped']:>7,} {legacy_ms:>15}")
+
+
+if __name__ == "__main__":
+    main()
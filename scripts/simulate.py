@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+AI Poker Arena - Headless Tournament Simulator
+===============================================
+Plays Sit & Gos with built-in policies instead of LLM agents, no API calls.
+
+Usage:
+    python simulate.py                                   # 100 tournaments, mixed table
+    python simulate.py --tournaments 100000 --workers 8 --seed 42
+    python simulate.py --policies tight tight loose pushfold random
+    python simulate.py --tournaments 10000 --json        # Aggregates as JSON
+
+Policies: random, tight, loose, pushfold. Each tournament is seeded from
+(--seed, index), so aggregates are identical for any --workers value.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.batch import BatchStats, iter_batch
+from core.simulation import POLICIES, SIMULATION_CONFIG
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless poker tournaments")
+    parser.add_argument("--tournaments", type=int, default=100, help="Tournaments to play")
+    parser.add_argument("--policies", nargs="+", choices=sorted(POLICIES),
+                        default=["random", "tight", "loose", "pushfold", "tight"],
+                        help="One policy per seat")
+    parser.add_argument("--seed", type=int, default=1, help="Master seed")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--shard-size", type=int, default=50, help="Tournaments per worker task")
+    parser.add_argument("--json", action="store_true", help="Print aggregates as JSON")
+    args = parser.parse_args()
+
+    seats = {f"Seat {i + 1} ({name})": POLICIES[name] for i, name in enumerate(args.policies)}
+    stats = BatchStats(seats=list(seats), starting_chips=SIMULATION_CONFIG.starting_chips)
+    report_every = max(1, args.tournaments // 10)
+
+    start = time.perf_counter()
+    for summary in iter_batch(seats, args.tournaments, args.seed, args.workers,
+                              shard_size=args.shard_size):
+        stats.add(summary)
+        if not args.json and stats.tournaments % report_every == 0:
+            print(f"  {stats.tournaments:,}/{args.tournaments:,} tournaments "
+                  f"({time.perf_counter() - start:.1f}s)")
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(stats.to_dict(), indent=2))
+        return
+
+    print(f"\n{stats.tournaments:,} tournaments, {stats.total_hands:,} hands in {elapsed:.2f}s")
+    print(f"  {stats.total_hands / elapsed:,.0f} hands/sec, {stats.avg_hands:.1f} hands/tournament\n")
+
+    suffixes = {1: "st", 2: "nd", 3: "rd"}
+    places = [str(p) + suffixes.get(p, "th") for p in range(1, len(seats) + 1)]
+    header = " ".join(f"{place:>6}" for place in places)
+    print(f"  {'Seat':<22} {header} {'chip EV':>10}")
+    distribution = stats.finish_distribution()
+    chip_ev = stats.chip_ev()
+    for name in seats:
+        row = " ".join(f"{share:>6.1%}" for share in distribution[name])
+        print(f"  {name:<22} {row} {chip_ev[name]:>+10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+AI Poker Arena - Hand Evaluator Verification
+=============================================
+Cross-checks the lookup-table evaluator against the brute-force
+21-combination reference implementation.
+
+Usage:
+    python verify_evaluator.py                    # 200k random 7-card hands
+    python verify_evaluator.py --samples 1000000  # Bigger random sample
+    python verify_evaluator.py --all-five         # Every 5-card hand (2,598,960)
+
+All 133M 7-card hands are out of reach for the pure-Python reference, so
+7-card coverage is a random sample; 5 and 6 card hands are sampled too.
+"""
+
+import argparse
+import random
+import sys
+import time
+from itertools import combinations
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.game_engine import Card, Rank, Suit, HandEvaluator
+
+DECK = [Card(rank, suit) for suit in Suit for rank in Rank]
+
+
+def check(cards) -> bool:
+    """True if table and reference evaluators agree on these cards."""
+    expected = HandEvaluator._evaluate_combinations(cards)
+    rank, values = HandEvaluator.evaluate(cards)
+    return (rank, values) == expected
+
+
+def verify_random(samples: int, seed: int) -> int:
+    """Check random 5/6/7-card hands. Returns number of mismatches."""
+    rng = random.Random(seed)
+    mismatches = 0
+    for i in range(samples):
+        size = 7 if i % 4 else rng.choice((5, 6))
+        cards = rng.sample(DECK, size)
+        if not check(cards):
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"  MISMATCH: {cards} -> {HandEvaluator.evaluate(cards)} "
+                      f"expected {HandEvaluator._evaluate_combinations(cards)}")
+    return mismatches
+
+
+def verify_all_five() -> int:
+    """Check every 5-card hand. Returns number of mismatches."""
+    mismatches = 0
+    for cards in combinations(DECK, 5):
+        cards = list(cards)
+        if not check(cards):
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"  MISMATCH: {cards}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify the lookup-table hand evaluator")
+    parser.add_argument("--samples", type=int, default=200_000, help="Random hands to check")
+    parser.add_argument("--seed", type=int, default=1, help="RNG seed")
+    parser.add_argument("--all-five", action="store_true", help="Check all 2,598,960 5-card hands")
+    args = parser.parse_args()
+
+    start = time.time()
+    if args.all_five:
+        print("Checking every 5-card hand...")
+        mismatches = verify_all_five()
+    else:
+        print(f"Checking {args.samples:,} random hands (seed {args.seed})...")
+        mismatches = verify_random(args.samples, args.seed)
+
+    print(f"Done in {time.time() - start:.1f}s - {mismatches} mismatches")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+AI Poker Arena - Provider Resilience Check
+===========================================
+Points agents at local stand-ins for an OpenAI-compatible endpoint that
+misbehave in scripted ways (503s, 429 with Retry-After, an outage, a hung
+request, a long Retry-After) and checks that agents/resilience.py retries,
+waits, opens and closes the circuit breaker, and keeps each decision
+inside its deadline - with the local heuristic policy playing whenever the
+model can't. Prints each agent's and provider's counters at the end.
+
+Usage:
+    python verify_resilience.py
+    python verify_resilience.py --deadline 5
+
+Backoff and breaker settings are shrunk through the usual LLM_* variables
+so the whole run takes a few seconds.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.setdefault("LLM_BACKOFF_BASE", "0.05")
+os.environ.setdefault("LLM_BACKOFF_MAX", "0.2")
+os.environ.setdefault("LLM_BREAKER_THRESHOLD", "3")
+os.environ.setdefault("LLM_BREAKER_COOLDOWN", "1")
+os.environ["NOTES_DIR"] = tempfile.mkdtemp(prefix="verify-resilience-")  # Stand-in agents' notes, not the real ones
+
+from agents.base_agent import QwenAgent
+from agents.resilience import CLOSED, OPEN, decision_stats, provider_stats
+from core import Tournament, TournamentConfig, TournamentRunner, simulate_tournament
+from core.simulation import TIGHT_POLICY, state_decision
+
+REPLY = json.dumps({
+    "choices": [{"message": {"content": '{"action": "check", "amount": 0, "reasoning": "ok"}'}}]
+}).encode()
+
+
+def first_decision():
+    """Game state and valid actions for the first player to act in a fresh tournament."""
+    tournament = Tournament(["Qwen", "Grok", "Gemini"], TournamentConfig())
+    player, valid_actions = next(TournamentRunner(tournament)._play_hand())
+    return tournament.game.get_game_state_for_player(player), valid_actions
+
+
+GAME_STATE, VALID_ACTIONS = first_decision()
+
+
+def fallback_matches_simulation(tournaments: int = 20) -> int:
+    """Decisions where the agent's local fallback differs from the same policy in the simulator."""
+    mismatches = 0
+
+    def compare(game, player, valid_actions, rng):
+        nonlocal mismatches
+        seed = rng.random()
+        direct = TIGHT_POLICY(game, player, valid_actions, random.Random(seed))
+        state = game.get_game_state_for_player(player)
+        mismatches += state_decision(TIGHT_POLICY, state, valid_actions, random.Random(seed)) != direct
+        return direct
+
+    for seed in range(tournaments):
+        simulate_tournament({name: compare for name in ("A", "B", "C", "D", "E")}, seed=seed)
+    return mismatches
+
+
+def make_handler(script):
+    """script(n) -> (status, headers, delay) for the n-th request (0-based)."""
+    lock = threading.Lock()
+    count = [0]
+
+    class ScriptedHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            with lock:
+                n = count[0]
+                count[0] += 1
+            status, headers, delay = script(n)
+            if delay:
+                time.sleep(delay)
+            body = REPLY if status == 200 else b'{"error": "scripted"}'
+            try:
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except OSError:
+                pass  # Client gave up on a hung request
+
+        def log_message(self, format, *args):
+            pass
+
+    return ScriptedHandler
+
+
+def stand_in(script) -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(script))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def agent_for(name: str, url: str, deadline: float) -> QwenAgent:
+    agent = QwenAgent(name)
+    agent.api_url = url
+    agent.decision_deadline = deadline
+    return agent
+
+
+async def decide(agent: QwenAgent):
+    """(decision, seconds) for one get_decision call."""
+    start = time.perf_counter()
+    decision = await agent.get_decision(GAME_STATE, VALID_ACTIONS)
+    return decision, time.perf_counter() - start
+
+
+async def run(deadline: float) -> int:
+    failures = 0
+
+    def check(label: str, ok: bool, detail: str = ""):
+        nonlocal failures
+        failures += not ok
+        print(f"  {'PASS' if ok else 'FAIL'}  {label}" + (f"  ({detail})" if detail else ""))
+
+    check("local fallback == simulator's tight policy", fallback_matches_simulation() == 0)
+
+    agents = []
+
+    # 1. Two 503s, then a reply: retried inside one decision
+    agent = agent_for("flaky", stand_in(lambda n: (503, {}, 0) if n < 2 else (200, {}, 0)), deadline)
+    agents.append(agent)
+    decision, elapsed = await decide(agent)
+    stats = agent.provider.stats
+    check("503 x2 then 200 -> model's decision", decision.reasoning == "ok" and stats.retries == 2,
+          f"{stats.retries} retries, {elapsed:.2f}s")
+
+    # 2. 429 with Retry-After: 1 is honored before retrying
+    agent = agent_for("rate-limited", stand_in(lambda n: (429, {"Retry-After": "1"}, 0) if n == 0 else (200, {}, 0)), deadline)
+    agents.append(agent)
+    decision, elapsed = await decide(agent)
+    check("429 Retry-After: 1 -> waits, then succeeds", decision.reasoning == "ok" and elapsed >= 1.0,
+          f"{elapsed:.2f}s, {agent.provider.stats.rate_limited} rate-limited")
+
+    # 3. Provider down: breaker opens, later calls fail fast, a probe closes it once it's back
+    up = threading.Event()
+    agent = agent_for("outage", stand_in(lambda n: (200, {}, 0) if up.is_set() else (500, {}, 0)), deadline)
+    agents.append(agent)
+    breaker = agent.provider.breaker
+    for _ in range(breaker.threshold):
+        await decide(agent)
+    check("500s -> breaker opens after threshold", breaker.state == OPEN,
+          f"{breaker.consecutive_failures} failures in a row")
+    decision, elapsed = await decide(agent)
+    check("open breaker -> instant local-policy fallback", decision.reasoning.startswith("Fallback") and elapsed < 0.05,
+          f"{elapsed * 1000:.1f} ms")
+    up.set()
+    await asyncio.sleep(breaker.cooldown + 0.1)
+    decision, _ = await decide(agent)
+    check("after cooldown -> probe succeeds, breaker closes", decision.reasoning == "ok" and breaker.state == CLOSED)
+
+    # 4. Hung request: the decision ends at its deadline, not the 120s client timeout
+    agent = agent_for("hung", stand_in(lambda n: (200, {}, deadline + 5)), deadline)
+    agents.append(agent)
+    decision, elapsed = await decide(agent)
+    check(f"hung provider -> fallback at the {deadline:.0f}s deadline",
+          decision.reasoning.startswith("Fallback") and deadline <= elapsed < deadline + 0.5,
+          f"{elapsed:.2f}s, {agent.provider.stats.deadline_exceeded} deadline exceeded")
+
+    # 5. Retry-After beyond the deadline: give up now and hold the breaker open
+    agent = agent_for("backing-off", stand_in(lambda n: (429, {"Retry-After": "120"}, 0)), deadline)
+    agents.append(agent)
+    decision, elapsed = await decide(agent)
+    breaker = agent.provider.breaker
+    check("429 Retry-After: 120 -> no wait, breaker held open",
+          decision.reasoning.startswith("Fallback") and elapsed < 0.5 and breaker.state == OPEN,
+          f"{elapsed:.2f}s, open for {breaker.open_until - time.monotonic():.0f}s")
+    decision, elapsed = await decide(agent)
+    check("next call -> fails fast", agent.provider.stats.breaker_rejections == 1 and elapsed < 0.05)
+
+    for agent in agents:
+        await agent.aclose()
+
+    print("\nDecision clock (last agent per name):")
+    for name, d in decision_stats().items():
+        print(f"  {name}: {d['fallbacks']}/{d['decisions']} fallbacks (deadline {d['deadline']}, "
+              f"breaker {d['circuit_open']}, unparseable {d['parse_errors']}, errors {d['errors']}), max {d['max_seconds']:.2f}s")
+
+    print("\nProvider counters:")
+    keys = ("calls", "successes", "failures", "attempts", "retries", "timeouts", "rate_limited",
+            "server_errors", "deadline_exceeded", "breaker_rejections", "breaker_opens", "fallbacks")
+    print(f"  {'provider':<17}" + "".join(f"{k[:9]:>10}" for k in keys) + "  breaker")
+    for name, p in provider_stats().items():
+        print(f"  {name:<17}" + "".join(f"{p[k]:>10}" for k in keys) + f"  {p['breaker']}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check LLM retries, backoff and circuit breaking against local stand-ins")
+    parser.add_argument("--deadline", type=float, default=3.0, help="Decision deadline in seconds")
+    args = parser.parse_args()
+
+    print("\nResilience checks:")
+    failures = asyncio.run(run(args.deadline))
+    print(f"\nDone - {failures} failures")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+AI Poker Arena - Opponent Stats Verification
+=============================================
+Plays simulated tournaments with a StatsTracker attached and cross-checks
+its incremental counters against a from-scratch recount of the finished
+hands' action histories. Also reports what the tracker costs per action
+and that it survives a save / load round trip.
+
+Usage:
+    python verify_stats.py                       # 200 tournaments
+    python verify_stats.py --tournaments 2000 --seed 7
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import POLICIES, StatsTracker, Tournament, TournamentRunner
+from core.simulation import SIMULATION_CONFIG
+from core.stats import AGGRESSIVE, CALLS, OpponentLine, StatLine
+
+PLAYERS = ["Grok", "GPT-4", "DeepSeek", "Gemini", "Qwen"]
+POLICY_MIX = ("tight", "loose", "pushfold", "random", "tight")
+
+
+def play(tournaments: int, seed: int, tracker=None):
+    """Run tournaments (optionally tracked). Returns (hands, actions, seconds)."""
+    policies = dict(zip(PLAYERS, [POLICIES[p] for p in POLICY_MIX]))
+    hands, actions = [], 0
+    start = time.perf_counter()
+    for i in range(tournaments):
+        tournament = Tournament(PLAYERS, SIMULATION_CONFIG, rng=random.Random(seed + i))
+        if tracker:
+            tracker.attach(tournament)
+            tournament.on_hand_start = lambda number, game: tracker.start_hand(game)
+            tournament.on_hand_complete = tracker.end_hand
+        hands.extend(TournamentRunner(tournament).run_tournament_sync(policies).hand_history)
+    elapsed = time.perf_counter() - start
+    actions = sum(len(h.actions) for h in hands)
+    return hands, actions, elapsed
+
+
+def recount(hands) -> tuple:
+    """Reference stats, straight from each HandResult's action history."""
+    players = defaultdict(StatLine)
+    opponents = defaultdict(OpponentLine)
+    for hand in hands:
+        preflop = [a for a in hand.actions if a["stage"] == "preflop"]
+        for name in hand.hole_cards:
+            line = players[name]
+            mine = [a for a in hand.actions if a["player"] == name]
+            line.hands += 1
+            line.vpip += any(a["action"] in AGGRESSIVE | CALLS for a in mine if a["stage"] == "preflop")
+            line.pfr += any(a["action"] in AGGRESSIVE for a in mine if a["stage"] == "preflop")
+            line.postflop_aggressive += sum(a["action"] in AGGRESSIVE for a in mine if a["stage"] != "preflop")
+            line.postflop_calls += sum(a["action"] in CALLS for a in mine if a["stage"] != "preflop")
+            folds = [a["stage"] for a in mine if a["action"] == "fold"]
+            if len(hand.final_board) >= 3 and "preflop" not in folds:
+                line.saw_flop += 1
+                if hand.showdown and not folds:
+                    line.showdowns += 1
+                    line.showdowns_won += name in hand.winners
+
+        # 3-bet chances: first action while facing exactly one raise
+        raisers = []
+        seen = set()
+        for a in preflop:
+            if len(raisers) == 1 and a["player"] != raisers[0] and a["player"] not in seen:
+                seen.add(a["player"])
+                players[a["player"]].three_bet_chances += 1
+                opponents[(a["player"], raisers[0])].faced_opens += 1
+                if a["action"] in AGGRESSIVE:
+                    players[a["player"]].three_bets += 1
+                    opponents[(a["player"], raisers[0])].three_bets += 1
+            if a["action"] in AGGRESSIVE:
+                raisers.append(a["player"])
+
+        # Responses to each street's latest bettor
+        for stage in ("preflop", "flop", "turn", "river"):
+            aggressor = None
+            for a in (x for x in hand.actions if x["stage"] == stage):
+                if aggressor and aggressor != a["player"]:
+                    line = opponents[(a["player"], aggressor)]
+                    line.faced_bets += 1
+                    line.folded += a["action"] == "fold"
+                    line.called += a["action"] in CALLS
+                    line.raised += a["action"] in AGGRESSIVE
+                if a["action"] in AGGRESSIVE:
+                    aggressor = a["player"]
+    return dict(players), dict(opponents)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify incremental opponent stats against a recount")
+    parser.add_argument("--tournaments", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    _, _, plain = play(args.tournaments, args.seed)
+    tracker = StatsTracker(Path(tempfile.mkdtemp()) / "player_stats.json")
+    hands, actions, tracked = play(args.tournaments, args.seed, tracker)
+    print(f"{args.tournaments} tournaments, {len(hands):,} hands, {actions:,} actions")
+    print(f"  Tracking overhead: {(tracked - plain) / actions * 1e6:+.2f} us/action "
+          f"({plain:.2f}s untracked, {tracked:.2f}s tracked)")
+
+    players, opponents = recount(hands)
+    failures = 0
+    for name, expected in players.items():
+        if tracker.players.get(name) != expected:
+            failures += 1
+            print(f"  MISMATCH {name}: {tracker.players.get(name)} != {expected}")
+        by_position = StatLine()
+        for (player, _), line in tracker.positions.items():
+            if player == name:
+                for field in StatLine.__slots__:
+                    setattr(by_position, field, getattr(by_position, field) + getattr(line, field))
+        if by_position != expected:
+            failures += 1
+            print(f"  MISMATCH {name} positions don't add up to the total")
+    for key, expected in opponents.items():
+        if tracker.opponents.get(key, OpponentLine()) != expected:
+            failures += 1
+            print(f"  MISMATCH {key}: {tracker.opponents.get(key)} != {expected}")
+
+    tracker.save()
+    reloaded = StatsTracker.load(tracker.path)
+    if reloaded.snapshot() != tracker.snapshot():
+        failures += 1
+        print("  MISMATCH after save / load")
+
+    for name in PLAYERS:
+        print(f"  {tracker.describe(name, PLAYERS[0])}")
+    print(f"Done - {failures} mismatches")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()